@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Adaptive Attractor Integration
+Dormand-Prince 5(4) with error control, for when fixed dt=0.01 either wastes
+steps in smooth stretches or goes unstable under aggressive parameters.
+  - embedded 4th-order error estimate, step size adapted to rtol/atol
+  - first-same-as-last: 6 derivative evaluations per accepted step
+  - 4th-order dense output, so results can be resampled at any fixed times
+    without shortening the steps
+  - nfev / accepted / rejected counts to trade accuracy against CPU budget
+Works on the same in-place (3 x n) derivative functions and batches as
+attractor_integrator; a batch shares one step size (the strictest member's).
+"""
+
+import time
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from attractor_integrator import SYSTEMS
+
+# Dormand-Prince tableau (nodes 0, 1/5, 3/10, 4/5, 8/9, 1)
+A = [
+    [],
+    [1 / 5],
+    [3 / 40, 9 / 40],
+    [44 / 45, -56 / 15, 32 / 9],
+    [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729],
+    [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656],
+]
+B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84])
+# 5th minus embedded 4th order weights (7th stage is f at the new point)
+E = np.array([-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40])
+# Dense output: y(t + x h) = y + h * K^T P [x, x^2, x^3, x^4]
+P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423],
+])
+
+SAFETY = 0.9
+MIN_FACTOR = 0.2
+MAX_FACTOR = 10.0
+
+
+def _rms_norm(x: np.ndarray) -> float:
+    """Strictest member's RMS over its three components"""
+    return float(np.sqrt((x ** 2).mean(axis=0)).max())
+
+
+def dopri5(system: str, initial, t_span: Tuple[float, float], params=None, rtol: float = 1e-6,
+           atol: float = 1e-9, t_eval: Optional[Sequence[float]] = None, first_step: Optional[float] = None,
+           max_step: float = np.inf, max_steps: int = 1_000_000,
+           bounds: Optional[Tuple[float, float]] = None) -> dict:
+    """Adaptive Dormand-Prince integration of one system over t_span
+
+    `initial` is (3,) or (n, 3), `params` (3,) or (n, 3). Returns a dict with
+    't' and 'y' of shape (n, len(t), 3) - the accepted steps, or the dense
+    output at t_eval - plus 'nfev', 'accepted', 'rejected', 'status' and
+    'message'. `bounds` reproduces the JS clamping after each accepted step.
+    """
+    spec = SYSTEMS[system]
+    f = spec['derivatives']
+    y = np.array(np.atleast_2d(np.asarray(initial, dtype=np.float64)).T)       # (3, n)
+    p = np.asarray(spec['defaults'] if params is None else params, dtype=np.float64)
+    p = p[:, None] if p.ndim == 1 else p.T
+    n = max(y.shape[1], p.shape[1])
+    y = np.ascontiguousarray(np.broadcast_to(y, (3, n)))
+    p = np.ascontiguousarray(np.broadcast_to(p, (3, n)))
+
+    t0, t1 = float(t_span[0]), float(t_span[1])
+    if t1 <= t0:
+        raise ValueError('t_span must be increasing')
+    t_eval = None if t_eval is None else np.asarray(t_eval, dtype=np.float64)
+    if t_eval is not None and (np.any(np.diff(t_eval) < 0) or t_eval[0] < t0 or t_eval[-1] > t1):
+        raise ValueError('t_eval must be sorted and inside t_span')
+
+    K = np.empty((7, 3, n))
+    tmp = np.empty((3, n))
+    nfev = 0
+
+    def rhs(state, out):
+        nonlocal nfev
+        f(state, p, out)
+        nfev += 1
+
+    rhs(y, K[0])
+    t = t0
+    h = first_step if first_step is not None else _initial_step(rhs, y, K[0], rtol, atol)
+    h = min(h, max_step, t1 - t0)
+
+    times, states = [t0], [y.copy()]
+    dense_out = np.empty((n, 0 if t_eval is None else len(t_eval), 3))
+    eval_index = 0
+    if t_eval is not None:
+        while eval_index < len(t_eval) and t_eval[eval_index] <= t0:
+            dense_out[:, eval_index] = y.T
+            eval_index += 1
+
+    accepted = rejected = 0
+    status, message = 0, 'reached end of t_span'
+    step_rejected = False
+    while t < t1:
+        if accepted + rejected >= max_steps:
+            status, message = -1, f'max_steps ({max_steps}) exceeded'
+            break
+        h = min(h, t1 - t)
+        if h < 10 * np.spacing(t):
+            status, message = -1, 'step size underflow'
+            break
+
+        for i in range(1, 6):
+            np.copyto(tmp, y)
+            for j, a in enumerate(A[i]):
+                if a:
+                    tmp += (h * a) * K[j]
+            rhs(tmp, K[i])
+        y_new = y + h * np.tensordot(B, K[:6], axes=1)
+        rhs(y_new, K[6])
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        error = _rms_norm(h * np.tensordot(E, K, axes=1) / scale)
+
+        if error <= 1.0 and np.isfinite(y_new).all():
+            t_new = t + h
+            if t_eval is not None:
+                end = np.searchsorted(t_eval, t_new, side='right')
+                if end > eval_index:
+                    x = (t_eval[eval_index:end] - t) / h
+                    powers = np.cumprod(np.repeat(x[:, None], 4, axis=1), axis=1)       # x, x^2, x^3, x^4
+                    q = np.tensordot(K, P, axes=([0], [0]))                             # (3, n, 4)
+                    dense_out[:, eval_index:end] = (y[:, :, None] + h * q @ powers.T).transpose(1, 2, 0)
+                    eval_index = end
+            if bounds is not None:
+                clamped = np.clip(y_new, bounds[0], bounds[1])
+                if not np.array_equal(clamped, y_new):
+                    y_new = clamped
+                    rhs(y_new, K[6])    # The FSAL stage no longer matches the clamped point
+            t, y = t_new, y_new
+            K[0] = K[6]
+            accepted += 1
+            if t_eval is None:
+                times.append(t)
+                states.append(y.copy())
+            factor = MAX_FACTOR if error == 0 else min(MAX_FACTOR, SAFETY * error ** -0.2)
+            if step_rejected:
+                factor = min(1.0, factor)
+            step_rejected = False
+            h = min(h * factor, max_step)
+        else:
+            rejected += 1
+            step_rejected = True
+            factor = MIN_FACTOR if not np.isfinite(error) else max(MIN_FACTOR, SAFETY * error ** -0.2)
+            h *= factor
+
+    if t_eval is None:
+        t_out = np.array(times)
+        y_out = np.stack(states, axis=1).transpose(2, 1, 0)    # (n, steps + 1, 3)
+    else:
+        # An early stop only has dense output up to the last accepted step
+        t_out, y_out = t_eval[:eval_index], dense_out[:, :eval_index]
+    return {'t': t_out, 'y': y_out, 'nfev': nfev, 'accepted': accepted, 'rejected': rejected,
+            'status': status, 'message': message}
+
+
+def _initial_step(rhs, y: np.ndarray, f0: np.ndarray, rtol: float, atol: float) -> float:
+    """Hairer-Norsett-Wanner starting step estimate (one extra evaluation)"""
+    scale = atol + np.abs(y) * rtol
+    d0, d1 = _rms_norm(y / scale), _rms_norm(f0 / scale)
+    h0 = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+    f1 = np.empty_like(y)
+    rhs(y + h0 * f0, f1)
+    d2 = _rms_norm((f1 - f0) / scale) / h0
+    h1 = max(1e-6, h0 * 1e-3) if max(d1, d2) <= 1e-15 else (0.01 / max(d1, d2)) ** 0.2
+    return min(100 * h0, h1)
+
+
+if __name__ == '__main__':
+    from attractor_integrator import integrate
+
+    t_end = 5.0
+    reference = dopri5('lorenz', [1.0, 1.0, 1.0], (0, t_end), rtol=1e-12, atol=1e-12)['y'][0, -1]
+    print(f"📏 Lorenz to t={t_end:g}: error at the end vs. derivative evaluations")
+    for dt in (0.01, 0.001):
+        start = time.perf_counter()
+        steps = int(round(t_end / dt))
+        end = integrate('lorenz', [1.0, 1.0, 1.0], steps, dt=dt)[0, -1]
+        print(f"   RK4 dt={dt:<7g} nfev {4 * steps:>7,}  error {np.abs(end - reference).max():9.2e}  "
+              f"{(time.perf_counter() - start) * 1000:6.1f} ms")
+    for rtol in (1e-3, 1e-6, 1e-9):
+        start = time.perf_counter()
+        result = dopri5('lorenz', [1.0, 1.0, 1.0], (0, t_end), rtol=rtol, atol=rtol * 1e-3)
+        print(f"   DOPRI5 rtol={rtol:<5g} nfev {result['nfev']:>7,}  "
+              f"error {np.abs(result['y'][0, -1] - reference).max():9.2e}  "
+              f"{(time.perf_counter() - start) * 1000:6.1f} ms  "
+              f"({result['accepted']} accepted, {result['rejected']} rejected)")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Incremental Attractor Continuation
+Keeps the last integrated state of an attractor and resumes from it, so
+"more steps" and live-advancing views only integrate the new segment
+(O(new steps) per refresh instead of O(total steps)). Segments are written
+into a growable preallocated buffer, and continuing is bit-for-bit identical
+to integrating the full length in one go.
+
+The state can be saved to / loaded from .npz, and continued_trajectory()
+extends the longest cached prefix for a parameter set rather than starting
+again from the initial condition. The live continuation for each parameter
+set stays in memory between calls; the cache only gets a checkpoint each time
+the trajectory has grown by CHECKPOINT_GROWTH, so writes stay amortized O(1)
+per step however often the view refreshes.
+"""
+
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from attractor_integrator import BatchIntegrator
+from trajectory_cache import TrajectoryCache, cache_key, default_cache
+
+
+class AttractorContinuation:
+    """Trajectory that grows by appending newly integrated segments"""
+
+    def __init__(self, system: str = 'lorenz', initial=(1.0, 1.0, 1.0), params=None, dt: float = 0.01,
+                 method: str = 'rk4', capacity: int = 1024):
+        initial = np.asarray(initial, dtype=np.float64)
+        n = max(initial.shape[0] if initial.ndim == 2 else 1,
+                np.shape(params)[0] if np.ndim(params) == 2 else 1)
+        self.system = system
+        self.params = None if params is None else np.asarray(params, dtype=np.float64)
+        self.dt = dt
+        self.method = method
+        self.integrator = BatchIntegrator(system, n, dt, method)
+        self._buffer = np.empty((n, max(capacity, 1), 3))
+        self._buffer[:, 0, :] = np.broadcast_to(initial, (n, 3))
+        self._length = 1     # points written, including the initial state
+
+    @property
+    def steps(self) -> int:
+        return self._length - 1
+
+    @property
+    def trajectory(self) -> np.ndarray:
+        """View of everything integrated so far, (n, steps + 1, 3)"""
+        return self._buffer[:, :self._length]
+
+    @property
+    def last_state(self) -> np.ndarray:
+        return self._buffer[:, self._length - 1]
+
+    def _reserve(self, length: int):
+        """Grow the buffer geometrically so appends stay amortized O(new steps)"""
+        if length <= self._buffer.shape[1]:
+            return
+        grown = np.empty((self._buffer.shape[0], max(length, 2 * self._buffer.shape[1]), 3))
+        grown[:, :self._length] = self._buffer[:, :self._length]
+        self._buffer = grown
+
+    def advance(self, steps: int) -> np.ndarray:
+        """Integrate `steps` more points from the last state; returns a view of the new segment"""
+        if steps <= 0:
+            return self._buffer[:, self._length:self._length]
+        start = self._length - 1
+        self._reserve(start + steps + 1)
+        segment = self._buffer[:, start:start + steps + 1]
+        # Row 0 of the segment is the current last state, so nothing is recomputed
+        self.integrator.integrate(segment[:, 0].copy(), steps, self.params, out=segment)
+        self._length += steps
+        return self._buffer[:, start + 1:self._length]
+
+    def extend_to(self, total_steps: int) -> np.ndarray:
+        """Trajectory of at least total_steps steps, integrating only what is missing"""
+        self.advance(total_steps - self.steps)
+        return self._buffer[:, :total_steps + 1]
+
+    def key_params(self) -> dict:
+        """Cache identity: everything except the number of steps"""
+        return {'kind': 'continuation', 'system': self.system, 'initial': self._buffer[:, 0],
+                'params': self.params, 'dt': self.dt, 'method': self.method}
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_prefix(cls, trajectory: np.ndarray, system: str = 'lorenz', params=None, dt: float = 0.01,
+                    method: str = 'rk4') -> 'AttractorContinuation':
+        """Resume from an existing (n, steps + 1, 3) trajectory"""
+        continuation = cls(system, trajectory[:, 0], params, dt, method, capacity=trajectory.shape[1] * 2)
+        continuation._buffer[:, :trajectory.shape[1]] = trajectory
+        continuation._length = trajectory.shape[1]
+        return continuation
+
+    def save(self, path: str):
+        np.savez_compressed(path, trajectory=self.trajectory, system=self.system, method=self.method,
+                            dt=self.dt, params=np.array([]) if self.params is None else self.params)
+
+    @classmethod
+    def load(cls, path: str) -> 'AttractorContinuation':
+        with np.load(path, allow_pickle=False) as data:
+            params = data['params']
+            return cls.from_prefix(data['trajectory'], str(data['system']), params if params.size else None,
+                                   float(data['dt']), str(data['method']))
+
+
+# A checkpoint is written once the trajectory is this many times the last checkpointed length
+CHECKPOINT_GROWTH = 2.0
+# Live continuations kept in memory per cache (least recently used dropped first)
+MAX_LIVE = 16
+
+_live: 'weakref.WeakKeyDictionary[TrajectoryCache, OrderedDict]' = weakref.WeakKeyDictionary()
+_live_lock = threading.Lock()
+
+
+class _Live:
+    __slots__ = ('continuation', 'checkpointed', 'lock')
+
+    def __init__(self, continuation: AttractorContinuation, checkpointed: int):
+        self.continuation = continuation
+        self.checkpointed = checkpointed     # steps held by the cache's copy
+        self.lock = threading.Lock()
+
+
+def _live_entry(cache: TrajectoryCache, key: str, make) -> _Live:
+    with _live_lock:
+        entries = _live.setdefault(cache, OrderedDict())
+        entry = entries.get(key)
+        if entry is None:
+            entry = entries[key] = make()
+            while len(entries) > MAX_LIVE:
+                entries.popitem(last=False)
+        entries.move_to_end(key)
+        return entry
+
+
+def continued_trajectory(system: str, initial, steps: int, params=None, dt: float = 0.01, method: str = 'rk4',
+                         cache: Optional[TrajectoryCache] = None) -> np.ndarray:
+    """Read-only trajectory of `steps` steps, continuing the live (or longest cached) prefix for these parameters"""
+    cache = cache or default_cache()
+    continuation = AttractorContinuation(system, initial, params, dt, method, capacity=steps + 1)
+    key = cache_key(**continuation.key_params())
+
+    def resume() -> _Live:
+        cached = cache.get(key)
+        if cached is None:
+            return _Live(continuation, -1)
+        prefix = cached['trajectory']
+        return _Live(AttractorContinuation.from_prefix(prefix, system, params, dt, method), prefix.shape[1] - 1)
+
+    entry = _live_entry(cache, key, resume)
+    with entry.lock:
+        live = entry.continuation
+        live.extend_to(steps)
+        if entry.checkpointed < 0 or live.steps >= CHECKPOINT_GROWTH * entry.checkpointed:
+            cache.put(key, {'trajectory': live.trajectory})
+            entry.checkpointed = live.steps
+        view = live.trajectory[:, :steps + 1]
+    view.flags.writeable = False
+    return view
+
+
+def checkpoint_live(cache: Optional[TrajectoryCache] = None):
+    """Write every live continuation that has grown since its last checkpoint (e.g. at shutdown)"""
+    cache = cache or default_cache()
+    with _live_lock:
+        entries = list(_live.get(cache, {}).items())
+    for key, entry in entries:
+        with entry.lock:
+            if entry.continuation.steps > entry.checkpointed:
+                cache.put(key, {'trajectory': entry.continuation.trajectory})
+                entry.checkpointed = entry.continuation.steps
+
+
+if __name__ == '__main__':
+    live = AttractorContinuation('lorenz')
+    full = BatchIntegrator('lorenz')
+    print("🔁 Live refresh of 100 new steps: continuation vs full recomputation")
+    for total in (1000, 10000, 50000):
+        live.extend_to(total - 100)
+        start = time.perf_counter()
+        live.advance(100)
+        incremental = time.perf_counter() - start
+        start = time.perf_counter()
+        recomputed = full.integrate([1.0, 1.0, 1.0], total)
+        recompute = time.perf_counter() - start
+        assert np.array_equal(recomputed, live.trajectory)
+        print(f"   {total:>6,} total steps: {incremental * 1000:7.2f} ms incremental, "
+              f"{recompute * 1000:7.2f} ms from scratch")
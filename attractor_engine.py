@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Unified Attractor Engine
+Python counterpart of AttractorManager.js: Lorenz, Chen, Rossler and any
+user-registered system are integrated side by side as columns of one
+(3 x N) state through a single batched RK4 kernel, and one signal() call
+returns per-attractor decisions plus the weighted ensemble with confidence.
+
+Confidence follows calculateSignalConfidence() in the JS manager, but its
+inputs are measured properly: chaos strength is a running largest-Lyapunov
+estimate from a perturbed twin column per attractor (Benettin two-trajectory
+method, essentially free in the batched kernel), and fractal dimension is
+the correlation dimension of the attractor, cached per parameter set.
+"""
+
+import math
+import time
+import threading
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from attractor_fitting import DEFAULT_DB_PATH, fitted_members
+from attractor_integrator import SYSTEMS, BatchIntegrator
+from chaos_metrics import correlation_dimension
+from trajectory_cache import TrajectoryCache, cached_trajectory
+
+# Member name -> system, ensemble weight, JS initial conditions and the evolve() calls
+# each JS class makes per generateTradingSignal()
+DEFAULT_MEMBERS: Dict[str, dict] = {
+    'lorenz': {'system': 'lorenz', 'weight': 0.4, 'initial': (1.0, 1.0, 1.0),          # 'classic'
+               'steps_per_signal': 10},
+    'chen': {'system': 'chen', 'weight': 0.35, 'initial': (20.0, -15.0, 5.0),          # 'high_energy'
+             'steps_per_signal': 15},
+    'rossler': {'system': 'rossler', 'weight': 0.25, 'initial': (1.0, 1.0, 1.0),       # 'chaotic'
+                'steps_per_signal': 12},
+}
+
+DECISION_VALUES = {'STRONG_BUY': 2, 'BUY': 1, 'HOLD': 0, 'SELL': -1, 'STRONG_SELL': -2}
+
+TWIN_SEPARATION = 1e-8
+
+# Seconds between engine cycles (updateInterval in ConstitutionalMarketHarmonics.js)
+SIGNAL_INTERVAL = 60.0
+
+
+def _clip(value: float) -> float:
+    return max(-1.0, min(1.0, value))
+
+
+def _lorenz_decision(x: float, y: float, z: float, scale: float, chaos: float) -> tuple:
+    """LorenzAttractor.generateDecision: x leads, z confirms"""
+    primary, confirmation = _clip(x / scale), _clip(z / scale)
+    if primary > 0.3 and confirmation > 0.2 and chaos > 0.5:
+        decision = 'STRONG_BUY'
+    elif primary > 0.1 and confirmation > 0:
+        decision = 'BUY'
+    elif primary < -0.3 and confirmation < -0.2 and chaos > 0.5:
+        decision = 'STRONG_SELL'
+    elif primary < -0.1 and confirmation < 0:
+        decision = 'SELL'
+    else:
+        decision = 'HOLD'
+    return primary, decision
+
+
+def _chen_decision(x: float, y: float, z: float, scale: float, chaos: float) -> tuple:
+    """ChenAttractor.generateDecision: weighted x*y, z and x - y"""
+    primary, confirmation, momentum = _clip(x * y / scale), _clip(z / scale), _clip((x - y) / scale)
+    weighted = 0.4 * primary + 0.3 * confirmation + 0.3 * momentum
+    if weighted > 0.4 and chaos > 0.7 and momentum > 0.2:
+        decision = 'STRONG_BUY'
+    elif weighted > 0.2 and confirmation > 0.1:
+        decision = 'BUY'
+    elif weighted < -0.4 and chaos > 0.7 and momentum < -0.2:
+        decision = 'STRONG_SELL'
+    elif weighted < -0.2 and confirmation < -0.1:
+        decision = 'SELL'
+    else:
+        decision = 'HOLD'
+    return weighted, decision
+
+
+def _rossler_decision(x: float, y: float, z: float, scale: float, chaos: float) -> tuple:
+    """RosslerAttractor.generateDecision: x with spiral-phase timing"""
+    primary, timing, momentum = _clip(x / scale), _clip(y / scale), _clip(z / scale)
+    phase = math.atan2(y, x)
+    bullish = 0 < phase < math.pi
+    bearish = phase < 0 or phase > math.pi
+    if primary > 0.3 and bullish and chaos > 0.6 and momentum > 0.1:
+        decision = 'STRONG_BUY'
+    elif primary > 0.1 and bullish and timing > 0:
+        decision = 'BUY'
+    elif primary < -0.3 and bearish and chaos > 0.6 and momentum < -0.1:
+        decision = 'STRONG_SELL'
+    elif primary < -0.1 and bearish and timing < 0:
+        decision = 'SELL'
+    else:
+        decision = 'HOLD'
+    return primary, decision
+
+
+# Systems without their own rule use the Lorenz one
+DECISIONS = {'lorenz': _lorenz_decision, 'chen': _chen_decision, 'rossler': _rossler_decision}
+
+
+def signal_confidence(chaos_strength: float, fractal_dimension: float, is_chaotic: bool) -> float:
+    """AttractorManager.calculateSignalConfidence"""
+    confidence = 0.0
+    if is_chaotic:
+        confidence += 0.3
+    if chaos_strength > 0.5:
+        confidence += 0.3
+    if 1.5 < fractal_dimension < 2.5:
+        confidence += 0.4
+    return min(1.0, confidence)
+
+
+def ensemble_decision(value: float) -> str:
+    if value > 1.5:
+        return 'STRONG_BUY'
+    if value > 0.5:
+        return 'BUY'
+    if value < -1.5:
+        return 'STRONG_SELL'
+    if value < -0.5:
+        return 'SELL'
+    return 'HOLD'
+
+
+class AttractorEngine:
+    """Every member attractor (plus a Lyapunov twin each) advanced by one batched kernel
+
+    signal() advances each member by its own steps_per_signal (members without
+    one use the constructor's). start() runs signal() on a background cycle;
+    readers such as chaos_payload() serve the latest result without advancing.
+    """
+
+    def __init__(self, members: Optional[Dict[str, dict]] = None, dt: float = 0.01, steps_per_signal: int = 10,
+                 warmup: int = 1000, cache: Optional[TrajectoryCache] = None):
+        self.members = {name: dict(spec) for name, spec in (members or DEFAULT_MEMBERS).items()}
+        self.names = list(self.members)
+        self.dt = dt
+        self.cache = cache
+        # Called with every signal() result, e.g. SignalSeriesJob.submit to materialize history
+        self.listeners: List[Callable[[dict], None]] = []
+        self.latest: Optional[dict] = None
+        self._lock = threading.Lock()
+        self._signal_lock = threading.Lock()
+        self._cycle: Optional[threading.Thread] = None
+        self._cycle_lock = threading.Lock()
+        self._stop_cycle = threading.Event()
+
+        # Column 2i is member i, column 2i + 1 its twin
+        n = 2 * len(self.names)
+        self.params = np.empty((3, n))
+        lo, hi = np.empty(n), np.empty(n)
+        initial = np.empty((3, n))
+        self._groups = []
+        for i, name in enumerate(self.names):
+            spec = self.members[name]
+            system = SYSTEMS[spec['system']]
+            spec.setdefault('params', system['defaults'])
+            spec.setdefault('weight', 1.0 / len(self.names))
+            spec.setdefault('initial', (1.0, 1.0, 1.0))
+            spec.setdefault('steps_per_signal', steps_per_signal)
+            cols = slice(2 * i, 2 * i + 2)
+            self.params[:, cols] = np.asarray(spec['params'], dtype=np.float64)[:, None]
+            lo[cols], hi[cols] = system['bounds']
+            initial[:, cols] = np.asarray(spec['initial'], dtype=np.float64)[:, None]
+            initial[0, 2 * i + 1] += TWIN_SEPARATION
+            self._groups.append((system['derivatives'], cols))
+
+        self.kernel = BatchIntegrator(self.members[self.names[0]]['system'], n, dt, 'rk4',
+                                      bounds=(lo[None, :], hi[None, :]), derivatives=self._derivatives)
+        self.kernel.state[:] = initial
+        self.steps_per_signal = {name: int(self.members[name]['steps_per_signal']) for name in self.names}
+        self._log_growth = np.zeros(len(self.names))
+        self._elapsed = np.zeros(len(self.names))
+        self._dimensions: Dict[str, float] = {}
+        self.steps = 0
+        self.advance(warmup)
+
+    def _derivatives(self, s: np.ndarray, p: np.ndarray, out: np.ndarray):
+        """Each system's in-place derivatives on its own columns of the shared state"""
+        for f, cols in self._groups:
+            f(s[:, cols], p[:, cols], out[:, cols])
+
+    def advance(self, steps: Union[int, Dict[str, int]], renormalize_every: int = 10):
+        """Integrate every member by `steps`, or each by its own count from a {name: steps} dict
+
+        Twins are pulled back to TWIN_SEPARATION as they diverge. The kernel
+        still steps all columns together; a member that has done its count is
+        held in place while the others finish.
+        """
+        if isinstance(steps, dict):
+            counts = np.array([steps.get(name, 0) for name in self.names])
+        else:
+            counts = np.full(len(self.names), steps)
+        total = int(counts.max(initial=0))
+        column_counts = np.repeat(counts, 2)
+        state = self.kernel.state
+        with self._lock:
+            done = 0
+            while done < total:
+                chunk = min(renormalize_every, total - done)
+                for step in range(done, done + chunk):
+                    held = column_counts <= step
+                    if held.any():
+                        frozen = state[:, held].copy()
+                        self.kernel.step(self.params)
+                        state[:, held] = frozen
+                    else:
+                        self.kernel.step(self.params)
+                self._renormalize()
+                self._elapsed += np.clip(counts - done, 0, chunk) * self.dt
+                done += chunk
+            self.steps += total
+
+    def _renormalize(self):
+        state = self.kernel.state
+        delta = state[:, 1::2] - state[:, 0::2]
+        distance = np.sqrt((delta ** 2).sum(axis=0))
+        # A twin that lands exactly on its member (e.g. both clamped at a bound) carries no information
+        distance = np.where(distance > 0, distance, TWIN_SEPARATION)
+        self._log_growth += np.log(distance / TWIN_SEPARATION)
+        state[:, 1::2] = state[:, 0::2] + delta * (TWIN_SEPARATION / distance)
+
+    def lyapunov(self) -> Dict[str, float]:
+        """Running largest-Lyapunov estimate per member (per unit time)"""
+        return {name: float(g / elapsed) if elapsed else 0.0
+                for name, g, elapsed in zip(self.names, self._log_growth, self._elapsed)}
+
+    def fractal_dimension(self, name: str) -> float:
+        """Correlation dimension of the member's attractor, computed once per parameter set"""
+        if name not in self._dimensions:
+            spec = self.members[name]
+            trajectory = cached_trajectory(spec['system'], spec['initial'], 20_000, spec['params'], self.dt,
+                                           cache=self.cache)
+            result = correlation_dimension(trajectory[0, 1000:], max_points=2000, cache=self.cache)
+            self._dimensions[name] = result['dimension']
+        return self._dimensions[name]
+
+    def signal(self) -> dict:
+        """Advance each member by its steps_per_signal and return per-member and ensemble signals"""
+        with self._signal_lock:
+            result = self._signal()
+            self.latest = result
+        for listener in self.listeners:
+            listener(result)
+        return result
+
+    def _signal(self) -> dict:
+        self.advance(self.steps_per_signal)
+        state = self.kernel.state
+        lyapunov = self.lyapunov()
+
+        signals = {}
+        weighted_sum = total_weight = total_confidence = 0.0
+        for i, name in enumerate(self.names):
+            spec = self.members[name]
+            system = spec['system']
+            x, y, z = state[:, 2 * i].tolist()
+            chaos = lyapunov[name]
+            dimension = self.fractal_dimension(name)
+            decide = DECISIONS.get(system, _lorenz_decision)
+            value, decision = decide(x, y, z, SYSTEMS[system]['signal_scale'], chaos)
+            confidence = signal_confidence(chaos, dimension, chaos > 0)
+            signals[name] = {
+                'signal': round(value, 4),
+                'confidence': confidence,
+                'decision': decision,
+                'chaosStrength': chaos,
+                'fractalDimension': dimension,
+                'isChaotic': chaos > 0,
+                'state': [x, y, z],
+            }
+            weighted_sum += DECISION_VALUES[decision] * spec['weight'] * confidence
+            total_weight += spec['weight']
+            total_confidence += confidence
+
+        ensemble_value = weighted_sum / total_weight if total_weight else 0.0
+        average_chaos = sum(lyapunov.values()) / len(lyapunov)
+        result = {
+            'timestamp': time.time(),
+            'decision': ensemble_decision(ensemble_value),
+            'confidence': total_confidence / len(self.names),
+            'ensembleValue': ensemble_value,
+            'individualSignals': signals,
+            'marketRegime': ('high_volatility' if average_chaos > 0.8 else 'moderate_volatility'
+                             if average_chaos > 0.5 else 'low_volatility' if average_chaos > 0.2 else 'stable'),
+            'steps': self.steps,
+        }
+        return result
+
+    # ------------------------------------------------------------------
+    # Engine cycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._cycle is not None and self._cycle.is_alive()
+
+    def start(self, interval: float = SIGNAL_INTERVAL):
+        """Run signal() now and then every `interval` seconds on a daemon thread"""
+        with self._cycle_lock:
+            if self.running:
+                return
+            self._stop_cycle.clear()
+            self._cycle = threading.Thread(target=self._run_cycle, args=(interval,), name='attractor-engine',
+                                           daemon=True)
+            self._cycle.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background cycle after the signal in progress"""
+        with self._cycle_lock:
+            self._stop_cycle.set()
+            if self._cycle is not None:
+                self._cycle.join(timeout)
+                self._cycle = None
+
+    def _run_cycle(self, interval: float):
+        while True:
+            try:
+                self.signal()
+            except Exception as e:  # a failing listener must not end the cycle
+                print(f"⚠️  Attractor engine cycle failed: {e}")
+            if self._stop_cycle.wait(interval):
+                break
+
+    def chaos_payload(self) -> dict:
+        """{name: {signal, confidence}} in the shape python-api-server.py serves as chaosSignals
+
+        Built from the latest signal() result; the engine is only advanced here
+        if it has never produced one.
+        """
+        result = self.latest
+        if result is None:
+            with self._signal_lock:     # the cycle's first signal may be in progress
+                result = self.latest
+        result = result or self.signal()
+        payload = {name: {'signal': s['signal'], 'confidence': s['confidence']}
+                   for name, s in result['individualSignals'].items()}
+        payload['ensemble'] = {'decision': result['decision'], 'confidence': result['confidence'],
+                               'value': result['ensembleValue']}
+        return payload
+
+
+_shared_engines: Dict[str, AttractorEngine] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_engine(db_path: str = DEFAULT_DB_PATH) -> AttractorEngine:
+    """Process-wide engine for the dashboard and API servers, using the parameters fitted in db_path"""
+    with _shared_lock:
+        engine = _shared_engines.get(db_path)
+        if engine is None:
+            engine = _shared_engines[db_path] = AttractorEngine(fitted_members(db_path))
+        return engine
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    engine = AttractorEngine(cache=TrajectoryCache(None))
+    engine.signal()
+    print(f"🌀 Engine ready in {(time.perf_counter() - start) * 1000:.0f} ms "
+          f"(warm-up, Lyapunov twins, correlation dimensions)")
+
+    start = time.perf_counter()
+    for _ in range(100):
+        result = engine.signal()
+    print(f"⚡ signal() {(time.perf_counter() - start) * 10:.2f} ms per call")
+    print(f"   Ensemble: {result['decision']} (value {result['ensembleValue']:+.2f}, "
+          f"confidence {result['confidence']:.2f}, regime {result['marketRegime']})")
+    for name, s in result['individualSignals'].items():
+        print(f"   {name:>8s}: {s['decision']:<11s} signal {s['signal']:+.3f} confidence {s['confidence']:.1f} "
+              f"λ {s['chaosStrength']:+.3f} D2 {s['fractalDimension']:.2f}")
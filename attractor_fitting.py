@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Attractor Parameter Fitting
+Searches an attractor's parameter space (sigma/rho/beta for Lorenz, a/b/c
+for Chen and Rossler, or any registered system) for the set whose trading
+signal best correlates with next-step market returns from market_data.
+
+  - differential evolution (DE/rand/1/bin) inside per-parameter bounds
+  - every generation's candidates are integrated together as one batch
+    (one column per parameter set), split into chunks across a process pool;
+    price history is sent to each worker once, at pool start-up
+  - fitness is measured on the first train_fraction of history and the best
+    set is reported on the held-out remainder, so overfitting shows up
+Fitted parameters are stored in the configuration table; fitted_members()
+applies them to the engine's members, and shared_engine() is built from it.
+
+    python attractor_fitting.py --system lorenz --generations 30 --save
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from attractor_integrator import SYSTEMS, BatchIntegrator
+
+DEFAULT_DB_PATH = './market_harmonics.db'
+CONFIG_PREFIX = 'attractor_params.'
+
+SUBSTEPS = 10       # attractor steps per market step, as the JS attractors evolve per signal
+WARMUP = 1000       # steps discarded so every candidate starts on its attractor
+
+# Worker-process copy of the return series, set once by the pool initializer
+_worker_returns: Optional[np.ndarray] = None
+
+
+def default_bounds(system: str, spread: float = 0.5) -> np.ndarray:
+    """(3, 2) search bounds: each default parameter +/- spread of its magnitude"""
+    defaults = np.asarray(SYSTEMS[system]['defaults'], dtype=np.float64)
+    return np.stack([defaults - spread * np.abs(defaults), defaults + spread * np.abs(defaults)], axis=1)
+
+
+# ----------------------------------------------------------------------
+# Market history
+# ----------------------------------------------------------------------
+
+def load_returns(db_path: str = DEFAULT_DB_PATH, tickers: Optional[Sequence[str]] = None) -> np.ndarray:
+    """Equal-weight log returns per market_data timestamp across the given tickers (default: all)"""
+    sql = 'SELECT timestamp, ticker, close_price FROM market_data WHERE close_price > 0'
+    params: list = []
+    if tickers:
+        sql += f' AND ticker IN ({",".join("?" * len(tickers))})'
+        params.extend(tickers)
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(sql + ' ORDER BY timestamp', params).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return np.empty(0)
+
+    stamps, names, closes = zip(*rows)
+    times, t_index = np.unique(np.array(stamps, dtype=object).astype(str), return_inverse=True)
+    symbols, s_index = np.unique(np.array(names, dtype=object).astype(str), return_inverse=True)
+    prices = np.full((len(times), len(symbols)), np.nan)
+    prices[t_index, s_index] = closes
+    returns = np.diff(np.log(prices), axis=0)
+    present = ~np.isnan(returns)
+    counts = present.sum(axis=1)
+    index = np.where(present, returns, 0.0).sum(axis=1)[counts > 0] / counts[counts > 0]
+    return index
+
+
+# ----------------------------------------------------------------------
+# Fitness
+# ----------------------------------------------------------------------
+
+def signal_series(system: str, params: np.ndarray, n_points: int, substeps: int = SUBSTEPS, warmup: int = WARMUP,
+                  initial: Sequence[float] = (1.0, 1.0, 1.0), dt: float = 0.01) -> np.ndarray:
+    """(m, n_points) normalized x signals, one row per (m, 3) parameter set, integrated as one batch"""
+    params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    integrator = BatchIntegrator(system, len(params), dt)
+    p = np.ascontiguousarray(params.T)
+    integrator.state[:] = np.asarray(initial, dtype=np.float64)[:, None]
+    with np.errstate(all='ignore'):
+        for _ in range(warmup):
+            integrator.step(p)
+        out = np.empty((len(params), n_points))
+        for t in range(n_points):
+            for _ in range(substeps):
+                integrator.step(p)
+            out[:, t] = integrator.state[0]
+        out /= SYSTEMS[system]['signal_scale']
+    return np.clip(out, -1.0, 1.0, out=out)
+
+
+def correlations(signals: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """Pearson correlation of each signal row with the returns; -1 for flat or non-finite signals"""
+    s = signals - signals.mean(axis=1, keepdims=True)
+    r = returns - returns.mean()
+    with np.errstate(all='ignore'):
+        corr = (s @ r) / np.sqrt((s ** 2).sum(axis=1) * (r ** 2).sum())
+    return np.where(np.isfinite(corr), corr, -1.0)
+
+
+def _split(n: int, train_fraction: float) -> int:
+    return max(2, int(n * train_fraction))
+
+
+def evaluate(system: str, candidates: np.ndarray, returns: np.ndarray, train_fraction: float = 0.7,
+             substeps: int = SUBSTEPS, warmup: int = WARMUP) -> Tuple[np.ndarray, np.ndarray]:
+    """(train, validation) correlations for each candidate parameter set
+
+    The signal at market step t comes from the attractor state before return t
+    is realised, so a positive correlation is predictive rather than coincident.
+    """
+    signals = signal_series(system, candidates, len(returns), substeps, warmup)
+    cut = _split(len(returns), train_fraction)
+    validation = (correlations(signals[:, cut:], returns[cut:]) if len(returns) - cut >= 2
+                  else np.full(len(candidates), np.nan))
+    return correlations(signals[:, :cut], returns[:cut]), validation
+
+
+def _init_worker(returns: np.ndarray):
+    global _worker_returns
+    _worker_returns = returns
+
+
+def _evaluate_chunk(args) -> np.ndarray:
+    system, candidates, train_fraction, substeps, warmup = args
+    return evaluate(system, candidates, _worker_returns, train_fraction, substeps, warmup)[0]
+
+
+# ----------------------------------------------------------------------
+# Differential evolution
+# ----------------------------------------------------------------------
+
+def fit_parameters(system: str, returns: np.ndarray, bounds: Optional[np.ndarray] = None, population: int = 24,
+                   generations: int = 30, mutation: float = 0.7, crossover: float = 0.9,
+                   train_fraction: float = 0.7, substeps: int = SUBSTEPS, warmup: int = WARMUP,
+                   workers: Optional[int] = None, seed: int = 42, verbose: bool = False) -> dict:
+    """Maximize train-period signal/return correlation over the system's parameters
+
+    Each generation is one batch of `population` candidates, evaluated in
+    chunks across `workers` processes (inline when workers <= 1). Results
+    depend only on the seed, not on the worker count.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if len(returns) < 20:
+        raise ValueError(f'Need at least 20 returns to fit parameters, got {len(returns)}')
+    bounds = default_bounds(system) if bounds is None else np.asarray(bounds, dtype=np.float64)
+    lo, hi = bounds[:, 0], bounds[:, 1]
+    rng = np.random.default_rng(seed)
+    workers = workers or min(population, os.cpu_count() or 1)
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(returns,)) if workers > 1 else None
+    if pool is None:
+        _init_worker(returns)
+
+    def score(candidates: np.ndarray) -> np.ndarray:
+        chunks = np.array_split(candidates, min(workers, len(candidates)))
+        jobs = [(system, chunk, train_fraction, substeps, warmup) for chunk in chunks]
+        results = pool.map(_evaluate_chunk, jobs) if pool is not None else map(_evaluate_chunk, jobs)
+        return np.concatenate(list(results))
+
+    start = time.perf_counter()
+    try:
+        members = lo + rng.random((population, 3)) * (hi - lo)
+        members[0] = np.clip(SYSTEMS[system]['defaults'], lo, hi)     # the defaults compete too
+        fitness = score(members)
+        history = [float(fitness.max())]
+        for generation in range(generations):
+            # DE/rand/1/bin: three distinct donors per member, at least one gene crossed over
+            donors = np.array([rng.choice(np.delete(np.arange(population), i), 3, replace=False)
+                               for i in range(population)])
+            mutant = members[donors[:, 0]] + mutation * (members[donors[:, 1]] - members[donors[:, 2]])
+            cross = rng.random((population, 3)) < crossover
+            cross[np.arange(population), rng.integers(0, 3, population)] = True
+            trial = np.clip(np.where(cross, mutant, members), lo, hi)
+            trial_fitness = score(trial)
+            better = trial_fitness > fitness
+            members[better], fitness[better] = trial[better], trial_fitness[better]
+            history.append(float(fitness.max()))
+            if verbose:
+                print(f"   gen {generation + 1:>3d}: best {history[-1]:+.4f}  mean {fitness.mean():+.4f}")
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = members[int(np.argmax(fitness))]
+    defaults = np.asarray(SYSTEMS[system]['defaults'], dtype=np.float64)
+    train, validation = evaluate(system, np.stack([best, defaults]), returns, train_fraction, substeps, warmup)
+    return {
+        'system': system,
+        'params': best.tolist(),
+        'param_names': list(SYSTEMS[system]['params']),
+        'train_correlation': float(train[0]),
+        'validation_correlation': float(validation[0]),
+        'default_train_correlation': float(train[1]),
+        'default_validation_correlation': float(validation[1]),
+        'history': history,
+        'evaluations': population * (generations + 1),
+        'returns': len(returns),
+        'seconds': time.perf_counter() - start,
+    }
+
+
+# ----------------------------------------------------------------------
+# Persistence
+# ----------------------------------------------------------------------
+
+def save_fit(result: dict, db_path: str = DEFAULT_DB_PATH):
+    """Store fitted parameters (and their scores) under configuration key attractor_params.<system>"""
+    value = {key: result[key] for key in ('params', 'train_correlation', 'validation_correlation', 'returns')}
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute(
+            'INSERT INTO configuration (key, value, description, last_updated) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = excluded.value, last_updated = excluded.last_updated',
+            (CONFIG_PREFIX + result['system'], json.dumps(value),
+             f"Fitted {result['system']} parameters ({', '.join(result['param_names'])})",
+             datetime.now().isoformat())
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def load_fitted_params(db_path: str = DEFAULT_DB_PATH) -> Dict[str, List[float]]:
+    """{system: params} for every stored fit"""
+    if not os.path.exists(db_path):
+        return {}
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute('SELECT key, value FROM configuration WHERE key LIKE ?',
+                            (CONFIG_PREFIX + '%',)).fetchall()
+    except sqlite3.OperationalError:
+        return {}
+    finally:
+        conn.close()
+    return {key[len(CONFIG_PREFIX):]: json.loads(value)['params'] for key, value in rows}
+
+
+def fitted_members(db_path: str = DEFAULT_DB_PATH) -> Dict[str, dict]:
+    """The engine's default members with any stored fitted parameters applied"""
+    from attractor_engine import DEFAULT_MEMBERS
+
+    fitted = load_fitted_params(db_path)
+    members = {name: dict(spec) for name, spec in DEFAULT_MEMBERS.items()}
+    for spec in members.values():
+        if spec['system'] in fitted:
+            spec['params'] = tuple(fitted[spec['system']])
+    return members
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Fit attractor parameters to market history')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    parser.add_argument('--system', default='lorenz', choices=list(SYSTEMS))
+    parser.add_argument('--tickers', nargs='*')
+    parser.add_argument('--population', type=int, default=24)
+    parser.add_argument('--generations', type=int, default=30)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--save', action='store_true', help='store the fit in the configuration table')
+    args = parser.parse_args(argv)
+
+    returns = load_returns(args.db, args.tickers) if os.path.exists(args.db) else np.empty(0)
+    if len(returns) < 20:
+        from market_simulator import MarketSimulator
+        print(f"⚠️  {len(returns)} returns in {args.db} - fitting on 2,000 simulated steps instead")
+        prices = MarketSimulator(['AAPL', 'MSFT', 'FPH.NZ', 'CBA.AX'], seed=args.seed, dt=3600.0,
+                                 respect_sessions=False).generate(2000)
+        returns = np.diff(np.log(prices), axis=0).mean(axis=1)
+        args.save = False
+
+    print(f"🧬 Fitting {args.system} to {len(returns):,} returns "
+          f"({args.population} x {args.generations} generations)")
+    result = fit_parameters(args.system, returns, population=args.population, generations=args.generations,
+                            workers=args.workers, seed=args.seed, verbose=True)
+    names = ', '.join(f'{n}={v:.4f}' for n, v in zip(result['param_names'], result['params']))
+    print(f"✅ {names} in {result['seconds']:.1f}s ({result['evaluations']:,} evaluations)")
+    print(f"   Correlation train {result['train_correlation']:+.4f} / validation "
+          f"{result['validation_correlation']:+.4f} (defaults {result['default_train_correlation']:+.4f} / "
+          f"{result['default_validation_correlation']:+.4f})")
+    if args.save:
+        save_fit(result, args.db)
+        print(f"💾 Saved as {CONFIG_PREFIX}{args.system} in {args.db}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Vectorized Attractor Integrator
+Advances many initial conditions and parameter sets at once as NumPy arrays
+instead of stepping one Lorenz point at a time in a Python loop. Fixed-step
+Euler (what the dashboard used) and RK4 (what BaseAttractor.js uses) are both
+available, with the clamping bounds each JS attractor class sets
+(LorenzAttractor.js and RosslerAttractor.js narrow BaseAttractor's +/-100 to
++/-50; ChenAttractor.js keeps +/-100).
+
+State is held component-major (3 x n) so each x/y/z row is contiguous, and
+results are written into one preallocated (n, steps + 1, 3) trajectory array.
+"""
+
+import time
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+Derivatives = Callable[[np.ndarray, np.ndarray, np.ndarray], None]
+
+
+def _lorenz(s: np.ndarray, p: np.ndarray, out: np.ndarray):
+    """dx = sigma(y - x), dy = x(rho - z) - y, dz = xy - beta z"""
+    x, y, z = s
+    sigma, rho, beta = p
+    np.subtract(y, x, out=out[0])
+    out[0] *= sigma
+    np.subtract(rho, z, out=out[1])
+    out[1] *= x
+    out[1] -= y
+    np.multiply(beta, z, out=out[2])
+    np.subtract(x * y, out[2], out=out[2])
+
+
+def _chen(s: np.ndarray, p: np.ndarray, out: np.ndarray):
+    """dx = a(y - x), dy = (c - a)x - xz + cy, dz = xy - bz"""
+    x, y, z = s
+    a, b, c = p
+    np.subtract(y, x, out=out[0])
+    out[0] *= a
+    np.subtract(c - a, z, out=out[1])
+    out[1] *= x
+    out[1] += c * y
+    np.multiply(b, z, out=out[2])
+    np.subtract(x * y, out[2], out=out[2])
+
+
+def _rossler(s: np.ndarray, p: np.ndarray, out: np.ndarray):
+    """dx = -y - z, dy = x + ay, dz = b + z(x - c)"""
+    x, y, z = s
+    a, b, c = p
+    np.add(y, z, out=out[0])
+    np.negative(out[0], out=out[0])
+    np.multiply(a, y, out=out[1])
+    out[1] += x
+    np.subtract(x, c, out=out[2])
+    out[2] *= z
+    out[2] += b
+
+
+# name -> parameter names, JS defaults, the JS class's clamping bounds, the JS normalizeSignal range,
+# in-place array derivatives, and an equivalent scalar form for tiny batches where
+# NumPy call overhead dominates
+SYSTEMS: Dict[str, dict] = {
+    'lorenz': {'params': ('sigma', 'rho', 'beta'), 'defaults': (10.0, 28.0, 8.0 / 3.0),
+               'bounds': (-50.0, 50.0), 'signal_scale': 30.0, 'derivatives': _lorenz,
+               'scalar': lambda x, y, z, p: (p[0] * (y - x), x * (p[1] - z) - y, x * y - p[2] * z)},
+    'chen': {'params': ('a', 'b', 'c'), 'defaults': (5.0, -10.0, -0.38),
+             'bounds': (-100.0, 100.0), 'signal_scale': 50.0, 'derivatives': _chen,
+             'scalar': lambda x, y, z, p: (p[0] * (y - x), (p[2] - p[0]) * x - x * z + p[2] * y, x * y - p[1] * z)},
+    'rossler': {'params': ('a', 'b', 'c'), 'defaults': (0.2, 0.2, 5.7),
+                'bounds': (-50.0, 50.0), 'signal_scale': 25.0, 'derivatives': _rossler,
+                'scalar': lambda x, y, z, p: (-y - z, x + p[0] * y, p[1] + z * (x - p[2]))},
+}
+
+
+def register_system(name: str, params: Sequence[str], defaults: Sequence[float], derivatives: Derivatives,
+                    bounds: Tuple[float, float] = (-100.0, 100.0), signal_scale: float = 50.0,
+                    scalar: Optional[Callable] = None, jacobian: Optional[Callable] = None):
+    """Add a user-defined 3-D system; derivatives(s, p, out) works in place on (3 x n) arrays"""
+    if len(params) != 3 or len(defaults) != 3:
+        raise ValueError('Systems take exactly three parameters')
+    SYSTEMS[name] = {'params': tuple(params), 'defaults': tuple(float(d) for d in defaults), 'bounds': bounds,
+                     'signal_scale': signal_scale, 'derivatives': derivatives, 'scalar': scalar,
+                     'jacobian': jacobian}
+
+
+class BatchIntegrator:
+    """Fixed-step Euler / RK4 over a batch of trajectories with reusable work buffers"""
+
+    METHODS = ('euler', 'rk4')
+    SCALAR_THRESHOLD = 8    # below this many trajectories a plain float loop beats ufunc overhead
+
+    def __init__(self, system: str = 'lorenz', n_trajectories: int = 1, dt: float = 0.01,
+                 method: str = 'rk4', bounds: Optional[Tuple[float, float]] = None,
+                 derivatives: Optional[Derivatives] = None):
+        if system not in SYSTEMS:
+            raise ValueError(f'Unknown attractor system: {system} (known: {", ".join(SYSTEMS)})')
+        if method not in self.METHODS:
+            raise ValueError(f'Unknown integration method: {method} (use euler or rk4)')
+        spec = SYSTEMS[system]
+        self.system = system
+        # A custom derivatives function (e.g. several systems side by side) replaces the system's own
+        self.derivatives: Derivatives = derivatives or spec['derivatives']
+        self.scalar = None if derivatives is not None else spec.get('scalar')
+        self.defaults = spec['defaults']
+        self.bounds = spec['bounds'] if bounds is None else bounds
+        self.n = n_trajectories
+        self.dt = dt
+        self.method = method
+
+        # Preallocated work memory, reused across steps and calls
+        self.state = np.empty((3, self.n))
+        self._k = np.empty((4, 3, self.n))
+        self._tmp = np.empty((3, self.n))
+
+    def _params(self, params) -> np.ndarray:
+        """(3 x n) parameter rows from None, one (3,) set, or an (n, 3) batch"""
+        p = np.asarray(self.defaults if params is None else params, dtype=np.float64)
+        if p.ndim == 1:
+            p = p[:, None]
+        else:
+            p = p.T
+        return np.ascontiguousarray(np.broadcast_to(p, (3, self.n)))
+
+    def step(self, p: np.ndarray):
+        """Advance self.state by one dt in place"""
+        s, k, tmp, dt, f = self.state, self._k, self._tmp, self.dt, self.derivatives
+        if self.method == 'euler':
+            f(s, p, k[0])
+            k[0] *= dt
+            s += k[0]
+        else:
+            f(s, p, k[0])
+            np.multiply(k[0], dt / 2, out=tmp)
+            tmp += s
+            f(tmp, p, k[1])
+            np.multiply(k[1], dt / 2, out=tmp)
+            tmp += s
+            f(tmp, p, k[2])
+            np.multiply(k[2], dt, out=tmp)
+            tmp += s
+            f(tmp, p, k[3])
+            # s += dt/6 (k1 + 2k2 + 2k3 + k4)
+            k[1] += k[2]
+            k[1] *= 2
+            k[1] += k[0]
+            k[1] += k[3]
+            k[1] *= dt / 6
+            s += k[1]
+        if self.bounds is not None:
+            np.clip(s, self.bounds[0], self.bounds[1], out=s)
+
+    def integrate(self, initial, steps: int, params=None, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Trajectories of shape (n, steps + 1, 3); row 0 is the initial state"""
+        initial = np.broadcast_to(np.asarray(initial, dtype=np.float64), (self.n, 3))
+        if out is None:
+            out = np.empty((self.n, steps + 1, 3))
+        elif out.shape != (self.n, steps + 1, 3):
+            raise ValueError(f'out must have shape {(self.n, steps + 1, 3)}, got {out.shape}')
+
+        p = self._params(params)
+        out[:, 0, :] = initial
+        if self.scalar is not None and self.n < self.SCALAR_THRESHOLD:
+            for i in range(self.n):
+                self._integrate_scalar(out[i], tuple(p[:, i].tolist()), steps)
+            self.state[:] = out[:, -1, :].T
+            return out
+
+        self.state[:] = initial.T
+        for t in range(1, steps + 1):
+            self.step(p)
+            out[:, t, :] = self.state.T
+        return out
+
+    def _integrate_scalar(self, out: np.ndarray, p: tuple, steps: int):
+        """Same scheme as step() on Python floats for one trajectory, filling out[1:]"""
+        f, dt, rk4 = self.scalar, self.dt, self.method == 'rk4'
+        lo, hi = self.bounds if self.bounds is not None else (-np.inf, np.inf)
+        x, y, z = out[0].tolist()
+        rows = []
+        for _ in range(steps):
+            a1, b1, c1 = f(x, y, z, p)
+            if rk4:
+                h = dt / 2
+                a2, b2, c2 = f(x + a1 * h, y + b1 * h, z + c1 * h, p)
+                a3, b3, c3 = f(x + a2 * h, y + b2 * h, z + c2 * h, p)
+                a4, b4, c4 = f(x + a3 * dt, y + b3 * dt, z + c3 * dt, p)
+                w = dt / 6
+                x += (a1 + 2 * (a2 + a3) + a4) * w
+                y += (b1 + 2 * (b2 + b3) + b4) * w
+                z += (c1 + 2 * (c2 + c3) + c4) * w
+            else:
+                x += a1 * dt
+                y += b1 * dt
+                z += c1 * dt
+            x = lo if x < lo else hi if x > hi else x
+            y = lo if y < lo else hi if y > hi else y
+            z = lo if z < lo else hi if z > hi else z
+            rows.append((x, y, z))
+        if rows:
+            out[1:] = rows
+
+
+def integrate(system: str, initial, steps: int, params=None, dt: float = 0.01, method: str = 'rk4',
+              out: Optional[np.ndarray] = None) -> np.ndarray:
+    """One-shot integration; `initial` is (3,) or (n, 3) and `params` (3,) or (n, 3)"""
+    initial = np.asarray(initial, dtype=np.float64)
+    n = max(initial.shape[0] if initial.ndim == 2 else 1,
+            np.shape(params)[0] if np.ndim(params) == 2 else 1)
+    return BatchIntegrator(system, n, dt, method).integrate(initial, steps, params, out)
+
+
+def _python_euler_lorenz(steps: int, dt: float = 0.01) -> list:
+    """The dashboard's original loop, kept as the benchmark reference"""
+    x, y, z = 1.0, 1.0, 1.0
+    sigma, rho, beta = 10.0, 28.0, 8.0 / 3.0
+    points = []
+    for _ in range(steps):
+        dx = sigma * (y - x)
+        dy = x * (rho - z) - y
+        dz = x * y - beta * z
+        x, y, z = x + dx * dt, y + dy * dt, z + dz * dt
+        points.append((x, y, z))
+    return points
+
+
+def benchmark(sizes: Sequence[int] = (1, 1000), steps: int = 2000) -> Dict[str, dict]:
+    """Per-step and per-trajectory-step cost for each batch size and method"""
+    results = {}
+    start = time.perf_counter()
+    _python_euler_lorenz(steps)
+    results['python_euler_1'] = {'trajectories': 1, 'us_per_step': (time.perf_counter() - start) / steps * 1e6}
+
+    rng = np.random.default_rng(0)
+    for method in BatchIntegrator.METHODS:
+        for n in sizes:
+            integrator = BatchIntegrator('lorenz', n, method=method)
+            initial = rng.uniform(-10, 10, (n, 3))
+            out = np.empty((n, steps + 1, 3))
+            integrator.integrate(initial, 10)  # warm-up
+            start = time.perf_counter()
+            integrator.integrate(initial, steps, out=out)
+            per_step = (time.perf_counter() - start) / steps
+            results[f'{method}_{n}'] = {'trajectories': n, 'us_per_step': per_step * 1e6,
+                                        'ns_per_trajectory_step': per_step / n * 1e9}
+    return results
+
+
+if __name__ == '__main__':
+    print("🌀 Attractor integrator benchmark (Lorenz, 2,000 steps)")
+    for name, r in benchmark().items():
+        per_traj = r.get('ns_per_trajectory_step')
+        extra = f", {per_traj:8.1f} ns per trajectory-step" if per_traj is not None else ''
+        print(f"   {name:>16s}: {r['us_per_step']:8.2f} µs/step{extra}")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Engine Benchmark Suite
+Drives a full trading cycle (quotes -> FX -> valuation -> stop checks ->
+rebalance -> persistence) over synthetic universes of 100 / 1k / 10k symbols
+with stubbed quote and FX providers, so the numbers reflect our code rather
+than the network. Results are written as JSON and compared against a stored
+baseline; any regression beyond the tolerance exits non-zero.
+
+    python benchmark_engine.py                       # run + compare
+    python benchmark_engine.py --sizes 100 1000      # subset
+    python benchmark_engine.py --update-baseline     # accept current numbers
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from db_migrations import migrate
+from market_pipelines import MarketPipelineRunner, group_by_market
+from price_history import PriceHistory
+from quote_client import QuoteClient, default_route
+from trade_journal import TradeJournal
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+DEFAULT_SIZES = (100, 1000, 10000)
+TIMING_NOISE_SECONDS = 0.002
+MEMORY_NOISE_MB = 1.0
+METRICS = ('cycle', 'quotes', 'valuation', 'stop_check', 'rebalance', 'persistence', 'peak_memory_mb')
+
+# Exchange suffix -> (currency, share of universe)
+MARKETS = {
+    'US': ('USD', 0.40), 'NZ': ('NZD', 0.10), 'AX': ('AUD', 0.10), 'L': ('GBP', 0.10),
+    'DE': ('EUR', 0.08), 'AS': ('EUR', 0.07), 'T': ('JPY', 0.07), 'HK': ('HKD', 0.04), 'TO': ('CAD', 0.04)
+}
+FX_TO_USD = {'USD': 1.0, 'NZD': 0.60, 'AUD': 0.66, 'GBP': 1.27, 'EUR': 1.09, 'JPY': 0.0067, 'HKD': 0.128, 'CAD': 0.74}
+
+
+def synthetic_universe(n_symbols: int, seed: int = 7) -> List[str]:
+    """Tickers spread across exchanges in MARKETS proportions"""
+    rng = np.random.default_rng(seed)
+    codes = list(MARKETS)
+    weights = np.array([MARKETS[c][1] for c in codes])
+    picks = rng.choice(len(codes), size=n_symbols, p=weights / weights.sum())
+    return [f'S{i:05d}' if codes[p] == 'US' else f'S{i:05d}.{codes[p]}' for i, p in enumerate(picks)]
+
+
+class StubMarket:
+    """Deterministic random-walk prices standing in for the live quote/FX providers"""
+
+    def __init__(self, symbols: List[str], seed: int = 11):
+        self.rng = np.random.default_rng(seed)
+        self.index = {s: i for i, s in enumerate(symbols)}
+        self.prices = self.rng.uniform(5, 500, len(symbols))
+
+    def step(self):
+        self.prices *= np.exp(self.rng.normal(0, 0.01, self.prices.shape))
+
+    def quote(self, symbol: str) -> float:
+        return float(self.prices[self.index[symbol]])
+
+    @staticmethod
+    def fx(currency: str) -> float:
+        return FX_TO_USD[currency]
+
+
+class BenchmarkEngine:
+    """Reference cycle assembled from the engine's building blocks"""
+
+    STOP_LOSS = 0.08
+    REBALANCE_DRIFT = 0.25
+
+    def __init__(self, symbols: List[str], workdir: str):
+        self.symbols = symbols
+        self.index = {s: i for i, s in enumerate(symbols)}
+        self.market = StubMarket(symbols)
+        self.markets = group_by_market(symbols)
+        self.currencies = sorted(FX_TO_USD)
+        self.currency_index = np.array([self.currencies.index(MARKETS[default_route(s)][0]) for s in symbols])
+        self._fx_rates = np.empty(len(self.currencies))
+
+        providers = {code: self.market.quote for code in MARKETS}
+        self.quotes = QuoteClient(providers, limits={code: (1e9, 1e9) for code in MARKETS}, max_workers=4)
+        # Created once, like the engine's runner: pool start-up is not part of a cycle
+        self.runner = MarketPipelineRunner(self._fetch, lambda m, p: None, max_workers=len(self.markets))
+        self.history = PriceHistory(symbols, window=64)
+
+        self.db_path = os.path.join(workdir, 'market_harmonics.db')
+        migrate(self.db_path)
+        self.journal = TradeJournal(os.path.join(workdir, 'trades.bin'), self.db_path)
+        self.conn = sqlite3.connect(self.db_path)
+
+        n = len(symbols)
+        self.shares = np.zeros(n)
+        self.entry = np.zeros(n)
+        self.cash = 1_000_000.0 * max(1, n // 100)
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, name: str, fn: Callable, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+        return result
+
+    def run_cycle(self) -> Dict[str, float]:
+        self.timings = {}
+        start = time.perf_counter()
+        self.market.step()
+
+        # Quotes per market, concurrently, through the shared client
+        results = self._timed('quotes', self.runner.run_cycle, self.markets)['results']
+        prices = np.full(len(self.symbols), np.nan)
+        for result in results.values():
+            for symbol, price in result['prices'].items():
+                prices[self.index[symbol]] = np.nan if price is None else price
+        self.history.append(prices)
+
+        fx = self._timed('valuation', self._fx_vector)
+        usd_prices = prices * fx
+        values = self._timed('valuation', np.multiply, self.shares, usd_prices)
+        portfolio_value = float(values.sum()) + self.cash
+
+        stops = self._timed('stop_check', self._stop_check, usd_prices)
+        trades = self._timed('rebalance', self._rebalance, usd_prices, portfolio_value, stops)
+        self._timed('persistence', self._persist, trades, usd_prices, values, portfolio_value)
+
+        self.timings['cycle'] = time.perf_counter() - start
+        return self.timings
+
+    def _fetch(self, market: str, tickers: List[str]) -> Dict[str, float]:
+        return self.quotes.get_quotes(tickers)
+
+    def _fx_vector(self) -> np.ndarray:
+        for i, currency in enumerate(self.currencies):
+            self._fx_rates[i] = self.market.fx(currency)
+        return self._fx_rates[self.currency_index]
+
+    def _stop_check(self, usd_prices: np.ndarray) -> np.ndarray:
+        held = self.shares > 0
+        return held & (usd_prices < self.entry * (1 - self.STOP_LOSS))
+
+    def _rebalance(self, usd_prices: np.ndarray, portfolio_value: float, stops: np.ndarray) -> List[tuple]:
+        target_value = portfolio_value * 0.9 / len(self.symbols)
+        current_value = self.shares * usd_prices
+        drift = np.abs(current_value - target_value) / target_value
+        delta = np.where(stops, -self.shares,
+                         np.where(drift > self.REBALANCE_DRIFT, (target_value - current_value) / usd_prices, 0.0))
+        trades = []
+        for i in np.flatnonzero(delta):
+            shares = float(delta[i])
+            price = float(usd_prices[i])
+            self.cash -= shares * price
+            if shares > 0:
+                self.entry[i] = price
+            self.shares[i] += shares
+            trades.append((self.symbols[i], 'buy' if shares > 0 else 'sell', abs(shares), price))
+        return trades
+
+    def _persist(self, trades: List[tuple], usd_prices: np.ndarray, values: np.ndarray, portfolio_value: float):
+        for ticker, action, shares, price in trades:
+            self.journal.append(ticker, action, shares, price, strategy='ensemble', notes='benchmark')
+        now = datetime.now().isoformat()
+        held = np.flatnonzero(self.shares > 0)
+        with self.conn:
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO portfolio_positions '
+                '(ticker, shares, entry_price, entry_value, current_price, current_value, last_updated) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                [(self.symbols[i], float(self.shares[i]), float(self.entry[i]), float(self.shares[i] * self.entry[i]),
+                  float(usd_prices[i]), float(self.shares[i] * usd_prices[i]), now) for i in held]
+            )
+            self.conn.execute(
+                'INSERT INTO performance_snapshots (timestamp, portfolio_value, cash_balance, total_capital, roi) '
+                'VALUES (?, ?, ?, ?, ?)', (now, portfolio_value, self.cash, portfolio_value, 0.0)
+            )
+        self.journal.flush()
+
+    def close(self):
+        self.runner.close()
+        self.quotes.close()
+        self.journal.close()
+        self.conn.close()
+
+
+def run_size(n_symbols: int, cycles: int = 7) -> Dict[str, float]:
+    """Best-of-N per-stage seconds over `cycles` warm cycles, plus peak traced memory"""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = BenchmarkEngine(synthetic_universe(n_symbols), tmp)
+        try:
+            engine.run_cycle()  # Warm-up: opens positions, fills caches
+            samples = [engine.run_cycle() for _ in range(cycles)]
+
+            peaks = []
+            for _ in range(3):
+                tracemalloc.start()
+                engine.run_cycle()
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+        finally:
+            engine.close()
+
+    # Minimum is the most stable statistic on a shared machine: noise only ever adds time
+    result = {metric: min(s.get(metric, 0.0) for s in samples)
+              for metric in METRICS if metric != 'peak_memory_mb'}
+    result['peak_memory_mb'] = min(peaks) / (1024 * 1024)
+    return result
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions beyond tolerance, as readable lines"""
+    regressions = []
+    for size, metrics in current['results'].items():
+        base = baseline.get('results', {}).get(size)
+        if not base:
+            continue
+        for metric, value in metrics.items():
+            reference = base.get(metric)
+            if not reference:
+                continue
+            # Absolute noise floors keep tiny universes from flapping
+            floor = MEMORY_NOISE_MB if metric == 'peak_memory_mb' else TIMING_NOISE_SECONDS
+            if value - reference < floor:
+                continue
+            if value > reference * (1 + tolerance):
+                regressions.append(f'{size} symbols {metric}: {value:.4f} vs baseline {reference:.4f} '
+                                   f'(+{(value / reference - 1) * 100:.0f}%)')
+    return regressions
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Trading engine benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--cycles', type=int, default=7)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    current = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'cycles': args.cycles
+        },
+        'results': {}
+    }
+
+    print("🏁 Engine benchmark (best-of-N seconds per cycle)")
+    print(f"   {'symbols':>8s} " + ' '.join(f'{m:>12s}' for m in METRICS))
+    for size in args.sizes:
+        result = run_size(size, args.cycles)
+        current['results'][str(size)] = result
+        print(f"   {size:>8,} " + ' '.join(f'{result[m]:12.4f}' for m in METRICS))
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=2)
+    print(f"\n📄 Results written to {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️  No baseline found - run with --update-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) beyond {args.tolerance * 100:.0f}%:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"✅ No regressions beyond {args.tolerance * 100:.0f}% of baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
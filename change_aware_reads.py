@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Change-Aware Database Reads
+Read layer for the dashboard that only touches SQLite when the engine has
+actually written something:
+  - PRAGMA data_version on one long-lived read-only connection tells us,
+    without reading any table, whether another connection has committed
+  - append-only tables (trades, performance snapshots) keep a
+    max-rowid watermark and fetch only newer rows; if the count or max rowid
+    at or below the watermark no longer matches the cache (rows deleted,
+    even with new ones inserted since), the table is reloaded in full.
+    In-place UPDATEs are not detected, nor is a deleted newest row whose
+    rowid is reused, so 'append' tables must be AUTOINCREMENT (both are)
+    and tables that get UPDATEs must be registered as 'mutable'
+  - mutable tables are re-read in full, but only on change: positions, and
+    attractor states / strategy signals, whose rows the binary-storage
+    migration (backfill_blobs) and compact_existing() rewrite in place
+Cached results are served as-is on unchanged reruns; DataFrames (pandas)
+are built on demand and extended incrementally.
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# table -> 'append' (rows only ever added) or 'mutable' (rows updated / replaced)
+TABLES: Dict[str, str] = {
+    'trades': 'append',
+    'performance_snapshots': 'append',
+    'attractor_states': 'mutable',      # BLOB backfill and compaction UPDATE existing rows
+    'strategy_signals': 'mutable',
+    'portfolio_positions': 'mutable',
+}
+
+
+class _TableCache:
+    __slots__ = ('columns', 'rows', 'watermark', 'frame', 'frame_rows', 'version')
+
+    def __init__(self):
+        self.columns: List[str] = []
+        self.rows: List[tuple] = []
+        self.watermark = 0          # highest rowid fetched (append tables)
+        self.frame = None           # pandas DataFrame covering rows[:frame_rows]
+        self.frame_rows = 0
+        self.version: Optional[int] = None
+
+
+class ChangeAwareReader:
+    """Cached, incrementally refreshed reads of the engine database"""
+
+    def __init__(self, db_path: str = './market_harmonics.db', tables: Optional[Dict[str, str]] = None):
+        self.db_path = db_path
+        self.tables = dict(TABLES if tables is None else tables)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._cache: Dict[str, _TableCache] = {}
+        self._queries: Dict[Tuple[str, tuple], Tuple[int, list]] = {}
+        self.stats = {'version_checks': 0, 'unchanged': 0, 'incremental_fetches': 0,
+                      'full_fetches': 0, 'rows_fetched': 0, 'query_hits': 0, 'query_misses': 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Read-only and kept open: data_version is only meaningful on a long-lived connection
+            self._conn = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, check_same_thread=False)
+        return self._conn
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database"""
+        self.stats['version_checks'] += 1
+        return self._connection().execute('PRAGMA data_version').fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Tables
+    # ------------------------------------------------------------------
+
+    def rows(self, table: str) -> Tuple[List[str], List[tuple]]:
+        """(columns, rows) for a table, refreshed only if the database changed"""
+        with self._lock:
+            return self._refresh(table)
+
+    def _refresh(self, table: str) -> Tuple[List[str], List[tuple]]:
+        if table not in self.tables:
+            raise KeyError(f'{table} is not a registered table (known: {", ".join(self.tables)})')
+        cache = self._cache.setdefault(table, _TableCache())
+        version = self.data_version()
+        if cache.version == version:
+            self.stats['unchanged'] += 1
+            return cache.columns, cache.rows
+
+        conn = self._connection()
+        if self.tables[table] == 'append' and cache.version is not None:
+            # The cached prefix is still valid only if every row up to the watermark is still there
+            held, max_rowid = conn.execute(f'SELECT COUNT(*), COALESCE(MAX(rowid), 0) FROM {table} '
+                                           f'WHERE rowid <= ?', (cache.watermark,)).fetchone()
+            if held == len(cache.rows) and max_rowid == cache.watermark:
+                cursor = conn.execute(f'SELECT rowid, * FROM {table} WHERE rowid > ? ORDER BY rowid',
+                                      (cache.watermark,))
+                self._append(cache, cursor.fetchall())
+                cache.version = version
+                self.stats['incremental_fetches'] += 1
+                return cache.columns, cache.rows
+
+        cursor = conn.execute(f'SELECT rowid, * FROM {table} ORDER BY rowid')
+        cache.columns = [d[0] for d in cursor.description][1:]
+        cache.rows, cache.watermark = [], 0
+        cache.frame, cache.frame_rows = None, 0
+        self._append(cache, cursor.fetchall())
+        cache.version = version
+        self.stats['full_fetches'] += 1
+        return cache.columns, cache.rows
+
+    def _append(self, cache: _TableCache, fetched: List[tuple]):
+        if fetched:
+            cache.watermark = fetched[-1][0]
+            cache.rows.extend(row[1:] for row in fetched)
+        self.stats['rows_fetched'] += len(fetched)
+
+    def frame(self, table: str):
+        """pandas DataFrame for a table; only rows new since the last call are converted"""
+        with self._lock:
+            columns, rows = self._refresh(table)
+            cache = self._cache[table]
+            if cache.frame is None:
+                cache.frame = pd.DataFrame(rows, columns=columns)
+            elif cache.frame_rows < len(rows):
+                tail = pd.DataFrame(rows[cache.frame_rows:], columns=columns)
+                cache.frame = pd.concat([cache.frame, tail], ignore_index=True)
+            cache.frame_rows = len(rows)
+            return cache.frame
+
+    # ------------------------------------------------------------------
+    # Ad-hoc queries (aggregates, summaries)
+    # ------------------------------------------------------------------
+
+    def query(self, sql: str, params: tuple = ()) -> list:
+        """Result of a read query, re-executed only after the database changed"""
+        with self._lock:
+            version = self.data_version()
+            key = (sql, tuple(params))
+            cached = self._queries.get(key)
+            if cached is not None and cached[0] == version:
+                self.stats['query_hits'] += 1
+                return cached[1]
+            result = self._connection().execute(sql, params).fetchall()
+            self._queries[key] = (version, result)
+            self.stats['query_misses'] += 1
+            return result
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+            self._cache.clear()
+            self._queries.clear()
+
+
+_readers: Dict[str, ChangeAwareReader] = {}
+_readers_lock = threading.Lock()
+
+
+def shared_reader(db_path: str = './market_harmonics.db') -> ChangeAwareReader:
+    """One reader per database shared across Streamlit sessions and reruns"""
+    with _readers_lock:
+        reader = _readers.get(db_path)
+        if reader is None:
+            reader = _readers[db_path] = ChangeAwareReader(db_path)
+        return reader
+
+
+if __name__ == '__main__':
+    import os
+    import time
+    import tempfile
+    from db_migrations import migrate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'market_harmonics.db')
+        migrate(db_path)
+        writer = sqlite3.connect(db_path)
+        with writer:
+            writer.executemany('INSERT INTO trades (ticker, action, shares, price, amount, timestamp) '
+                               'VALUES (?, ?, ?, ?, ?, ?)',
+                               [(f'S{i % 500}', 'buy', 1.0, 10.0, 10.0, f'2025-11-06T00:{i % 60:02d}')
+                                for i in range(100_000)])
+
+        reader = ChangeAwareReader(db_path)
+        for label in ('cold', 'unchanged', 'after 10 new trades'):
+            if label.startswith('after'):
+                with writer:
+                    writer.executemany('INSERT INTO trades (ticker, action, shares, price, amount) '
+                                       'VALUES (?, ?, ?, ?, ?)', [('AAPL', 'buy', 1.0, 10.0, 10.0)] * 10)
+            start = time.perf_counter()
+            reader.rows('trades')
+            print(f"🔎 {label:>20s}: {(time.perf_counter() - start) * 1000:8.3f} ms")
+        print(f"   {reader.stats}")
+        reader.close()
+        writer.close()
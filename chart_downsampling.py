@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Chart Downsampling
+Point-budget reducers applied to dashboard figures before they are serialized:
+  - Largest-Triangle-Three-Buckets (LTTB) for time series (P&L, signals),
+    always keeping the first/last points and the global min/max
+  - stride and voxel-grid reducers for 3-D attractor paths
+apply_point_budget() rewrites Plotly traces in place so multi-megabyte
+figures become a few thousand points per chart.
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+# Default points per chart
+CHART_BUDGETS: Dict[str, int] = {
+    'trajectory_3d': 5000,
+    'performance': 2000,
+    'signal': 2000,
+}
+
+
+def _as_float(x) -> np.ndarray:
+    """Numeric x axis; datetimes become nanoseconds since the epoch"""
+    x = np.asarray(x)
+    if x.dtype == object:
+        x = np.array(x, dtype='datetime64[ns]')
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64, copy=False)
+
+
+def lttb_indices(x, y, budget: int, keep_extremes: bool = True) -> np.ndarray:
+    """Indices of at most `budget` points chosen by LTTB (sorted, first and last included)"""
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if budget >= n:
+        return np.arange(n)
+    if budget < 3:
+        return np.array([0, n - 1][:max(budget, 0)], dtype=np.int64)
+
+    extremes = np.array([], dtype=np.int64)
+    if keep_extremes and budget >= 5 and np.isfinite(y).any():
+        extremes = np.unique([np.nanargmin(y), np.nanargmax(y)])
+        budget -= len(extremes)
+
+    x = _as_float(x) if x is not None else np.arange(n, dtype=np.float64)
+    # Bucket edges: bucket i covers [edges[i], edges[i + 1]) of the interior points
+    edges = (np.arange(budget - 1) * ((n - 2) / (budget - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    counts = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+
+    selected = np.empty(budget, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(budget - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 1 < budget - 2:
+            cx, cy = mean_x[i + 1], mean_y[i + 1]
+        else:
+            cx, cy = x[n - 1], y[n - 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area between the previous pick, each candidate and the next bucket's centroid
+        area = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        a = start + int(np.nanargmax(area)) if np.isfinite(area).any() else start
+        selected[i + 1] = a
+
+    if len(extremes):
+        selected = np.union1d(selected, extremes)
+    return selected
+
+
+def lttb(x, y, budget: int, keep_extremes: bool = True):
+    """(x, y) reduced to the LTTB budget"""
+    idx = lttb_indices(x, y, budget, keep_extremes)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+def stride_indices(n: int, budget: int) -> np.ndarray:
+    """Evenly spaced indices that always include the last point"""
+    if budget >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max(budget, 2)).round().astype(np.int64))
+
+
+def voxel_indices(points: np.ndarray, budget: int, max_resolution: int = 1024) -> np.ndarray:
+    """First point (in path order) of each occupied voxel, with the grid sized to fit the budget"""
+    points = np.asarray(points, dtype=np.float64)
+    n = len(points)
+    if budget >= n:
+        return np.arange(n)
+
+    lo = points.min(axis=0)
+    extent = points.max(axis=0) - lo
+    extent[extent == 0] = 1.0
+    unit = (points - lo) / extent
+
+    def occupied(resolution: int) -> np.ndarray:
+        cells = np.minimum((unit * resolution).astype(np.int64), resolution - 1)
+        keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+        return np.unique(keys, return_index=True)[1]
+
+    # Largest grid whose occupied-voxel count still fits the budget
+    best = np.array([0], dtype=np.int64)
+    low, high = 1, max_resolution
+    while low <= high:
+        mid = (low + high) // 2
+        idx = occupied(mid)
+        if len(idx) + 2 <= budget:
+            best, low = idx, mid + 1
+        else:
+            high = mid - 1
+    return np.union1d(best, [0, n - 1])
+
+
+def reduce_path(points: np.ndarray, budget: int, mode: str = 'stride') -> np.ndarray:
+    """Indices reducing an (m, 3) path; 'stride' keeps the line continuous, 'voxel' keeps the shape"""
+    if mode == 'voxel':
+        return voxel_indices(points, budget)
+    if mode == 'stride':
+        return stride_indices(len(points), budget)
+    raise ValueError(f'Unknown path reducer: {mode} (use stride or voxel)')
+
+
+def _slice_per_point(trace, idx: np.ndarray, n: int):
+    """Apply idx to every per-point attribute on a Plotly trace"""
+    for name in ('x', 'y', 'z', 'text', 'hovertext', 'customdata'):
+        values = getattr(trace, name, None)
+        if values is not None and not isinstance(values, str) and len(values) == n:
+            setattr(trace, name, np.asarray(values)[idx])
+    marker = getattr(trace, 'marker', None)
+    if marker is not None:
+        for name in ('color', 'size'):
+            values = getattr(marker, name, None)
+            if values is not None and not isinstance(values, str) and np.ndim(values) == 1 and len(values) == n:
+                setattr(marker, name, np.asarray(values)[idx])
+
+
+def apply_point_budget(fig, budget: int, path_mode: str = 'stride', keep_extremes: bool = True):
+    """Downsample every trace of a Plotly figure in place, sharing `budget` points by trace length"""
+    lengths = []
+    for trace in fig.data:
+        y = getattr(trace, 'y', None)
+        lengths.append(0 if y is None else len(y))
+    total = sum(lengths)
+    if total <= budget:
+        return fig
+
+    for trace, n in zip(fig.data, lengths):
+        if n == 0:
+            continue
+        share = max(3, int(budget * n / total))
+        if share >= n:
+            continue
+        z = getattr(trace, 'z', None)
+        if z is not None and np.ndim(z) == 1 and len(z) == n:
+            idx = reduce_path(np.column_stack([trace.x, trace.y, z]), share, path_mode)
+        else:
+            idx = lttb_indices(getattr(trace, 'x', None), trace.y, share, keep_extremes)
+        _slice_per_point(trace, idx, n)
+    return fig
+
+
+def budget_for(chart: str, override: Optional[int] = None) -> int:
+    return override if override is not None else CHART_BUDGETS.get(chart, 2000)
+
+
+if __name__ == '__main__':
+    from attractor_integrator import integrate
+
+    rng = np.random.default_rng(0)
+    series = np.cumsum(rng.normal(0, 1, 1_000_000))
+    start = time.perf_counter()
+    idx = lttb_indices(None, series, CHART_BUDGETS['performance'])
+    elapsed = time.perf_counter() - start
+    print(f"📉 LTTB 1,000,000 → {len(idx):,} points in {elapsed * 1000:.1f} ms "
+          f"(min/max kept: {series[idx].min() == series.min() and series[idx].max() == series.max()})")
+
+    path = integrate('lorenz', [1.0, 1.0, 1.0], 200_000)[0]
+    for mode in ('stride', 'voxel'):
+        start = time.perf_counter()
+        idx = reduce_path(path, CHART_BUDGETS['trajectory_3d'], mode)
+        print(f"🌀 {mode:>6s}: 200,001 → {len(idx):,} points in {(time.perf_counter() - start) * 1000:.1f} ms")
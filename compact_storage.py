@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Compact Attractor & Signal Storage
+Binary storage mode for attractor_states and strategy_signals:
+  - state vectors as packed little-endian float64 BLOBs (state_blob)
+  - market conditions / signal context in a compact tagged binary encoding
+    (varint lengths and integers, raw float64, packed float arrays)
+  - typed readers returning NumPy columns: one join + frombuffer for all
+    state vectors instead of a json.loads per row. Contexts are decoded only
+    on request - the pure-Python decoder is smaller on disk but not faster
+    than json's C parser.
+Migration 4 in db_migrations.py adds the BLOB columns and backfills them
+from the JSON text. The writers keep filling the text columns, which the
+Node server and older dashboards read, unless called with keep_json=False;
+compact_existing() drops the text only when explicitly run, once nothing
+reads it.
+"""
+
+import os
+import json
+import struct
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+CONTEXT_VERSION = 1
+
+# Context encoding tags
+_NONE, _FALSE, _TRUE, _INT, _FLOAT, _STR, _LIST, _MAP, _FLOATS = range(9)
+
+# Float lists at least this long are packed as one array
+PACKED_FLOATS_MIN = 4
+
+_DOUBLE = struct.Struct('<d')
+_unpack_double = _DOUBLE.unpack_from
+
+# table -> [(JSON text column, BLOB column, kind)]
+BLOB_COLUMNS: Dict[str, List[Tuple[str, str, str]]] = {
+    'attractor_states': [('state_vector', 'state_blob', 'vector'),
+                         ('market_conditions', 'conditions_blob', 'context')],
+    'strategy_signals': [('market_state', 'market_state_blob', 'context'),
+                         ('constitutional_context', 'context_blob', 'context')],
+}
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+
+def pack_vector(values) -> bytes:
+    """State vector as packed little-endian float64"""
+    return np.asarray(values, dtype='<f8').ravel().tobytes()
+
+
+def unpack_vector(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype='<f8')
+
+
+def _write_varint(out: bytearray, n: int):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _encode(value: Any, out: bytearray):
+    if value is None:
+        out.append(_NONE)
+    elif value is True or value is False:
+        out.append(_TRUE if value else _FALSE)
+    elif isinstance(value, (int, np.integer)):
+        value = int(value)
+        out.append(_INT)
+        _write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)    # zigzag
+    elif isinstance(value, (float, np.floating)):
+        out.append(_FLOAT)
+        out += _DOUBLE.pack(value)
+    elif isinstance(value, str):
+        raw = value.encode('utf-8')
+        out.append(_STR)
+        _write_varint(out, len(raw))
+        out += raw
+    elif isinstance(value, dict):
+        out.append(_MAP)
+        _write_varint(out, len(value))
+        for key, item in value.items():
+            _encode(str(key), out)
+            _encode(item, out)
+    elif isinstance(value, np.ndarray) and value.dtype.kind == 'f':
+        out.append(_FLOATS)
+        _write_varint(out, value.size)
+        out += value.astype('<f8').ravel().tobytes()
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        if len(value) >= PACKED_FLOATS_MIN and all(type(v) is float for v in value):
+            out.append(_FLOATS)
+            _write_varint(out, len(value))
+            out += struct.pack(f'<{len(value)}d', *value)
+        else:
+            out.append(_LIST)
+            _write_varint(out, len(value))
+            for item in value:
+                _encode(item, out)
+    else:
+        raise TypeError(f'Cannot encode {type(value).__name__} in a compact context')
+
+
+def _decode(buf: bytes, pos: int) -> Tuple[Any, int]:
+    # Most frequent tags first; single-byte varints (lengths < 128) are read inline
+    tag = buf[pos]
+    pos += 1
+    if tag == _STR:
+        n = buf[pos]
+        if n < 0x80:
+            pos += 1
+        else:
+            n, pos = _read_varint(buf, pos)
+        return buf[pos:pos + n].decode('utf-8'), pos + n
+    if tag == _FLOAT:
+        return _unpack_double(buf, pos)[0], pos + 8
+    if tag == _MAP:
+        n, pos = _read_varint(buf, pos)
+        mapping = {}
+        for _ in range(n):
+            key, pos = _decode(buf, pos)
+            mapping[key], pos = _decode(buf, pos)
+        return mapping, pos
+    if tag == _INT:
+        n, pos = _read_varint(buf, pos)
+        return (n >> 1) ^ -(n & 1), pos
+    if tag == _FLOATS:
+        n, pos = _read_varint(buf, pos)
+        return list(struct.unpack_from(f'<{n}d', buf, pos)), pos + 8 * n
+    if tag == _LIST:
+        n, pos = _read_varint(buf, pos)
+        items = []
+        for _ in range(n):
+            item, pos = _decode(buf, pos)
+            items.append(item)
+        return items, pos
+    if tag == _NONE:
+        return None, pos
+    if tag == _FALSE:
+        return False, pos
+    if tag == _TRUE:
+        return True, pos
+    raise ValueError(f'Unknown context tag {tag} at byte {pos - 1}')
+
+
+def pack_context(value: Any) -> bytes:
+    """JSON-shaped value (dicts, lists, str, numbers, bools, None) as compact binary"""
+    out = bytearray([CONTEXT_VERSION])
+    _encode(value, out)
+    return bytes(out)
+
+
+def unpack_context(blob: Optional[bytes]) -> Any:
+    if blob is None:
+        return None
+    if blob[0] != CONTEXT_VERSION:
+        raise ValueError(f'Unsupported context encoding version {blob[0]}')
+    value, _ = _decode(blob, 1)
+    return value
+
+
+def _pack(kind: str, value: Any) -> Optional[bytes]:
+    if value is None:
+        return None
+    return pack_vector(value) if kind == 'vector' else pack_context(value)
+
+
+# ----------------------------------------------------------------------
+# Writers
+# ----------------------------------------------------------------------
+
+def write_attractor_state(conn: sqlite3.Connection, attractor_type: str, state, fitness_score: Optional[float] = None,
+                          constitutional_filter: Optional[float] = None, market_conditions: Any = None,
+                          timestamp: Optional[str] = None, keep_json: bool = True) -> int:
+    """Insert one attractor state in binary form; keep_json=False leaves the legacy text columns empty"""
+    cursor = conn.execute(
+        'INSERT INTO attractor_states (timestamp, attractor_type, state_vector, fitness_score, '
+        'constitutional_filter, market_conditions, state_blob, conditions_blob) '
+        'VALUES (COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?, ?, ?)',
+        (timestamp, attractor_type,
+         json.dumps(np.asarray(state, dtype=float).tolist()) if keep_json else None,
+         fitness_score, constitutional_filter,
+         json.dumps(market_conditions) if keep_json and market_conditions is not None else None,
+         pack_vector(state), _pack('context', market_conditions))
+    )
+    return cursor.lastrowid
+
+
+def write_strategy_signal(conn: sqlite3.Connection, strategy: str, signal_type: str, ticker: Optional[str] = None,
+                          confidence: Optional[float] = None, reasoning: Optional[str] = None,
+                          market_state: Any = None, constitutional_context: Any = None,
+                          timestamp: Optional[str] = None, keep_json: bool = True) -> int:
+    """Insert one strategy signal with binary context columns; keep_json=False skips the text columns"""
+    cursor = conn.execute(
+        'INSERT INTO strategy_signals (timestamp, strategy, signal_type, ticker, confidence, reasoning, '
+        'market_state, constitutional_context, market_state_blob, context_blob) '
+        'VALUES (COALESCE(?, CURRENT_TIMESTAMP), ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (timestamp, strategy, signal_type, ticker, confidence, reasoning,
+         json.dumps(market_state) if keep_json and market_state is not None else None,
+         json.dumps(constitutional_context) if keep_json and constitutional_context is not None else None,
+         _pack('context', market_state), _pack('context', constitutional_context))
+    )
+    return cursor.lastrowid
+
+
+# ----------------------------------------------------------------------
+# Migration support
+# ----------------------------------------------------------------------
+
+def add_blob_columns(conn: sqlite3.Connection):
+    for table, columns in BLOB_COLUMNS.items():
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+        for _, blob_column, _ in columns:
+            if blob_column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {blob_column} BLOB')
+
+
+def backfill_blobs(conn: sqlite3.Connection, batch_size: int = 5000) -> int:
+    """Encode JSON text into the BLOB columns where the BLOB is missing; returns values converted
+
+    Text that does not parse is left alone (its BLOB stays NULL, readers fall back to it).
+    """
+    converted = 0
+    for table, columns in BLOB_COLUMNS.items():
+        for text_column, blob_column, kind in columns:
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    f'SELECT id, {text_column} FROM {table} WHERE id > ? AND {blob_column} IS NULL '
+                    f'AND {text_column} IS NOT NULL ORDER BY id LIMIT ?', (last_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                updates = []
+                for row_id, text in rows:
+                    try:
+                        updates.append((_pack(kind, json.loads(text)), row_id))
+                    except (ValueError, TypeError):
+                        continue
+                conn.executemany(f'UPDATE {table} SET {blob_column} = ? WHERE id = ?', updates)
+                converted += len(updates)
+                last_id = rows[-1][0]
+    return converted
+
+
+def compact_existing(db_path: str) -> dict:
+    """Drop the JSON text wherever a BLOB holds the same data, then VACUUM; returns sizes in bytes"""
+    before = _file_size(db_path)
+    conn = sqlite3.connect(db_path)
+    try:
+        for table, columns in BLOB_COLUMNS.items():
+            for text_column, blob_column, _ in columns:
+                conn.execute(f'UPDATE {table} SET {text_column} = NULL '
+                             f'WHERE {blob_column} IS NOT NULL AND {text_column} IS NOT NULL')
+        conn.commit()
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    return {'before': before, 'after': _file_size(db_path)}
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+# ----------------------------------------------------------------------
+# Typed readers
+# ----------------------------------------------------------------------
+
+def _where(filters: Iterable[Tuple[str, Any]], start: Optional[str], end: Optional[str]) -> Tuple[str, list]:
+    clauses, params = [], []
+    for column, value in filters:
+        if value is not None:
+            clauses.append(f'{column} = ?')
+            params.append(value)
+    if start is not None:
+        clauses.append('timestamp >= ?')
+        params.append(start)
+    if end is not None:
+        clauses.append('timestamp < ?')
+        params.append(end)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+
+def _timestamps(values: List[str]) -> np.ndarray:
+    try:
+        return np.array(values, dtype='datetime64[us]')
+    except ValueError:
+        return np.array(values, dtype=object)
+
+
+def _floats(values: List[Optional[float]]) -> np.ndarray:
+    return np.array(values, dtype=np.float64)      # NULL -> NaN
+
+
+def _states(blobs: List[Optional[bytes]], texts: List[Optional[str]]) -> np.ndarray:
+    """(n, d) states: one frombuffer over all BLOBs; JSON only for rows without one"""
+    if all(b is not None for b in blobs):
+        sizes = {len(b) for b in blobs}
+        if len(sizes) == 1:
+            return np.frombuffer(b''.join(blobs), dtype='<f8').reshape(len(blobs), -1)
+    vectors = []
+    for blob, text in zip(blobs, texts):
+        if blob is not None:
+            vectors.append(unpack_vector(blob))
+        else:
+            try:
+                vectors.append(np.asarray(json.loads(text), dtype=np.float64).ravel() if text else np.empty(0))
+            except (ValueError, TypeError):
+                vectors.append(np.empty(0))
+    width = max((len(v) for v in vectors), default=0)
+    states = np.full((len(vectors), width), np.nan)
+    for i, v in enumerate(vectors):
+        states[i, :len(v)] = v
+    return states
+
+
+def _contexts(blobs: List[Optional[bytes]], texts: List[Optional[str]]) -> List[Any]:
+    values = []
+    for blob, text in zip(blobs, texts):
+        if blob is not None:
+            values.append(unpack_context(blob))
+        else:
+            try:
+                values.append(json.loads(text) if text else None)
+            except ValueError:
+                values.append(None)
+    return values
+
+
+def attractor_history(conn: sqlite3.Connection, attractor_type: Optional[str] = None, start: Optional[str] = None,
+                      end: Optional[str] = None, limit: Optional[int] = None,
+                      with_conditions: bool = False) -> Dict[str, Any]:
+    """Attractor states in time order as NumPy columns
+
+    'state' is (n, d) float64 (NaN-padded if dimensions differ), fitness and
+    filter columns are float64 with NaN for NULL. Market conditions are only
+    decoded when with_conditions is set. limit keeps the most recent rows.
+    """
+    where, params = _where([('attractor_type', attractor_type)], start, end)
+    sql = (f'SELECT id, timestamp, attractor_type, fitness_score, constitutional_filter, state_blob, '
+           f'CASE WHEN state_blob IS NULL THEN state_vector END'
+           f'{", conditions_blob, CASE WHEN conditions_blob IS NULL THEN market_conditions END" if with_conditions else ""} '
+           f'FROM attractor_states{where} ORDER BY timestamp DESC, id DESC')
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    rows = conn.execute(sql, params).fetchall()[::-1]
+    columns = list(zip(*rows)) if rows else [[] for _ in range(9 if with_conditions else 7)]
+    result = {
+        'id': np.array(columns[0], dtype=np.int64),
+        'timestamp': _timestamps(list(columns[1])),
+        'attractor_type': np.array(columns[2], dtype=object),
+        'fitness_score': _floats(columns[3]),
+        'constitutional_filter': _floats(columns[4]),
+        'state': _states(list(columns[5]), list(columns[6])),
+    }
+    if with_conditions:
+        result['market_conditions'] = _contexts(columns[7], columns[8])
+    return result
+
+
+def signal_history(conn: sqlite3.Connection, strategy: Optional[str] = None, ticker: Optional[str] = None,
+                   start: Optional[str] = None, end: Optional[str] = None, limit: Optional[int] = None,
+                   with_context: bool = False) -> Dict[str, Any]:
+    """Strategy signals in time order as NumPy columns; contexts decoded only when with_context is set"""
+    where, params = _where([('strategy', strategy), ('ticker', ticker)], start, end)
+    sql = ('SELECT id, timestamp, strategy, signal_type, ticker, confidence'
+           + (', market_state_blob, CASE WHEN market_state_blob IS NULL THEN market_state END, '
+              'context_blob, CASE WHEN context_blob IS NULL THEN constitutional_context END' if with_context else '')
+           + f' FROM strategy_signals{where} ORDER BY timestamp DESC, id DESC')
+    if limit is not None:
+        sql += ' LIMIT ?'
+        params.append(limit)
+    rows = conn.execute(sql, params).fetchall()[::-1]
+    columns = list(zip(*rows)) if rows else [[] for _ in range(10 if with_context else 6)]
+    result = {
+        'id': np.array(columns[0], dtype=np.int64),
+        'timestamp': _timestamps(list(columns[1])),
+        'strategy': np.array(columns[2], dtype=object),
+        'signal_type': np.array(columns[3], dtype=object),
+        'ticker': np.array(columns[4], dtype=object),
+        'confidence': _floats(columns[5]),
+    }
+    if with_context:
+        result['market_state'] = _contexts(columns[6], columns[7])
+        result['constitutional_context'] = _contexts(columns[8], columns[9])
+    return result
+
+
+if __name__ == '__main__':
+    import tempfile
+    from db_migrations import migrate
+
+    n = 50_000
+    rng = np.random.default_rng(7)
+    conditions = {'regime': 'moderate_volatility', 'volatility': 0.1834, 'trend': -0.0213,
+                  'prices': rng.normal(100, 5, 8).round(2).tolist(), 'cycle': 1234}
+    stamps = [f'2025-11-01 {i // 3600 % 24:02d}:{i // 60 % 60:02d}:{i % 60:02d}' for i in range(n)]
+    states = rng.normal(0, 20, (n, 3))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        migrate(path)
+        conn = sqlite3.connect(path)
+        for i in range(n):
+            write_attractor_state(conn, 'lorenz', states[i], 0.5, market_conditions=conditions, timestamp=stamps[i])
+        conn.commit()
+
+        text_bytes, blob_bytes = conn.execute(
+            'SELECT SUM(length(state_vector) + length(market_conditions)), '
+            'SUM(length(state_blob) + length(conditions_blob)) FROM attractor_states').fetchone()
+        print(f"🗜️  {n:,} attractor states: state + conditions {text_bytes / n:.0f} bytes/row as JSON, "
+              f"{blob_bytes / n:.0f} bytes/row binary")
+
+        start = time.perf_counter()
+        rows = conn.execute('SELECT state_vector FROM attractor_states ORDER BY timestamp').fetchall()
+        np.array([json.loads(r[0]) for r in rows])
+        json_states = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = conn.execute('SELECT state_blob FROM attractor_states ORDER BY timestamp').fetchall()
+        _states([r[0] for r in rows], [None] * len(rows))
+        blob_states = time.perf_counter() - start
+        print(f"📖 States to ndarray: JSON {json_states * 1000:.0f} ms -> BLOB {blob_states * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        rows = conn.execute('SELECT market_conditions FROM attractor_states').fetchall()
+        [json.loads(r[0]) for r in rows]
+        json_context = time.perf_counter() - start
+        start = time.perf_counter()
+        rows = conn.execute('SELECT conditions_blob FROM attractor_states').fetchall()
+        [unpack_context(r[0]) for r in rows]
+        print(f"📖 Conditions decode: JSON {json_context * 1000:.0f} ms -> binary "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        attractor_history(conn)
+        print(f"📊 attractor_history() all columns: {(time.perf_counter() - start) * 1000:.0f} ms")
+        conn.close()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Deterministic Cycle Record & Replay
+Captures every external input a trading cycle consumes (quotes, FX rates,
+wall-clock reads and the random seed) into a compact gzip log, and replays
+that log so a cycle can be reproduced bit-for-bit offline.
+
+Usage from the engine: route external reads through an EngineInputs object
+
+    inputs = EngineInputs('record', './logs/cycles.cmhlog')
+    with inputs.cycle(cycle_number):
+        price = inputs.quote('FPH.NZ', lambda: fetch_live_price('FPH.NZ'))
+        rate = inputs.fx('NZD', lambda: fetch_fx('NZD'))
+        stamp = inputs.now()
+
+Replay uses the same calls with mode='replay'; the fetch callables are never run.
+
+The log is sync-flushed at the end of every cycle, so a recording whose
+process was killed still replays up to its last complete cycle; recording
+again into such a file first rewrites it without the unterminated tail.
+"""
+
+import os
+import gzip
+import math
+import time
+import random
+import struct
+import sys
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+LOG_MAGIC = b'CMHREC1\n'
+
+# Event kinds
+CYCLE_START = 1
+CYCLE_END = 2
+QUOTE = 3
+FX = 4
+CLOCK = 5
+SEED = 6
+FETCH_FAILED = 7
+
+KIND_NAMES = {
+    CYCLE_START: 'cycle_start',
+    CYCLE_END: 'cycle_end',
+    QUOTE: 'quote',
+    FX: 'fx',
+    CLOCK: 'clock',
+    SEED: 'seed',
+    FETCH_FAILED: 'fetch_failed'
+}
+
+EVENT_HEAD = struct.Struct('<BB')  # kind, key length
+EVENT_VALUE = struct.Struct('<d')
+
+Event = Tuple[int, str, float]
+
+
+class ReplayDivergence(Exception):
+    """The engine asked for an input the recording does not have at this point"""
+
+
+class ReplayedFetchError(RuntimeError):
+    """Raised during replay where the recorded fetch failed"""
+
+
+def write_event(f, kind: int, key: str, value: float):
+    raw_key = key.encode('utf-8')
+    f.write(EVENT_HEAD.pack(kind, len(raw_key)) + raw_key + EVENT_VALUE.pack(value))
+
+
+def read_events(path: str) -> Iterator[Event]:
+    """Yield (kind, key, value) events from a recorded log
+
+    A recording that was never closed ends without the gzip end-of-stream
+    marker, possibly mid-event; reading stops at the last complete event.
+    """
+    with gzip.open(path, 'rb') as f:
+        try:
+            magic = f.read(len(LOG_MAGIC))
+        except (EOFError, zlib.error):
+            return  # Killed before the first cycle was flushed
+        if magic != LOG_MAGIC:
+            raise ValueError(f'{path} is not a cycle recording')
+        while True:
+            try:
+                event = _read_event(f)
+            except (EOFError, zlib.error):
+                return  # Unterminated stream from an interrupted recording
+            if event is None:
+                return
+            yield event
+
+
+def _read_event(f) -> Optional[Event]:
+    head = f.read(EVENT_HEAD.size)
+    if len(head) < EVENT_HEAD.size:
+        return None
+    kind, key_len = EVENT_HEAD.unpack(head)
+    raw_key = f.read(key_len)
+    raw_value = f.read(EVENT_VALUE.size)
+    if len(raw_key) < key_len or len(raw_value) < EVENT_VALUE.size:
+        return None  # Truncated tail
+    return kind, raw_key.decode('utf-8'), EVENT_VALUE.unpack(raw_value)[0]
+
+
+def _is_terminated(path: str) -> bool:
+    """Whether a gzip file reads to its end-of-stream marker"""
+    try:
+        with gzip.open(path, 'rb') as f:
+            while f.read(1 << 16):
+                pass
+    except (EOFError, zlib.error):
+        return False
+    return True
+
+
+def repair_recording(path: str) -> int:
+    """Rewrite an unclosed recording with its complete cycles only; returns cycles kept
+
+    Appending a new gzip member after an unterminated one would leave the
+    new cycles unreadable, so record mode runs this on existing files first.
+    """
+    events: List[Event] = []
+    kept, open_cycle = 0, []
+    for event in read_events(path):
+        open_cycle.append(event)
+        if event[0] == CYCLE_END:
+            events.extend(open_cycle)
+            open_cycle = []
+            kept += 1
+    tmp_path = path + '.repair'
+    with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+        f.write(LOG_MAGIC)
+        for kind, key, value in events:
+            write_event(f, kind, key, value)
+    os.replace(tmp_path, path)
+    return kept
+
+
+def load_cycles(path: str) -> Dict[int, List[Event]]:
+    """Group a recording's events by cycle number (complete cycles only)"""
+    cycles: Dict[int, List[Event]] = {}
+    current: Optional[int] = None
+    events: List[Event] = []
+    for kind, key, value in read_events(path):
+        if kind == CYCLE_START:
+            current, events = int(value), []
+        elif kind == CYCLE_END:
+            if current is not None:
+                cycles[current] = events
+            current = None
+        elif current is not None:
+            events.append((kind, key, value))
+    return cycles
+
+
+class EngineInputs:
+    """Single gateway for a cycle's external inputs: live, record or replay"""
+
+    def __init__(self, mode: str = 'live', path: Optional[str] = None):
+        if mode not in ('live', 'record', 'replay'):
+            raise ValueError(f"Unknown input mode '{mode}'")
+        if mode != 'live' and not path:
+            raise ValueError(f"Mode '{mode}' needs a log path")
+        self.mode = mode
+        self.path = path
+        self.rng = random.Random()
+        self._log = None
+        self._cycles: Dict[int, List[Event]] = {}
+        self._cursor: Iterator[Event] = iter(())
+        self._cycle: Optional[int] = None
+        self._seed = 0
+        self._fetches = 0
+
+        if mode == 'record':
+            is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+            if not is_new and not _is_terminated(path):
+                print(f"⚠️  {path} was not closed cleanly; kept {repair_recording(path)} complete cycles")
+            self._log = gzip.open(path, 'ab', compresslevel=6)
+            if is_new:
+                self._log.write(LOG_MAGIC)
+        elif mode == 'replay':
+            self._cycles = load_cycles(path)
+
+    @property
+    def cycle_numbers(self) -> List[int]:
+        return sorted(self._cycles)
+
+    @contextmanager
+    def cycle(self, number: int):
+        """Bracket one trading cycle; seeds the random sources deterministically"""
+        self._cycle = number
+        if self.mode == 'replay':
+            if number not in self._cycles:
+                raise ReplayDivergence(f'Cycle {number} is not in {self.path}')
+            self._cursor = iter(self._cycles[number])
+            seed = int(self._expect(SEED, 'random'))
+        else:
+            seed = random.SystemRandom().getrandbits(52)
+            self._record(CYCLE_START, '', float(number))
+            self._record(SEED, 'random', float(seed))
+
+        # Engine code using the module-level random functions is covered too
+        self._seed, self._fetches = seed, 0
+        self.rng.seed(seed)
+        random.seed(seed)
+        if 'numpy' in sys.modules:
+            sys.modules['numpy'].random.seed(seed % (2 ** 32))
+
+        completed = False
+        try:
+            yield self
+            completed = True
+        finally:
+            self._cycle = None
+            if self.mode != 'replay':
+                # Failed cycles are closed out too, so the failure itself can be replayed
+                self._record(CYCLE_END, '', float(number))
+                if self._log is not None:
+                    self._log.flush()
+        if completed and self.mode == 'replay':
+            leftover = next(self._cursor, None)
+            if leftover is not None:
+                raise ReplayDivergence(
+                    f'Cycle {number} finished with unconsumed input '
+                    f'{KIND_NAMES[leftover[0]]}:{leftover[1]}')
+
+    # ------------------------------------------------------------------
+    # Inputs
+    # ------------------------------------------------------------------
+
+    def quote(self, ticker: str, fetch: Callable[[], Optional[float]]) -> Optional[float]:
+        return self._value(QUOTE, ticker, fetch)
+
+    def fx(self, currency: str, fetch: Callable[[], Optional[float]]) -> Optional[float]:
+        return self._value(FX, currency, fetch)
+
+    def time(self) -> float:
+        """Wall-clock seconds since the epoch"""
+        if self.mode == 'replay':
+            return self._expect(CLOCK, 'time')
+        now = time.time()
+        self._record(CLOCK, 'time', now)
+        return now
+
+    def now(self) -> datetime:
+        """Wall-clock time in UTC, so a replay does not depend on the machine's local timezone"""
+        return datetime.fromtimestamp(self.time(), tz=timezone.utc)
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _value(self, kind: int, key: str, fetch: Callable[[], Optional[float]]) -> Optional[float]:
+        if self.mode == 'replay':
+            event_kind, event_key, value = self._next()
+            if event_kind == FETCH_FAILED and event_key == key:
+                raise ReplayedFetchError(f'Recorded {KIND_NAMES[kind]} fetch for {key} failed')
+            if (event_kind, event_key) != (kind, key):
+                raise ReplayDivergence(
+                    f'Cycle {self._cycle}: engine asked for {KIND_NAMES[kind]}:{key}, '
+                    f'recording has {KIND_NAMES[event_kind]}:{event_key}')
+            return None if math.isnan(value) else value
+
+        # Fetches never run on replay, so any randomness they use (e.g. placeholder
+        # price jitter) must not advance the engine's own random stream
+        saved_state = random.getstate()
+        self._fetches += 1
+        random.seed(f'{self._seed}:{self._fetches}')
+        try:
+            value = fetch()
+        except Exception:
+            self._record(FETCH_FAILED, key, math.nan)
+            raise
+        finally:
+            random.setstate(saved_state)
+        self._record(kind, key, math.nan if value is None else float(value))
+        return value
+
+    def _expect(self, kind: int, key: str) -> float:
+        event_kind, event_key, value = self._next()
+        if (event_kind, event_key) != (kind, key):
+            raise ReplayDivergence(
+                f'Cycle {self._cycle}: engine asked for {KIND_NAMES[kind]}:{key}, '
+                f'recording has {KIND_NAMES[event_kind]}:{event_key}')
+        return value
+
+    def _next(self) -> Event:
+        event = next(self._cursor, None)
+        if event is None:
+            raise ReplayDivergence(f'Cycle {self._cycle}: recording ran out of inputs')
+        return event
+
+    def _record(self, kind: int, key: str, value: float):
+        if self.mode == 'record':
+            write_event(self._log, kind, key, value)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def benchmark_replay(path: str, run_cycle: Callable[[EngineInputs], None], repeats: int = 3) -> Dict[int, float]:
+    """Replay every recorded cycle through run_cycle; returns best-of-N seconds per cycle"""
+    inputs = EngineInputs('replay', path)
+    timings: Dict[int, float] = {}
+    for number in inputs.cycle_numbers:
+        best = math.inf
+        for _ in range(repeats):
+            start = time.perf_counter()
+            with inputs.cycle(number):
+                run_cycle(inputs)
+            best = min(best, time.perf_counter() - start)
+        timings[number] = best
+    return timings
+
+
+def summarize(path: str):
+    """Print what a recording contains"""
+    counts: Dict[str, int] = {}
+    for kind, _, _ in read_events(path):
+        counts[KIND_NAMES.get(kind, str(kind))] = counts.get(KIND_NAMES.get(kind, str(kind)), 0) + 1
+    cycles = load_cycles(path)
+    print(f"📼 {path}")
+    print(f"   Complete cycles: {len(cycles)}")
+    for name, count in sorted(counts.items()):
+        print(f"   {name:14s} {count:,}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python cycle_recorder.py <recording.cmhlog>")
+        sys.exit(1)
+    summarize(sys.argv[1])
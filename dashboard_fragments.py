@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Partial-Refresh Live Dashboard
+The live page split into independently refreshing Streamlit fragments, each
+with its own interval and its own data dependency:
+  - P&L ticker        every 2s,  latest performance snapshot only
+  - positions table   every 15s, portfolio_positions via the change-aware reader
+  - attractor view    every 5s,  advances the live attractor by a few steps
+  - signal history    every 30s, one range read of the materialized series
+A fragment rerun only re-executes that fragment, so the P&L tick never
+re-integrates the attractor or re-queries positions. Full reruns happen only
+when a sidebar control changes.
+
+    streamlit run dashboard_fragments.py
+"""
+
+import sqlite3
+import time
+from typing import Callable, Dict, Optional
+
+from attractor_integrator import SYSTEMS
+from change_aware_reads import shared_reader
+from chart_downsampling import CHART_BUDGETS, reduce_path
+from lazy_imports import lazy_import
+from signal_series import RESOLUTIONS, read_series
+from trading_queries import HOT_QUERIES, format_roi
+from trajectory_cache import render_debug_panel
+from trajectory_ring import RingAttractor
+
+pd = lazy_import('pandas')
+st = lazy_import('streamlit')
+go = lazy_import('plotly.graph_objects')
+
+DB_PATH = './market_harmonics.db'
+
+# Fragment -> seconds between refreshes
+REFRESH_SECONDS: Dict[str, float] = {
+    'pnl': 2.0,
+    'positions': 15.0,
+    'attractor': 5.0,
+    'signals': 30.0,
+}
+
+STEPS_PER_REFRESH = 200     # attractor steps integrated per attractor refresh
+VISIBLE_STEPS = 20000       # most recent steps drawn
+
+_fragments: Dict[str, Callable] = {}
+
+
+def _fragment(name: str, fn: Callable) -> Callable:
+    """fn wrapped as a Streamlit fragment with its own run_every, created once per process"""
+    if name not in _fragments:
+        decorator = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment')
+        _fragments[name] = decorator(run_every=REFRESH_SECONDS[name])(fn)
+    return _fragments[name]
+
+
+# ----------------------------------------------------------------------
+# Data shaping (no Streamlit)
+# ----------------------------------------------------------------------
+
+POSITION_COLUMNS = ['ticker', 'shares', 'entry_price', 'current_price', 'current_value', 'last_updated']
+SIGNAL_SERIES = ('ensemble', 'lorenz', 'chen', 'rossler')
+
+
+def snapshot_metrics(row: tuple, previous_value: Optional[float] = None) -> dict:
+    """Display strings for the P&L ticker from a latest_snapshot row"""
+    timestamp, value, cash, roi = row
+    return {'value': f"${value:,.2f}",
+            'delta': None if previous_value is None else f"{value - previous_value:+,.2f}",
+            'cash': f"${cash:,.2f}",
+            'roi': format_roi(roi),
+            'caption': f"Snapshot {timestamp}"}
+
+
+def latest_snapshot(db_path: str = DB_PATH) -> Optional[tuple]:
+    """The latest_snapshot row, or None before the engine has written one (or created the database)"""
+    try:
+        rows = shared_reader(db_path).query(HOT_QUERIES['latest_snapshot'][0])
+    except sqlite3.OperationalError:
+        return None
+    return rows[0] if rows else None
+
+
+def open_positions(db_path: str = DB_PATH):
+    """Open positions as a DataFrame; empty (same columns) until the engine has created the table"""
+    try:
+        frame = shared_reader(db_path).frame('portfolio_positions')
+    except sqlite3.OperationalError:
+        return pd.DataFrame(columns=POSITION_COLUMNS)
+    return frame.loc[frame['shares'] > 0, POSITION_COLUMNS]
+
+
+def attractor_params(state, system: str) -> tuple:
+    """The system's parameters from the sidebar state, JS defaults for any not set"""
+    spec = SYSTEMS[system]
+    return tuple(state.get(f'attractor_{system}_{name}', default)
+                 for name, default in zip(spec['params'], spec['defaults']))
+
+
+def load_signal_history(db_path: str, resolution: str, hours: float,
+                        now: Optional[float] = None) -> Optional[Dict[str, dict]]:
+    """{series: read_series columns} over the last `hours`, or None before any history exists"""
+    since = (time.time() if now is None else now) - hours * 3600
+    try:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            return {series: read_series(conn, series, resolution, since) for series in SIGNAL_SERIES}
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        return None
+
+
+# ----------------------------------------------------------------------
+# Fragments
+# ----------------------------------------------------------------------
+
+def pnl_ticker(db_path: str = DB_PATH):
+    """Portfolio value, cash and ROI from the latest snapshot"""
+    row = latest_snapshot(db_path)
+    if row is None:
+        st.info("No performance snapshots yet - start the engine with python start_trading.py")
+        return
+    metrics = snapshot_metrics(row, st.session_state.get('_pnl_previous_value'))
+    st.session_state['_pnl_previous_value'] = row[1]
+    cols = st.columns(3)
+    cols[0].metric("💰 Portfolio value", metrics['value'], metrics['delta'])
+    cols[1].metric("💵 Cash", metrics['cash'])
+    cols[2].metric("📈 ROI", metrics['roi'])
+    st.caption(metrics['caption'])
+
+
+def positions_table(db_path: str = DB_PATH):
+    """Open positions; the reader only re-reads the table after the engine commits"""
+    positions = open_positions(db_path)
+    st.subheader(f"📊 Positions ({len(positions)})")
+    st.dataframe(positions, hide_index=True, use_container_width=True)
+
+
+def _live_attractor(system: str, params: tuple) -> RingAttractor:
+    """Session's live attractor (last VISIBLE_STEPS points only), reset when the system or its parameters change"""
+    key = (system, params)
+    if st.session_state.get('_attractor_key') != key:
+        st.session_state['_attractor_key'] = key
+        st.session_state['_attractor'] = RingAttractor(system, (1.0, 1.0, 1.0), params, window=VISIBLE_STEPS)
+    return st.session_state['_attractor']
+
+
+def attractor_view():
+    """Live attractor: O(STEPS_PER_REFRESH) integration per refresh, downsampled before plotting"""
+    system = st.session_state.get('attractor_system', 'lorenz')
+    live = _live_attractor(system, attractor_params(st.session_state, system))
+    live.advance(STEPS_PER_REFRESH)
+
+    path = live.trajectory[0]
+    idx = reduce_path(path, CHART_BUDGETS['trajectory_3d'])
+    fig = go.Figure(go.Scatter3d(x=path[idx, 0], y=path[idx, 1], z=path[idx, 2], mode='lines',
+                                 line={'color': idx, 'colorscale': 'Viridis', 'width': 2}))
+    fig.update_layout(height=500, margin={'l': 0, 'r': 0, 't': 30, 'b': 0},
+                      title=f"🌀 {system.title()} attractor · {live.steps:,} steps")
+    st.plotly_chart(fig, use_container_width=True)
+    x, y, z = live.last_state[0]
+    ring = live.ring
+    divergence = ring.local_divergence(min(1000, len(ring)))[0] if len(ring) > 1 else 0.0
+    dimension = ring.box_dimension(min(2000, len(ring)))[0] if len(ring) > 1 else float('nan')
+    st.caption(f"State x={x:.2f} y={y:.2f} z={z:.2f} · divergence {divergence:.3f} · box dimension "
+               f"{dimension:.2f} · +{STEPS_PER_REFRESH} steps every {REFRESH_SECONDS['attractor']:.0f}s")
+
+
+def signal_history(db_path: str = DB_PATH):
+    """Materialized ensemble and member signals over the chosen window (no recomputation)"""
+    resolution = st.session_state.get('signal_resolution', '5m')
+    hours = st.session_state.get('signal_hours', 24)
+    history = load_signal_history(db_path, resolution, hours)
+    if history is None:
+        st.info("No signal history yet - it is recorded while the API server runs the attractor engine")
+        return
+    fig = go.Figure()
+    for series, data in history.items():
+        fig.add_trace(go.Scatter(x=data['bucket'], y=data['mean'], mode='lines', name=series,
+                                 line={'width': 3 if series == 'ensemble' else 1}))
+    fig.update_layout(height=300, margin={'l': 0, 'r': 0, 't': 30, 'b': 0},
+                      title=f"📶 Signals · {resolution} buckets · last {hours}h")
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# ----------------------------------------------------------------------
+# Page
+# ----------------------------------------------------------------------
+
+def sidebar_controls():
+    """Controls live outside the fragments: changing one is a deliberate full rerun"""
+    with st.sidebar:
+        st.header("⚙️ Controls")
+        system = st.selectbox("Attractor", list(SYSTEMS), key='attractor_system')
+        spec = SYSTEMS[system]
+        for name, default in zip(spec['params'], spec['defaults']):
+            st.number_input(name, value=float(default), key=f'attractor_{system}_{name}', format='%.4f')
+        st.selectbox("Signal resolution", list(RESOLUTIONS), index=1, key='signal_resolution')
+        st.slider("Signal window (hours)", 1, 24 * 7, 24, key='signal_hours')
+        with st.expander("🔎 Read cache", expanded=False):
+            st.json(shared_reader(DB_PATH).stats)
+        render_debug_panel(st=st)
+
+
+def render(db_path: str = DB_PATH):
+    st.set_page_config(page_title="Constitutional Market Harmonics - Live", page_icon="🌀", layout='wide')
+    st.title("🌀 Constitutional Market Harmonics - Live")
+    sidebar_controls()
+
+    _fragment('pnl', pnl_ticker)(db_path)
+    left, right = st.columns([3, 2])
+    with left:
+        _fragment('attractor', attractor_view)()
+    with right:
+        _fragment('positions', positions_table)(db_path)
+    _fragment('signals', signal_history)(db_path)
+
+
+if __name__ == '__main__':
+    render()
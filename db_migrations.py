@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Database Migrations
+Versioned, forward-only migrations for market_harmonics.db. Applied versions
+are recorded in schema_migrations, so running migrate() is always safe -
+whether the database was created by start_trading.py, populate_db.py or
+the Node DatabaseManager.
+"""
+
+import os
+import sqlite3
+import sys
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'database', 'schema.sql')
+
+# Market code derived from the ticker's exchange suffix (FPH.NZ -> NZ, CBA.AX -> AX, AAPL -> US)
+MARKET_EXPRESSION = (
+    "CASE WHEN instr(ticker, '.') > 0 "
+    "THEN upper(substr(ticker, instr(ticker, '.') + 1)) ELSE 'US' END"
+)
+
+
+def run_script(conn: sqlite3.Connection, script: str):
+    """Execute a multi-statement SQL script one statement at a time
+
+    Unlike executescript() this does not COMMIT first, so a migration's
+    statements stay inside the transaction migrate() opened for it.
+    """
+    statement = ''
+    for piece in script.split(';'):
+        statement += piece + ';'
+        if sqlite3.complete_statement(statement):
+            if any(line.strip() and not line.strip().startswith('--') for line in statement[:-1].splitlines()):
+                conn.execute(statement)
+            statement = ''
+
+
+def _base_schema(conn: sqlite3.Connection):
+    """Shared schema and its baseline indexes (no-op for tables that already exist)"""
+    with open(SCHEMA_PATH) as f:
+        run_script(conn, f.read())
+
+
+def _covering_indexes(conn: sqlite3.Connection):
+    """Covering indexes for the engine's and dashboard's hot reads"""
+    run_script(conn, '''
+    -- Recent trades for a ticker
+    CREATE INDEX IF NOT EXISTS idx_trades_ticker_time_cover
+      ON trades(ticker, timestamp, action, shares, price, amount);
+
+    -- Snapshots in a time range / latest snapshot / equity curve
+    CREATE INDEX IF NOT EXISTS idx_performance_time_cover
+      ON performance_snapshots(timestamp, portfolio_value, cash_balance, roi);
+
+    -- Dashboard: most recently updated positions
+    CREATE INDEX IF NOT EXISTS idx_portfolio_last_updated
+      ON portfolio_positions(last_updated);
+
+    -- Dashboard: latest attractor states across all attractor types
+    CREATE INDEX IF NOT EXISTS idx_attractor_time
+      ON attractor_states(timestamp);
+    ''')
+
+
+def _positions_market(conn: sqlite3.Connection):
+    """Virtual market column on positions so 'positions by market' is an index search"""
+    columns = {row[1] for row in conn.execute('PRAGMA table_xinfo(portfolio_positions)')}
+    if 'market' not in columns:
+        conn.execute(f'ALTER TABLE portfolio_positions ADD COLUMN market TEXT '
+                     f'GENERATED ALWAYS AS ({MARKET_EXPRESSION}) VIRTUAL')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_portfolio_market '
+                 'ON portfolio_positions(market, ticker, shares, current_value)')
+
+
+def _binary_storage(conn: sqlite3.Connection):
+    """Packed BLOB columns for attractor states and signal context, backfilled from the JSON text"""
+    # Imported here so migrate() on an up-to-date database never loads NumPy
+    from compact_storage import add_blob_columns, backfill_blobs
+
+    add_blob_columns(conn)
+    backfill_blobs(conn)
+
+
+def _signal_series(conn: sqlite3.Connection):
+    """Materialized signal series, clustered by (series, resolution, bucket) for single range reads"""
+    run_script(conn, '''
+    CREATE TABLE IF NOT EXISTS signal_series (
+      series TEXT NOT NULL,             -- attractor member name or 'ensemble'
+      resolution INTEGER NOT NULL,      -- bucket width in seconds
+      bucket INTEGER NOT NULL,          -- bucket start, unix seconds
+      count INTEGER NOT NULL,
+      total REAL NOT NULL,
+      minimum REAL NOT NULL,
+      maximum REAL NOT NULL,
+      last REAL NOT NULL,
+      last_time REAL NOT NULL,
+      confidence_total REAL NOT NULL,
+      PRIMARY KEY (series, resolution, bucket)
+    ) WITHOUT ROWID;
+    ''')
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, 'base schema and baseline indexes', _base_schema),
+    (2, 'covering indexes for hot queries', _covering_indexes),
+    (3, 'positions market column and index', _positions_market),
+    (4, 'binary attractor state and signal context columns', _binary_storage),
+    (5, 'materialized signal series', _signal_series),
+]
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    conn.execute('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+      version INTEGER PRIMARY KEY,
+      name TEXT NOT NULL,
+      applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_migrations').fetchone()
+    return row[0] or 0
+
+
+def migrate(db_path: str = './market_harmonics.db', verbose: bool = False) -> int:
+    """Apply pending migrations in order; returns the resulting schema version
+
+    Each migration and its schema_migrations row commit together in one
+    explicit transaction, so a migration that fails part-way leaves the
+    schema exactly as it was before it started.
+    """
+    conn = sqlite3.connect(db_path, isolation_level=None)   # transactions are managed explicitly below
+    try:
+        version = current_version(conn)
+        applied = False
+        for number, name, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            conn.execute('BEGIN')
+            try:
+                apply(conn)
+                conn.execute('INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)',
+                             (number, name, datetime.now().isoformat()))
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            version = number
+            applied = True
+            if verbose:
+                print(f"✅ Migration {number}: {name}")
+        if applied:
+            # Refresh planner statistics so the new indexes are picked up
+            conn.execute('ANALYZE')
+        return version
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    path = sys.argv[1] if len(sys.argv) > 1 else './market_harmonics.db'
+    print(f"🗄️  Migrating {path}")
+    print(f"   Schema version: {migrate(path, verbose=True)}")
@@ -0,0 +1,57 @@
+"""
+Constitutional Market Harmonics - Lazy Imports
+Defers heavy network, data-frame and plotting dependencies (yfinance,
+requests, pandas, numpy, plotly) until first attribute access, so engine
+modules can be imported - and quick CLI commands answered - without paying
+for libraries the command never touches.
+"""
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Dict, Iterable
+
+# Imported at the top of start_trading.py and the modules built on it
+HEAVY_MODULES = ('yfinance', 'requests', 'pandas', 'plotly')
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return a module whose real import happens on first attribute access"""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:  # Parent package of a dotted name is missing
+        spec = None
+    if spec is None:
+        return _MissingModule(name)
+
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def defer(names: Iterable[str] = HEAVY_MODULES) -> Dict[str, ModuleType]:
+    """Register lazy modules up front, so a later plain `import name` anywhere gets the lazy one
+
+    Lets engine modules that import their dependencies at the top start
+    without loading them; a dependency that is not installed is left alone,
+    so its import still fails where it is written.
+    """
+    return {name: lazy_import(name) for name in names}
+
+
+class _MissingModule(ModuleType):
+    """Placeholder for an optional dependency that is not installed"""
+
+    def __getattr__(self, attr):
+        raise ImportError(f"Optional dependency '{self.__name__}' is not installed "
+                          f"(needed for {self.__name__}.{attr})")
+
+    def __bool__(self):
+        return False
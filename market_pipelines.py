@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Concurrent Market Pipelines
+Runs each market's fetch -> value -> stop-check pipeline concurrently on a
+thread pool (NZX, ASX, LSE, US ... are independent until rebalancing), then
+meets at a single barrier for the cross-market rebalance and persistence.
+Per-market stage latencies are reported so the dominating exchange is obvious.
+"""
+
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from quote_client import default_route
+
+FetchStage = Callable[[str, List[str]], Dict[str, Optional[float]]]
+ValueStage = Callable[[str, Dict[str, Optional[float]]], Any]
+StopStage = Callable[[str, Dict[str, Optional[float]]], Any]
+
+
+def group_by_market(tickers: Iterable[str], route: Callable[[str], str] = default_route) -> Dict[str, List[str]]:
+    """{market code: tickers} using the ticker's exchange suffix"""
+    markets: Dict[str, List[str]] = defaultdict(list)
+    for ticker in tickers:
+        markets[route(ticker)].append(ticker)
+    return dict(markets)
+
+
+def _run_market(market: str, tickers: List[str], fetch: FetchStage, value: ValueStage,
+                stop_check: Optional[StopStage]) -> dict:
+    """One market's pipeline with per-stage timings; errors are captured, not raised"""
+    result = {'market': market, 'tickers': len(tickers), 'prices': {}, 'valuation': None,
+              'stops': None, 'error': None, 'timings': {}}
+    start = time.perf_counter()
+    stage = 'fetch'
+    try:
+        result['prices'] = fetch(market, tickers)
+        fetched = time.perf_counter()
+        result['timings']['fetch'] = fetched - start
+
+        stage = 'value'
+        result['valuation'] = value(market, result['prices'])
+        valued = time.perf_counter()
+        result['timings']['value'] = valued - fetched
+
+        if stop_check is not None:
+            stage = 'stop_check'
+            result['stops'] = stop_check(market, result['prices'])
+            result['timings']['stop_check'] = time.perf_counter() - valued
+    except Exception as e:
+        result['error'] = f'{stage}: {e}'
+    result['timings']['total'] = time.perf_counter() - start
+    return result
+
+
+class MarketPipelineRunner:
+    """Concurrent per-market sub-pipelines with a rebalance/persist barrier"""
+
+    def __init__(self, fetch: FetchStage, value: ValueStage, stop_check: Optional[StopStage] = None,
+                 rebalance: Optional[Callable[[Dict[str, dict]], Any]] = None,
+                 persist: Optional[Callable[[Dict[str, dict], Any], None]] = None,
+                 max_workers: int = 8, concurrent: bool = True):
+        self.fetch = fetch
+        self.value = value
+        self.stop_check = stop_check
+        self.rebalance = rebalance
+        self.persist = persist
+        self.concurrent = concurrent
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='market') if concurrent else None
+        self.last_report: Optional[dict] = None
+
+    def run_cycle(self, markets: Dict[str, List[str]]) -> dict:
+        """Run one cycle; returns per-market results plus timing report"""
+        cycle_start = time.perf_counter()
+
+        if self.concurrent:
+            futures = {
+                market: self._pool.submit(_run_market, market, tickers, self.fetch, self.value, self.stop_check)
+                for market, tickers in markets.items()
+            }
+            # Barrier: every market pipeline finishes before anything cross-market happens
+            results = {market: future.result() for market, future in futures.items()}
+        else:
+            results = {market: _run_market(market, tickers, self.fetch, self.value, self.stop_check)
+                       for market, tickers in markets.items()}
+        barrier = time.perf_counter()
+
+        rebalance_result = self.rebalance(results) if self.rebalance else None
+        rebalanced = time.perf_counter()
+        if self.persist:
+            self.persist(results, rebalance_result)
+        done = time.perf_counter()
+
+        report = {
+            'markets': {m: r['timings'] for m, r in results.items()},
+            'errors': {m: r['error'] for m, r in results.items() if r['error']},
+            'pipelines': barrier - cycle_start,
+            'rebalance': rebalanced - barrier,
+            'persist': done - rebalanced,
+            'total': done - cycle_start,
+            'dominant_market': max(results, key=lambda m: results[m]['timings']['total']) if results else None
+        }
+        self.last_report = report
+        return {'results': results, 'rebalance': rebalance_result, 'report': report}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def print_report(report: dict):
+    """Per-market latency table for the cycle log"""
+    print(f"⏱️  Cycle {report['total'] * 1000:.1f} ms "
+          f"(pipelines {report['pipelines'] * 1000:.1f}, rebalance {report['rebalance'] * 1000:.1f}, "
+          f"persist {report['persist'] * 1000:.1f})")
+    for market, timings in sorted(report['markets'].items(), key=lambda kv: -kv[1]['total']):
+        marker = ' ◀ dominant' if market == report['dominant_market'] else ''
+        stages = ', '.join(f"{k} {v * 1000:.1f}" for k, v in timings.items() if k != 'total')
+        print(f"   {market:4s} {timings['total'] * 1000:8.1f} ms  ({stages}){marker}")
+    for market, error in report['errors'].items():
+        print(f"   ❌ {market}: {error}")
+
+
+if __name__ == '__main__':
+    import random
+
+    latency = {'US': 0.08, 'NZ': 0.25, 'AX': 0.15, 'L': 0.12}
+
+    def fetch(market, tickers):
+        time.sleep(latency.get(market, 0.05))
+        return {t: random.uniform(10, 100) for t in tickers}
+
+    def value(market, prices):
+        return sum(p for p in prices.values() if p is not None)
+
+    def stop_check(market, prices):
+        return [t for t, p in prices.items() if p is not None and p < 12]
+
+    universe = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ', 'CBA.AX', 'AZN.L', 'ULVR.L', 'HSBA.L']
+    markets = group_by_market(universe)
+    for concurrent in (False, True):
+        with MarketPipelineRunner(fetch, value, stop_check, rebalance=lambda r: None,
+                                  concurrent=concurrent) as runner:
+            print("🔀 Concurrent" if concurrent else "➡️  Sequential")
+            print_report(runner.run_cycle(markets)['report'])
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Synthetic Market Simulator
+Vectorized multi-asset price generator for load-testing without a network:
+  - correlated returns (global + per-exchange factor model)
+  - GARCH(1,1) volatility clustering
+  - Poisson jumps
+  - exchange sessions with overnight gaps
+  - per-exchange currencies with their own FX paths
+Prices are served through the same callables the live quote path uses
+(QuoteClient providers and FX fetchers), can be emitted as Polygon-style
+messages for tick_stream.ReplayServer, and can be driven in real time at
+10-100x speed.
+"""
+
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from quote_client import default_route
+
+# Exchange code -> (currency, session open UTC hour, session close UTC hour)
+EXCHANGES = {
+    'US': ('USD', 14.5, 21.0),
+    'NZ': ('NZD', 21.0, 3.75),
+    'AX': ('AUD', 23.0, 5.0),
+    'L': ('GBP', 8.0, 16.5),
+    'DE': ('EUR', 8.0, 16.5),
+    'AS': ('EUR', 8.0, 16.5),
+    'T': ('JPY', 0.0, 6.0),
+    'HK': ('HKD', 1.5, 8.0),
+    'TO': ('CAD', 14.5, 21.0),
+}
+
+# Exchange code -> local UTC offset in hours over the same season as the session hours above;
+# weekends are judged on the exchange's local calendar day (Monday 10:00 in Auckland is Sunday 21:00 UTC)
+UTC_OFFSETS = {'US': -5, 'NZ': 13, 'AX': 11, 'L': 0, 'DE': 1, 'AS': 1, 'T': 9, 'HK': 8, 'TO': -5}
+
+FX_START = {'USD': 1.0, 'NZD': 0.60, 'AUD': 0.66, 'GBP': 1.27, 'EUR': 1.09, 'JPY': 0.0067, 'HKD': 0.128, 'CAD': 0.74}
+
+SECONDS_PER_YEAR = 252 * 6.5 * 3600  # trading seconds
+
+
+class MarketSimulator:
+    """Correlated GARCH + jump price paths across exchanges and currencies"""
+
+    def __init__(self, symbols: List[str], seed: int = 42, dt: float = 1.0,
+                 start: Optional[datetime] = None, annual_vol: float = 0.25,
+                 global_correlation: float = 0.3, exchange_correlation: float = 0.2,
+                 garch_alpha: float = 0.08, garch_beta: float = 0.90,
+                 jumps_per_year: float = 4.0, jump_mean: float = -0.01, jump_std: float = 0.04,
+                 gap_vol: float = 0.01, fx_annual_vol: float = 0.08, respect_sessions: bool = True):
+        self.symbols = list(symbols)
+        self.index = {s: i for i, s in enumerate(self.symbols)}
+        self.rng = np.random.default_rng(seed)
+        self.dt = dt
+        self.clock = start or datetime(2025, 11, 3, 14, 30, tzinfo=timezone.utc)
+        self.respect_sessions = respect_sessions
+        n = len(self.symbols)
+
+        self.exchange_codes = sorted(EXCHANGES)
+        self._utc_offsets = [timedelta(hours=UTC_OFFSETS[code]) for code in self.exchange_codes]
+        codes = [default_route(s) for s in self.symbols]
+        self.exchange_of = np.array([self.exchange_codes.index(c if c in EXCHANGES else 'US') for c in codes])
+        self.currencies = sorted(FX_START)
+        self.currency_of = np.array([self.currencies.index(EXCHANGES[self.exchange_codes[e]][0])
+                                     for e in self.exchange_of])
+
+        # Factor loadings
+        self.w_global = np.sqrt(global_correlation)
+        self.w_exchange = np.sqrt(exchange_correlation)
+        self.w_idio = np.sqrt(max(0.0, 1 - global_correlation - exchange_correlation))
+
+        # GARCH(1,1) in per-step variance units
+        step_var = annual_vol ** 2 * dt / SECONDS_PER_YEAR
+        self.alpha, self.beta = garch_alpha, garch_beta
+        self.omega = step_var * (1 - garch_alpha - garch_beta)
+        self.variance = np.full(n, step_var)
+
+        self.jump_prob = jumps_per_year * dt / SECONDS_PER_YEAR
+        self.jump_mean, self.jump_std = jump_mean, jump_std
+        self.gap_vol = gap_vol
+        self.fx_step_vol = fx_annual_vol * np.sqrt(dt / SECONDS_PER_YEAR)
+
+        self.prices = self.rng.uniform(5, 500, n)
+        self.fx_rates = np.array([FX_START[c] for c in self.currencies])
+        self._usd = self.currencies.index('USD')
+        self.last_returns = np.zeros(n)
+        self.steps = 0
+
+        # Preallocated per-step buffers
+        self._z = np.empty(n)
+        self._shock = np.empty(n)
+        self._open = np.ones(len(self.exchange_codes), dtype=bool)
+        self._was_open = self._open.copy()
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+
+    def _session_mask(self) -> np.ndarray:
+        """Which exchanges are open at the simulated clock"""
+        if not self.respect_sessions:
+            return self._open
+        hour = self.clock.hour + self.clock.minute / 60.0
+        for i, code in enumerate(self.exchange_codes):
+            _, open_h, close_h = EXCHANGES[code]
+            if open_h < close_h:
+                is_open = open_h <= hour < close_h
+            else:  # Session wraps midnight UTC
+                is_open = hour >= open_h or hour < close_h
+            weekend = (self.clock + self._utc_offsets[i]).weekday() >= 5
+            self._open[i] = is_open and not weekend
+        return self._open
+
+    def step(self):
+        """Advance every asset and FX rate by one dt"""
+        n = len(self.symbols)
+        with self._lock:
+            open_mask = self._session_mask()
+            asset_open = open_mask[self.exchange_of]
+            reopened = (open_mask & ~self._was_open)[self.exchange_of]
+
+            # Correlated standard normals: global + exchange + idiosyncratic
+            global_z = self.rng.standard_normal()
+            exchange_z = self.rng.standard_normal(len(self.exchange_codes))
+            self.rng.standard_normal(n, out=self._z)
+            np.multiply(self._z, self.w_idio, out=self._z)
+            self._z += self.w_global * global_z
+            self._z += self.w_exchange * exchange_z[self.exchange_of]
+
+            # GARCH(1,1): sigma2_t = omega + alpha * r_{t-1}^2 + beta * sigma2_{t-1}
+            self.variance *= self.beta
+            self.variance += self.omega + self.alpha * self.last_returns ** 2
+            np.multiply(self._z, np.sqrt(self.variance), out=self._shock)
+
+            # Jumps
+            jumps = self.rng.random(n) < self.jump_prob
+            if jumps.any():
+                self._shock[jumps] += self.rng.normal(self.jump_mean, self.jump_std, jumps.sum())
+
+            # Closed markets do not move; markets that just opened gap
+            self._shock[~asset_open] = 0.0
+            if reopened.any():
+                self._shock[reopened] += self.rng.normal(0, self.gap_vol, reopened.sum())
+
+            self.prices *= np.exp(self._shock)
+            self.last_returns[:] = self._shock
+            self._was_open[:] = open_mask
+
+            self.fx_rates *= np.exp(self.rng.normal(0, self.fx_step_vol, len(self.currencies)))
+            self.fx_rates[self._usd] = 1.0
+
+            self.clock += timedelta(seconds=self.dt)
+            self.steps += 1
+
+    def generate(self, n_steps: int) -> np.ndarray:
+        """(n_steps x symbols) local-currency price paths"""
+        paths = np.empty((n_steps, len(self.symbols)))
+        for t in range(n_steps):
+            self.step()
+            paths[t] = self.prices
+        return paths
+
+    # ------------------------------------------------------------------
+    # Provider interface (same shape as the live quote path)
+    # ------------------------------------------------------------------
+
+    def quote(self, symbol: str) -> float:
+        """Current local-currency price"""
+        return float(self.prices[self.index[symbol]])
+
+    def fx(self, currency: str) -> float:
+        """Current rate to USD"""
+        return float(self.fx_rates[self.currencies.index(currency)])
+
+    def currency(self, symbol: str) -> str:
+        return self.currencies[self.currency_of[self.index[symbol]]]
+
+    def providers(self) -> Dict[str, callable]:
+        """QuoteClient providers keyed by exchange code"""
+        return {code: self.quote for code in self.exchange_codes}
+
+    def polygon_messages(self, n_steps: int, sizes: int = 100) -> Iterator[list]:
+        """Polygon-style trade messages (one list per step) for tick_stream.ReplayServer"""
+        for _ in range(n_steps):
+            self.step()
+            t_ms = int(self.clock.timestamp() * 1000)
+            open_assets = self._open[self.exchange_of]
+            yield [{'ev': 'T', 'sym': self.symbols[i], 'p': round(float(self.prices[i]), 4), 's': sizes, 't': t_ms}
+                   for i in np.flatnonzero(open_assets)]
+
+    # ------------------------------------------------------------------
+    # Real-time driver
+    # ------------------------------------------------------------------
+
+    def start(self, speed: float = 10.0) -> threading.Thread:
+        """Step in the background at `speed` x real time (dt simulated seconds per step)"""
+        interval = self.dt / speed
+
+        def _run():
+            next_tick = time.monotonic()
+            while self._running:
+                self.step()
+                next_tick += interval
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+        self._running = True
+        self._thread = threading.Thread(target=_run, name='market-simulator', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+
+
+if __name__ == '__main__':
+    from benchmark_engine import synthetic_universe
+
+    for n in (100, 1000, 10000):
+        sim = MarketSimulator(synthetic_universe(n), respect_sessions=False)
+        start = time.perf_counter()
+        paths = sim.generate(2000)
+        elapsed = time.perf_counter() - start
+        returns = np.diff(np.log(paths), axis=0)
+        print(f"🎲 {n:>6,} symbols x 2,000 steps in {elapsed:.2f}s "
+              f"(up to {2000 * sim.dt / elapsed:,.0f}x real time at dt={sim.dt:g}s), "
+              f"mean pairwise corr {np.corrcoef(returns[:, :50].T)[np.triu_indices(50, 1)].mean():.2f}")
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Price History Ring Buffers
+Preallocated (symbols x window) NumPy ring buffers holding recent prices and
+log returns for the whole trading universe. Appending a cycle is O(1) per
+symbol, and momentum / moving-average / volatility are computed for every
+symbol in one vectorized pass into preallocated output arrays.
+
+Each ring is written twice (at i and i + window), so the most recent n
+samples are always one contiguous, zero-copy slice.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class PriceHistory:
+    """Fixed-size per-symbol price and log-return history"""
+
+    def __init__(self, symbols: Iterable[str], window: int = 256, dtype=np.float64):
+        self.symbols: List[str] = list(symbols)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self.window = window
+        n = len(self.symbols)
+
+        self._prices = np.full((n, 2 * window), np.nan, dtype=dtype)
+        self._returns = np.full((n, 2 * window), np.nan, dtype=dtype)
+        self._head = 0       # next write position in [0, window)
+        self.count = 0       # samples appended, capped at window
+        self.return_count = 0  # log returns held (the first sample has none), capped at window
+
+        # Preallocated working memory - nothing below allocates per cycle
+        self._staging = np.full(n, np.nan, dtype=dtype)
+        self._last = np.full(n, np.nan, dtype=dtype)
+        self._ret = np.empty(n, dtype=dtype)
+        self._missing = np.empty(n, dtype=bool)
+        self._scratch = np.empty((n, window), dtype=dtype)
+        self._out = {name: np.empty(n, dtype=dtype) for name in ('momentum', 'sma', 'sma_long', 'volatility', 'trend')}
+
+    def __len__(self):
+        return len(self.symbols)
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def append(self, prices: np.ndarray):
+        """Append one cycle of prices (row order = self.symbols, NaN = no quote)"""
+        # Carry the previous price forward for symbols without a fresh quote
+        np.copyto(self._staging, prices)
+        np.isnan(self._staging, out=self._missing)
+        if self._missing.any():
+            np.copyto(self._staging, self._last, where=self._missing)
+
+        np.divide(self._staging, self._last, out=self._ret)
+        np.log(self._ret, out=self._ret)
+
+        h, w = self._head, self.window
+        self._prices[:, h] = self._staging
+        self._prices[:, h + w] = self._staging
+        self._returns[:, h] = self._ret
+        self._returns[:, h + w] = self._ret
+        np.copyto(self._last, self._staging)
+
+        self._head = (h + 1) % w
+        if self.count:
+            self.return_count = min(self.return_count + 1, w)
+        self.count = min(self.count + 1, w)
+
+    def append_quotes(self, quotes: Dict[str, float]):
+        """Append one cycle from a {symbol: price} mapping; unknown symbols are ignored"""
+        self._staging.fill(np.nan)
+        index = self.index
+        for symbol, price in quotes.items():
+            row = index.get(symbol)
+            if row is not None and price is not None:
+                self._staging[row] = price
+        self.append(self._staging)
+
+    # ------------------------------------------------------------------
+    # Zero-copy views
+    # ------------------------------------------------------------------
+
+    def prices(self, n: Optional[int] = None) -> np.ndarray:
+        """View of the last n prices per symbol, oldest first (symbols x n)"""
+        n = self._check(n)
+        end = self._head + self.window
+        return self._prices[:, end - n:end]
+
+    def returns(self, n: Optional[int] = None) -> np.ndarray:
+        """View of the last n log returns per symbol, oldest first (symbols x n)
+
+        The first sample ever appended has no return, so at most count - 1
+        returns exist until the ring wraps.
+        """
+        if n is None:
+            n = self.return_count
+        elif n > self.return_count:
+            raise ValueError(f'Only {self.return_count} returns of history (asked for {n})')
+        end = self._head + self.window
+        return self._returns[:, end - n:end]
+
+    def latest(self) -> np.ndarray:
+        return self._last
+
+    def _check(self, n: Optional[int]) -> int:
+        if n is None:
+            return self.count
+        if n > self.count:
+            raise ValueError(f'Only {self.count} samples of history (asked for {n})')
+        return n
+
+    # ------------------------------------------------------------------
+    # Vectorized indicators
+    # ------------------------------------------------------------------
+
+    def momentum(self, lookback: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Fractional price change over the last `lookback` cycles"""
+        out = self._out['momentum'] if out is None else out
+        window = self.prices(lookback + 1)
+        np.divide(window[:, -1], window[:, 0], out=out)
+        out -= 1.0
+        return out
+
+    def sma(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Simple moving average of the last n prices"""
+        out = self._out['sma'] if out is None else out
+        np.add.reduce(self.prices(n), axis=1, out=out)
+        out /= n
+        return out
+
+    def volatility(self, n: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Sample standard deviation of the last n log returns"""
+        out = self._out['volatility'] if out is None else out
+        returns = self.returns(n)
+        scratch = self._scratch[:, :n]
+        np.add.reduce(returns, axis=1, out=out)
+        out /= n
+        np.subtract(returns, out[:, None], out=scratch)
+        np.square(scratch, out=scratch)
+        np.add.reduce(scratch, axis=1, out=out)
+        out /= max(n - 1, 1)
+        np.sqrt(out, out=out)
+        return out
+
+    def trend(self, short: int, long: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Short/long moving-average ratio minus one (positive = uptrend)"""
+        out = self._out['trend'] if out is None else out
+        long_ma = self.sma(long, out=self._out['sma_long'])
+        self.sma(short, out=out)
+        out /= long_ma
+        out -= 1.0
+        return out
+
+    def indicators(self, symbol: str, momentum: int = 5, short: int = 5, long: int = 20, vol: int = 20) -> dict:
+        """Per-symbol convenience lookup (allocates; use the vectorized calls in hot loops)"""
+        row = self.index[symbol]
+        result = {'price': float(self._last[row])}
+        if self.count > momentum:
+            result['momentum'] = float(self.momentum(momentum)[row])
+        if self.count >= long:
+            result['trend'] = float(self.trend(short, long)[row])
+        if self.return_count >= vol:
+            result['volatility'] = float(self.volatility(vol)[row])
+        return result
+
+
+def benchmark(n_symbols: int = 10000, window: int = 256, cycles: int = 500) -> dict:
+    """Per-cycle cost of append + momentum/MA/volatility over the whole universe"""
+    rng = np.random.default_rng(42)
+    history = PriceHistory([f'SYM{i}' for i in range(n_symbols)], window=window)
+    prices = rng.uniform(10, 500, n_symbols)
+    shocks = rng.normal(0, 0.01, (cycles, n_symbols))
+
+    append_time = indicator_time = 0.0
+    for c in range(cycles):
+        prices *= np.exp(shocks[c])
+        start = time.perf_counter()
+        history.append(prices)
+        mid = time.perf_counter()
+        if history.count >= 21:
+            history.momentum(20)
+            history.trend(5, 20)
+            history.volatility(20)
+        indicator_time += time.perf_counter() - mid
+        append_time += mid - start
+
+    return {
+        'symbols': n_symbols,
+        'window': window,
+        'append_us_per_cycle': append_time / cycles * 1e6,
+        'indicators_us_per_cycle': indicator_time / cycles * 1e6
+    }
+
+
+if __name__ == '__main__':
+    print("📈 Price history ring buffer benchmark")
+    for n in (100, 1000, 10000):
+        r = benchmark(n)
+        print(f"   {r['symbols']:>6,} symbols: append {r['append_us_per_cycle']:8.1f} µs/cycle, "
+              f"momentum+trend+volatility {r['indicators_us_per_cycle']:8.1f} µs/cycle")
@@ -3,14 +3,36 @@
 Simple Python API server for Constitutional Market Harmonics Dashboard
 """
 
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 import json
+import threading
 from datetime import datetime
 
+from attractor_engine import shared_engine
+from signal_series import RESOLUTIONS, series_payload, shared_job
+
+DB_PATH = './market_harmonics.db'
+
 app = Flask(__name__)
 CORS(app)
 
+_engine_lock = threading.Lock()
+
+
+def start_engine():
+    """Shared attractor engine on its own cycle; requests only read its latest signals"""
+    engine = shared_engine(DB_PATH)
+    with _engine_lock:
+        if not engine.running:
+            # Every signal the engine produces is materialized into signal_series in the background
+            submit = shared_job(DB_PATH).submit
+            if submit not in engine.listeners:
+                engine.listeners.append(submit)
+            engine.start()
+    return engine
+
+
 # Mock data
 DASHBOARD_DATA = {
     "success": True,
@@ -47,7 +69,8 @@ DASHBOARD_DATA = {
 
 @app.route('/api/dashboard', methods=['GET'])
 def get_dashboard():
-    return jsonify(DASHBOARD_DATA)
+    data = dict(DASHBOARD_DATA["data"], chaosSignals=start_engine().chaos_payload())
+    return jsonify({"success": True, "data": data})
 
 @app.route('/api/chat', methods=['POST'])
 def chat():
@@ -74,11 +97,22 @@ def get_chaos():
         "success": True,
         "data": {
             "constitutionalScore": 0.87,
+            "chaosSignals": start_engine().chaos_payload(),
             "timestamp": datetime.now().isoformat()
         }
     })
 
+@app.route('/api/signals/history', methods=['GET'])
+def get_signal_history():
+    resolution = request.args.get('resolution', '1m')
+    if resolution not in RESOLUTIONS:
+        return jsonify({"success": False, "error": f"resolution must be one of {', '.join(RESOLUTIONS)}"}), 400
+    data = series_payload(DB_PATH, request.args.get('series', 'ensemble'), resolution,
+                          request.args.get('start', type=float), request.args.get('end', type=float))
+    return jsonify({"success": True, "data": data})
+
 if __name__ == '__main__':
     print("🌀 Constitutional Market Harmonics - Python API Server")
+    start_engine()
     print("Starting server on http://localhost:3002")
     app.run(host='127.0.0.1', port=3002, debug=False)
\ No newline at end of file
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Shared Quote Client
+One client for every consumer of quotes (engine cycle, NZX checks, monitors,
+dashboard). Concurrent requests for the same symbol are coalesced into a
+single in-flight provider call, and each provider is guarded by a token
+bucket so bursts queue fairly instead of getting throttled upstream.
+Rate-limit wait time is exported per provider through metrics().
+
+get_price() adds a stale-while-revalidate path: the last known good price is
+served (tagged with its age) while a background refresh runs (at most one
+per symbol), and each provider sits behind a circuit breaker so one failing
+exchange never stalls the cycle for the others. A call that outlives
+get_price()'s timeout counts as one breaker failure, so a hung provider trips
+its breaker too; its eventual outcome is then not recorded again.
+"""
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+Fetcher = Callable[[str], Optional[float]]
+
+
+class CircuitOpenError(RuntimeError):
+    """Provider call skipped because its circuit breaker is open"""
+
+
+class Quote(NamedTuple):
+    symbol: str
+    price: Optional[float]
+    age: float              # seconds since the price was fetched
+    stale: bool
+    provider: str
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() waits its turn rather than failing"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate            # tokens per second
+        self.capacity = capacity    # burst size
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.max_wait = 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; returns seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now, even if it goes negative: later callers queue behind us
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+                self.max_wait = max(self.max_wait, wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open single probe -> closed"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go to the provider right now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def ready(self) -> bool:
+        """Whether allow() could let a call through now (an open breaker once reset_timeout has passed)"""
+        with self._lock:
+            return self.state != self.OPEN or time.monotonic() - self._opened_at >= self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.trips += 1
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key, fn: Callable[[], Any]):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.event.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+
+def default_route(symbol: str) -> str:
+    """Pick a provider name from the ticker's exchange suffix"""
+    return symbol.rsplit('.', 1)[1].upper() if '.' in symbol else 'US'
+
+
+class QuoteClient:
+    """Coalescing, rate-limited front door to the quote providers"""
+
+    def __init__(self, providers: Dict[str, Fetcher], limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 route: Callable[[str], str] = default_route, default_provider: Optional[str] = None,
+                 max_workers: int = 8, max_age: float = 60.0, timeout: float = 2.0,
+                 failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.providers = providers
+        self.route = route
+        self.default_provider = default_provider or next(iter(providers))
+        limits = limits or {}
+        # (requests per second, burst) per provider; 5/min mirrors MarketDataManager.js defaults
+        self.buckets = {name: TokenBucket(*limits.get(name, (5 / 60.0, 5))) for name in providers}
+        self.breakers = {name: CircuitBreaker(failure_threshold, reset_timeout) for name in providers}
+        self.max_age = max_age      # older cached prices are served stale and revalidated
+        self.timeout = timeout      # longest a cold get_price() waits on a provider
+        self._last_good: Dict[str, Tuple[float, float]] = {}
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._in_flight = set()         # (provider, symbol) calls waiting on the provider
+        self._counted = set()           # ...of which a timeout already told the breaker
+        self._revalidating = set()      # symbols with a background refresh queued or running
+        self._counters = {name: {'requests': 0, 'provider_calls': 0, 'errors': 0, 'short_circuited': 0,
+                                 'stale_served': 0, 'timeouts': 0} for name in providers}
+        # One pool per provider: a hung exchange can only tie up its own workers
+        self._pools = {name: ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'quote-{name}')
+                       for name in providers}
+
+    def provider_for(self, symbol: str) -> str:
+        name = self.route(symbol)
+        return name if name in self.providers else self.default_provider
+
+    def get_quote(self, symbol: str) -> Optional[float]:
+        """Quote for one symbol; concurrent callers for the same symbol share one provider call"""
+        provider = self.provider_for(symbol)
+        with self._lock:
+            self._counters[provider]['requests'] += 1
+        return self._flight.do((provider, symbol), lambda: self._call(provider, symbol))
+
+    def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Quotes for many symbols, fetched concurrently; failed symbols map to None"""
+        futures = {symbol: self._submit(self.get_quote, symbol) for symbol in dict.fromkeys(symbols)}
+        quotes = {}
+        for symbol, future in futures.items():
+            try:
+                quotes[symbol] = future.result()
+            except Exception as e:
+                print(f"⚠️  Quote for {symbol} failed: {e}")
+                quotes[symbol] = None
+        return quotes
+
+    def get_price(self, symbol: str) -> Quote:
+        """Stale-while-revalidate quote that never blocks longer than self.timeout"""
+        provider = self.provider_for(symbol)
+        cached = self._last_good.get(symbol)
+        now = time.time()
+
+        if cached is not None:
+            price, fetched_at = cached
+            age = now - fetched_at
+            if age <= self.max_age:
+                return Quote(symbol, price, age, False, provider)
+            # Serve the last known good price now and refresh behind the caller
+            with self._lock:
+                self._counters[provider]['stale_served'] += 1
+            # An open breaker still gets its half-open probe once reset_timeout has passed
+            if self.breakers[provider].ready():
+                with self._lock:
+                    pending = symbol in self._revalidating
+                    self._revalidating.add(symbol)
+                if not pending:
+                    self._submit(self._revalidate, symbol)
+            return Quote(symbol, price, age, True, provider)
+
+        future = self._submit(self.get_quote, symbol)
+        try:
+            price = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # One breaker failure per provider call, however many callers time out waiting on it
+            key = (provider, symbol)
+            with self._lock:
+                self._counters[provider]['timeouts'] += 1
+                count = key in self._in_flight and key not in self._counted
+                if count:
+                    self._counted.add(key)
+            if count:
+                self.breakers[provider].record_failure()
+            return Quote(symbol, None, float('inf'), True, provider)
+        except Exception:
+            return Quote(symbol, None, float('inf'), True, provider)
+        return Quote(symbol, price, 0.0, price is None, provider)
+
+    def get_prices(self, symbols: Iterable[str]) -> Dict[str, Quote]:
+        """get_price() for many symbols; cold misses are fetched concurrently"""
+        symbols = list(dict.fromkeys(symbols))
+        futures = {s: self._submit(self.get_quote, s) for s in symbols if s not in self._last_good}
+        deadline = time.monotonic() + self.timeout
+        for future in futures.values():
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                pass
+        return {s: self.get_price(s) if s in self._last_good else
+                Quote(s, None, float('inf'), True, self.provider_for(s)) for s in symbols}
+
+    def last_known(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """(price, age in seconds) of the last good quote, if any"""
+        cached = self._last_good.get(symbol)
+        return None if cached is None else (cached[0], time.time() - cached[1])
+
+    def _submit(self, fn: Callable[[str], Any], symbol: str):
+        return self._pools[self.provider_for(symbol)].submit(fn, symbol)
+
+    def _revalidate(self, symbol: str):
+        try:
+            self.get_quote(symbol)
+        except Exception:
+            pass  # Already counted by the breaker; the stale price keeps being served
+        finally:
+            with self._lock:
+                self._revalidating.discard(symbol)
+
+    def _call(self, provider: str, symbol: str) -> Optional[float]:
+        breaker = self.breakers[provider]
+        if not breaker.allow():
+            with self._lock:
+                self._counters[provider]['short_circuited'] += 1
+            raise CircuitOpenError(f'{provider} circuit open, skipping {symbol}')
+
+        self.buckets[provider].acquire()
+        key = (provider, symbol)
+        with self._lock:
+            self._counters[provider]['provider_calls'] += 1
+            self._in_flight.add(key)
+        try:
+            price = self.providers[provider](symbol)
+        except Exception:
+            with self._lock:
+                self._counters[provider]['errors'] += 1
+                counted = self._settle(key)
+            if not counted:
+                breaker.record_failure()
+            raise
+        with self._lock:
+            counted = self._settle(key)
+        if not counted:
+            breaker.record_success()
+        if price is not None:
+            self._last_good[symbol] = (price, time.time())
+        return price
+
+    def _settle(self, key: Tuple[str, str]) -> bool:
+        """Mark a provider call finished (under self._lock); True if a timeout already counted it"""
+        self._in_flight.discard(key)
+        counted = key in self._counted
+        self._counted.discard(key)
+        return counted
+
+    def metrics(self) -> Dict[str, dict]:
+        """Per-provider request, coalescing and rate-limit wait metrics"""
+        with self._lock:
+            result = {}
+            for name, counters in self._counters.items():
+                bucket = self.buckets[name]
+                result[name] = dict(
+                    counters,
+                    coalesced=counters['requests'] - counters['provider_calls'] - counters['short_circuited'],
+                    rate_limit_waits=bucket.waits,
+                    rate_limit_wait_seconds=bucket.wait_seconds,
+                    rate_limit_max_wait=bucket.max_wait,
+                    circuit_state=self.breakers[name].state,
+                    circuit_trips=self.breakers[name].trips
+                )
+            return result
+
+    def close(self):
+        for pool in self._pools.values():
+            pool.shutdown(wait=True)
+
+
+if __name__ == '__main__':
+    import random
+
+    def slow_provider(symbol):
+        time.sleep(0.05)
+        return round(random.uniform(10, 100), 2)
+
+    client = QuoteClient({'US': slow_provider, 'NZ': slow_provider},
+                         limits={'US': (20, 5), 'NZ': (10, 2)})
+    symbols = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ'] * 25
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        list(pool.map(client.get_quote, symbols))
+    elapsed = time.perf_counter() - start
+    client.close()
+
+    print(f"💹 {len(symbols)} concurrent quote requests in {elapsed:.2f}s")
+    for name, m in client.metrics().items():
+        print(f"   {name}: {m['requests']} requests → {m['provider_calls']} provider calls "
+              f"({m['coalesced']} coalesced), rate-limit wait {m['rate_limit_wait_seconds']:.2f}s")
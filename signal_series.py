@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Materialized Signal Series
+Attractor signal history written once, read everywhere. After each engine
+cycle the per-attractor and ensemble signals are folded into time buckets at
+several resolutions (1m / 5m / 1h / 1d) in the signal_series table, so the
+dashboard and API servers read history instead of recomputing it.
+
+  - a background thread drains submitted cycles and upserts every
+    (series, resolution, bucket) aggregate in one transaction; the engine
+    cycle only appends to a deque
+  - buckets keep count / sum / min / max / last and a confidence sum, so
+    any number of cycles merge into a bucket incrementally
+  - signal_series is a WITHOUT ROWID table clustered on
+    (series, resolution, bucket): any window is a single range read
+
+    job = SignalSeriesJob('./market_harmonics.db')
+    engine.listeners.append(job.submit)      # every engine.signal() is recorded
+    engine.start()                           # one signal per engine cycle; API reads add none
+"""
+
+import math
+import time
+import sqlite3
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from db_migrations import migrate
+
+DEFAULT_DB_PATH = './market_harmonics.db'
+
+# Name -> bucket width in seconds
+RESOLUTIONS: Dict[str, int] = {
+    '1m': 60,
+    '5m': 300,
+    '1h': 3600,
+    '1d': 86400,
+}
+
+ENSEMBLE = 'ensemble'
+
+UPSERT_SQL = '''
+INSERT INTO signal_series (series, resolution, bucket, count, total, minimum, maximum, last, last_time,
+                           confidence_total)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(series, resolution, bucket) DO UPDATE SET
+  count = count + excluded.count,
+  total = total + excluded.total,
+  minimum = min(minimum, excluded.minimum),
+  maximum = max(maximum, excluded.maximum),
+  last = CASE WHEN excluded.last_time >= last_time THEN excluded.last ELSE last END,
+  last_time = max(last_time, excluded.last_time),
+  confidence_total = confidence_total + excluded.confidence_total
+'''
+
+RANGE_SQL = '''
+SELECT bucket, count, total, minimum, maximum, last, confidence_total FROM signal_series
+WHERE series = ? AND resolution = ? AND bucket >= ? AND bucket < ?
+ORDER BY bucket
+'''
+
+# (series, timestamp, value, confidence)
+Sample = Tuple[str, float, float, float]
+
+# Columns read_series() returns
+SERIES_COLUMNS = ('bucket', 'mean', 'min', 'max', 'last', 'confidence', 'count')
+
+
+def samples(result: dict) -> List[Sample]:
+    """One AttractorEngine.signal() result as per-member and ensemble samples"""
+    stamp = result['timestamp']
+    rows = [(name, stamp, s['signal'], s['confidence']) for name, s in result['individualSignals'].items()]
+    rows.append((ENSEMBLE, stamp, result['ensembleValue'], result['confidence']))
+    return rows
+
+
+def aggregate(rows: Iterable[Sample], resolutions: Iterable[int]) -> List[tuple]:
+    """Fold samples into one upsert row per (series, resolution, bucket)"""
+    buckets: Dict[tuple, list] = {}
+    for series, stamp, value, confidence in rows:
+        for resolution in resolutions:
+            key = (series, resolution, int(stamp // resolution) * resolution)
+            agg = buckets.get(key)
+            if agg is None:
+                buckets[key] = [1, value, value, value, value, stamp, confidence]
+            else:
+                agg[0] += 1
+                agg[1] += value
+                agg[2] = min(agg[2], value)
+                agg[3] = max(agg[3], value)
+                if stamp >= agg[5]:
+                    agg[4], agg[5] = value, stamp
+                agg[6] += confidence
+    return [key + tuple(agg) for key, agg in buckets.items()]
+
+
+def materialize(conn: sqlite3.Connection, results: Iterable[dict],
+                resolutions: Iterable[int] = RESOLUTIONS.values()) -> int:
+    """Merge engine results into signal_series in one transaction; returns buckets touched"""
+    rows = aggregate((s for result in results for s in samples(result)), list(resolutions))
+    with conn:
+        conn.executemany(UPSERT_SQL, rows)
+    return len(rows)
+
+
+class SignalSeriesJob:
+    """Background writer: submit() is O(1) on the engine thread, a daemon thread does the SQL"""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, resolutions: Iterable[int] = RESOLUTIONS.values(),
+                 flush_interval: float = 1.0):
+        self.db_path = db_path
+        self.resolutions = list(resolutions)
+        self.flush_interval = flush_interval
+        self.stats = {'submitted': 0, 'written': 0, 'dropped': 0, 'batches': 0, 'buckets': 0, 'errors': 0}
+        self.last_error: Optional[BaseException] = None
+
+        self._pending: Deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(threading.Lock())
+        self._wakeup = threading.Event()
+        self._stopping = False
+
+        migrate(db_path)
+        self._thread = threading.Thread(target=self._run, name='signal-series', daemon=True)
+        self._thread.start()
+
+    def submit(self, result: dict):
+        """Queue one engine.signal() result (usable directly as an engine listener)"""
+        with self._lock:
+            self._pending.append(result)
+            self.stats['submitted'] += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything submitted so far is in SQLite
+
+        Returns False on timeout, or if a write failed meanwhile (see
+        last_error); cycles that hit a SQLite error stay queued and are
+        retried by the background thread.
+        """
+        target = self.stats['submitted']
+        errors, dropped = self.stats['errors'], self.stats['dropped']
+        self._wakeup.set()
+        with self._flushed:
+            self._flushed.wait_for(lambda: self._processed() >= target or self.stats['errors'] > errors,
+                                   timeout=timeout)
+            return self._processed() >= target and self.stats['dropped'] == dropped
+
+    def _processed(self) -> int:
+        return self.stats['written'] + self.stats['dropped']
+
+    def close(self):
+        """Write what is pending and stop the background thread"""
+        with self._lock:
+            if self._stopping:
+                return
+            self._stopping = True
+        self._wakeup.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _run(self):
+        """Drain submitted cycles into SQLite until closed"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                stopping = self._stopping
+                if self._pending:
+                    self._write_batch(conn)
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection) -> bool:
+        """Materialize everything pending in one transaction
+
+        Cycles leave the queue only once committed. A SQLite error keeps them
+        queued for the next attempt; a batch materialize() rejects for any
+        other reason (a malformed result) would fail every retry, so it is
+        dropped instead of blocking the queue.
+        """
+        with self._lock:
+            batch = list(self._pending)
+
+        try:
+            touched = materialize(conn, batch, self.resolutions)
+        except sqlite3.Error as e:
+            self._failed(e, f"{len(batch)} cycles kept for retry")
+            return False
+        except Exception as e:
+            self._pop(len(batch))
+            self._failed(e, f"{len(batch)} cycles dropped", dropped=len(batch))
+            return False
+
+        self._pop(len(batch))
+        self.last_error = None
+        self.stats['batches'] += 1
+        self.stats['buckets'] += touched
+        with self._flushed:
+            self.stats['written'] += len(batch)
+            self._flushed.notify_all()
+        return True
+
+    def _pop(self, n: int):
+        with self._lock:
+            for _ in range(n):
+                self._pending.popleft()
+
+    def _failed(self, error: BaseException, outcome: str, dropped: int = 0):
+        print(f"⚠️  Signal series write failed, {outcome}: {error}")
+        with self._flushed:
+            self.last_error = error
+            self.stats['errors'] += 1
+            self.stats['dropped'] += dropped
+            self._flushed.notify_all()
+
+
+def read_series(conn: sqlite3.Connection, series: str = ENSEMBLE, resolution='1m', start: Optional[float] = None,
+                end: Optional[float] = None) -> Dict[str, np.ndarray]:
+    """Buckets of one series in [start, end) (unix seconds) as NumPy columns, from one range read
+
+    Returns bucket start times (datetime64[s]), mean / min / max / last signal,
+    mean confidence and the number of cycles per bucket.
+    """
+    resolution = RESOLUTIONS.get(resolution, resolution)
+    lo = -math.inf if start is None else int(start // resolution) * resolution
+    rows = conn.execute(RANGE_SQL, (series, resolution, lo, math.inf if end is None else end)).fetchall()
+    data = np.array(rows, dtype=np.float64).reshape(len(rows), 7)
+    count = data[:, 1]
+    return {
+        'bucket': data[:, 0].astype('datetime64[s]'),
+        'mean': data[:, 2] / count,
+        'min': data[:, 3],
+        'max': data[:, 4],
+        'last': data[:, 5],
+        'confidence': data[:, 6] / count,
+        'count': count.astype(np.int64),
+    }
+
+
+def series_payload(db_path: str = DEFAULT_DB_PATH, series: str = ENSEMBLE, resolution: str = '1m',
+                   start: Optional[float] = None, end: Optional[float] = None) -> dict:
+    """read_series as JSON-ready lists for the API servers; empty before any history exists"""
+    try:
+        conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+        try:
+            data = read_series(conn, series, resolution, start, end)
+        finally:
+            conn.close()
+    except sqlite3.OperationalError:
+        # No database yet, or signal_series not created (the engine has not started)
+        return {'series': series, 'resolution': resolution, **{key: [] for key in SERIES_COLUMNS}}
+    return {'series': series, 'resolution': resolution,
+            **{key: (values.astype(str) if key == 'bucket' else values).tolist() for key, values in data.items()}}
+
+
+_shared_jobs: Dict[str, SignalSeriesJob] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_job(db_path: str = DEFAULT_DB_PATH) -> SignalSeriesJob:
+    """One background writer per database per process"""
+    with _shared_lock:
+        job = _shared_jobs.get(db_path)
+        if job is None:
+            job = _shared_jobs[db_path] = SignalSeriesJob(db_path)
+        return job
+
+
+if __name__ == '__main__':
+    import os
+    import tempfile
+    from attractor_engine import AttractorEngine
+    from trajectory_cache import TrajectoryCache
+
+    engine = AttractorEngine(cache=TrajectoryCache(None))
+    results = []
+    start_time = time.time() - 7 * 86400
+    for i in range(20_000):                    # a week of 30-second cycles
+        result = engine.signal()
+        result['timestamp'] = start_time + 30 * i
+        results.append(result)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'market_harmonics.db')
+        with SignalSeriesJob(db_path) as job:
+            start = time.perf_counter()
+            for result in results:
+                job.submit(result)
+            submit_time = time.perf_counter() - start
+            job.flush()
+            total = time.perf_counter() - start
+        print(f"🗂️  {len(results):,} cycles: submit {submit_time / len(results) * 1e6:.1f} µs/cycle on the engine "
+              f"thread, materialized in {total:.2f}s ({job.stats['buckets']:,} bucket upserts)")
+
+        conn = sqlite3.connect(db_path)
+        for resolution in RESOLUTIONS:
+            start = time.perf_counter()
+            data = read_series(conn, ENSEMBLE, resolution, start_time, start_time + 7 * 86400)
+            print(f"📖 ensemble {resolution:>3s}: {len(data['bucket']):>6,} buckets in "
+                  f"{(time.perf_counter() - start) * 1000:6.2f} ms")
+        conn.close()
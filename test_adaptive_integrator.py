@@ -0,0 +1,28 @@
+import numpy as np
+
+from adaptive_integrator import dopri5
+from attractor_integrator import integrate
+
+
+def test_dopri5_matches_fine_rk4_and_spends_more_evaluations_for_tighter_tolerance():
+    reference = integrate('lorenz', [1.0, 1.0, 1.0], 2000, dt=0.001)[0, -1]
+    loose = dopri5('lorenz', [1.0, 1.0, 1.0], (0, 2.0), rtol=1e-4, atol=1e-7)
+    tight = dopri5('lorenz', [1.0, 1.0, 1.0], (0, 2.0), rtol=1e-9, atol=1e-12)
+
+    assert tight['status'] == 0 and tight['t'][-1] == 2.0
+    assert np.allclose(tight['y'][0, -1], reference, atol=1e-6)
+    assert tight['nfev'] > loose['nfev']
+    # FSAL: 6 evaluations per attempted step, plus the first and the step-size probe
+    assert tight['nfev'] == 6 * (tight['accepted'] + tight['rejected']) + 2
+
+
+def test_dense_output_resamples_a_batch_at_fixed_times():
+    initial = [[1.0, 1.0, 1.0], [1.0, 1.0, 1.0], [-5.0, 3.0, 20.0]]
+    times = np.linspace(0, 1.0, 101)
+    result = dopri5('lorenz', initial, (0, 1.0), rtol=1e-10, atol=1e-12, t_eval=times)
+    reference = integrate('lorenz', initial, 1000, dt=0.001)[:, ::10]
+
+    assert result['y'].shape == (3, 101, 3)
+    assert np.array_equal(result['t'], times)
+    assert np.allclose(result['y'][0], result['y'][1])
+    assert np.allclose(result['y'], reference, atol=1e-6)
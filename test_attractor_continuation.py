@@ -0,0 +1,52 @@
+import numpy as np
+
+from attractor_continuation import AttractorContinuation, checkpoint_live, continued_trajectory
+from attractor_integrator import integrate
+from trajectory_cache import TrajectoryCache
+
+
+def test_segments_match_single_integration_and_survive_save_load(tmp_path):
+    initial = np.random.default_rng(2).uniform(-5, 5, (12, 3))
+    live = AttractorContinuation('chen', initial, capacity=8)
+    for steps in (3, 50, 200, 1):
+        segment = live.advance(steps)
+        assert segment.shape == (12, steps, 3)
+    np.testing.assert_array_equal(live.trajectory, integrate('chen', initial, 254))
+
+    path = str(tmp_path / 'chen.npz')
+    live.save(path)
+    resumed = AttractorContinuation.load(path)
+    resumed.advance(46)
+    np.testing.assert_array_equal(resumed.trajectory, integrate('chen', initial, 300))
+
+
+def test_cached_prefix_is_extended_not_recomputed(tmp_path):
+    cache = TrajectoryCache(str(tmp_path))
+    short = continued_trajectory('lorenz', [1.0, 1.0, 1.0], 100, cache=cache)
+    longer = continued_trajectory('lorenz', [1.0, 1.0, 1.0], 400, cache=cache)
+    again = continued_trajectory('lorenz', [1.0, 1.0, 1.0], 250, cache=cache)
+    np.testing.assert_array_equal(longer[:, :101], short)
+    np.testing.assert_array_equal(longer, integrate('lorenz', [1.0, 1.0, 1.0], 400))
+    np.testing.assert_array_equal(again, longer[:, :251])
+    assert cache.summary()['misses'] == 1
+
+
+def test_live_refreshes_checkpoint_geometrically(tmp_path):
+    cache = TrajectoryCache(str(tmp_path))
+    puts = []
+    put = cache.put
+    cache.put = lambda key, arrays: puts.append(arrays['trajectory'].shape[1] - 1) or put(key, arrays)
+
+    for total in range(100, 3300, 100):      # 32 live refreshes of 100 steps
+        view = continued_trajectory('rossler', [1.0, 1.0, 1.0], total, cache=cache)
+    assert not view.flags.writeable
+    assert puts == [100, 200, 400, 800, 1600, 3200]
+    np.testing.assert_array_equal(view, integrate('rossler', [1.0, 1.0, 1.0], 3200))
+
+    # The tail past the last checkpoint is written on request and picked up by a new process
+    continued_trajectory('rossler', [1.0, 1.0, 1.0], 3500, cache=cache)
+    checkpoint_live(cache)
+    assert puts[-1] == 3500
+    restarted = TrajectoryCache(str(tmp_path))
+    continued_trajectory('rossler', [1.0, 1.0, 1.0], 3600, cache=restarted)
+    assert restarted.summary()['disk_hits'] == 1
@@ -0,0 +1,74 @@
+import time
+
+import numpy as np
+
+from attractor_engine import AttractorEngine, DEFAULT_MEMBERS
+from attractor_integrator import SYSTEMS, integrate, register_system
+from trajectory_cache import TrajectoryCache
+
+
+def _thomas(s, p, out):
+    x, y, z = s
+    b = p[0]
+    np.sin(y, out=out[0])
+    out[0] -= b * x
+    np.sin(z, out=out[1])
+    out[1] -= b * y
+    np.sin(x, out=out[2])
+    out[2] -= b * z
+
+
+def test_batched_kernel_matches_standalone_integration():
+    engine = AttractorEngine(warmup=0, cache=TrajectoryCache(None))
+    engine.advance(10)  # one renormalization: member columns are untouched by it
+    for i, name in enumerate(engine.names):
+        spec = DEFAULT_MEMBERS[name]
+        alone = integrate(spec['system'], spec['initial'], 10, SYSTEMS[spec['system']]['defaults'])[0, -1]
+        np.testing.assert_allclose(engine.kernel.state[:, 2 * i], alone, rtol=1e-12)
+
+
+def test_signal_and_api_payload_with_user_defined_system():
+    register_system('thomas', ('b', 'unused1', 'unused2'), (0.208186, 0.0, 0.0), _thomas, bounds=(-10.0, 10.0),
+                    signal_scale=5.0)
+    members = dict(DEFAULT_MEMBERS, thomas={'system': 'thomas', 'weight': 0.2, 'initial': (0.1, 0.0, 0.0)})
+    engine = AttractorEngine(members, warmup=500, cache=TrajectoryCache(None))
+    result = engine.signal()
+    assert set(result['individualSignals']) == {'lorenz', 'chen', 'rossler', 'thomas'}
+    assert result['decision'] in ('STRONG_BUY', 'BUY', 'HOLD', 'SELL', 'STRONG_SELL')
+    assert 0.0 <= result['confidence'] <= 1.0
+    assert engine.lyapunov()['lorenz'] > 0
+
+    payload = engine.chaos_payload()
+    assert -1.0 <= payload['lorenz']['signal'] <= 1.0
+    assert set(payload['ensemble']) == {'decision', 'confidence', 'value'}
+    del SYSTEMS['thomas']
+
+
+def test_each_member_advances_by_its_own_steps_per_signal():
+    engine = AttractorEngine(warmup=0, cache=TrajectoryCache(None))
+    assert engine.steps_per_signal == {'lorenz': 10, 'chen': 15, 'rossler': 12}
+    engine.signal()
+    for i, name in enumerate(engine.names):
+        spec = DEFAULT_MEMBERS[name]
+        alone = integrate(spec['system'], spec['initial'], spec['steps_per_signal'],
+                          SYSTEMS[spec['system']]['defaults'])[0, -1]
+        np.testing.assert_allclose(engine.kernel.state[:, 2 * i], alone, rtol=1e-12)
+    np.testing.assert_allclose(engine._elapsed, [0.10, 0.15, 0.12])
+
+
+def test_payload_reads_the_latest_signal_and_the_cycle_advances_the_engine():
+    engine = AttractorEngine(warmup=100, cache=TrajectoryCache(None))
+    seen = []
+    engine.listeners.append(seen.append)
+    first = engine.chaos_payload()          # no signal yet: computes one
+    steps = engine.steps
+    assert engine.chaos_payload() == first and engine.chaos_payload() == first
+    assert engine.steps == steps and len(seen) == 1
+
+    engine.start(interval=0.01)
+    deadline = time.monotonic() + 10
+    while len(seen) < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.stop()
+    assert not engine.running and len(seen) >= 4
+    assert engine.latest is seen[-1] and engine.steps == steps + 15 * (len(seen) - 1)
@@ -0,0 +1,64 @@
+import sqlite3
+
+import numpy as np
+
+import attractor_engine
+from attractor_engine import shared_engine
+from attractor_fitting import fit_parameters, fitted_members, load_returns, save_fit, signal_series
+from attractor_integrator import SYSTEMS
+from db_migrations import migrate
+
+
+def _planted_returns(n=300):
+    # Next-step returns driven by the signal of a known, non-default Lorenz parameter set
+    signal = signal_series('lorenz', [[13.0, 35.0, 2.0]], n, warmup=200)[0]
+    return 0.01 * signal + np.random.default_rng(3).normal(0, 0.002, n)
+
+
+def test_evolution_recovers_planted_signal_independent_of_workers():
+    returns = _planted_returns()
+    kwargs = dict(population=8, generations=4, warmup=200, seed=5)
+    inline = fit_parameters('lorenz', returns, workers=1, **kwargs)
+    pooled = fit_parameters('lorenz', returns, workers=2, **kwargs)
+
+    assert inline['params'] == pooled['params']
+    assert inline['history'] == sorted(inline['history'])
+    assert inline['train_correlation'] > inline['default_train_correlation']
+    assert inline['evaluations'] == 8 * 5
+
+
+def test_returns_load_from_market_data_and_fits_reach_the_engine(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    conn = sqlite3.connect(path)
+    conn.executemany('INSERT INTO market_data (ticker, timestamp, close_price) VALUES (?, ?, ?)',
+                     [('AAA', '2025-11-01', 10.0), ('AAA', '2025-11-02', 11.0), ('AAA', '2025-11-03', 12.1),
+                      ('BBB', '2025-11-01', 20.0), ('BBB', '2025-11-02', 20.0), ('BBB', '2025-11-03', 22.0),
+                      ('CCC', '2025-11-03', 5.0)])
+    conn.commit()
+    conn.close()
+    np.testing.assert_allclose(load_returns(path), [np.log(1.1) / 2, np.log(1.1)])
+    np.testing.assert_allclose(load_returns(path, ['AAA']), [np.log(1.1), np.log(1.1)])
+
+    save_fit({'system': 'chen', 'params': [4.0, -9.0, -0.4], 'param_names': ['a', 'b', 'c'],
+              'train_correlation': 0.1, 'validation_correlation': 0.05, 'returns': 2}, path)
+    members = fitted_members(path)
+    assert members['chen']['params'] == (4.0, -9.0, -0.4)
+    assert 'params' not in members['lorenz']
+
+
+def test_saved_fit_changes_the_shared_engine_params(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    defaults = shared_engine(path).params.copy()
+    np.testing.assert_array_equal(defaults[:, 0], SYSTEMS['lorenz']['defaults'])
+
+    save_fit({'system': 'lorenz', 'params': [13.0, 35.0, 2.0], 'param_names': ['sigma', 'rho', 'beta'],
+              'train_correlation': 0.2, 'validation_correlation': 0.1, 'returns': 300}, path)
+    attractor_engine._shared_engines.clear()     # as on the next server start
+    engine = shared_engine(path)
+    lorenz = engine.names.index('lorenz')
+    np.testing.assert_array_equal(engine.params[:, 2 * lorenz:2 * lorenz + 2], [[13.0] * 2, [35.0] * 2, [2.0] * 2])
+    np.testing.assert_array_equal(np.delete(engine.params, [2 * lorenz, 2 * lorenz + 1], axis=1),
+                                  np.delete(defaults, [2 * lorenz, 2 * lorenz + 1], axis=1))
+    attractor_engine._shared_engines.clear()
@@ -0,0 +1,65 @@
+import os
+import re
+
+import numpy as np
+import pytest
+
+from attractor_integrator import SYSTEMS, BatchIntegrator, integrate
+
+JS_ATTRACTORS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'attractors')
+
+
+def _reference_rk4_lorenz(state, steps, dt=0.01, sigma=10.0, rho=28.0, beta=8.0 / 3.0):
+    def f(s):
+        x, y, z = s
+        return np.array([sigma * (y - x), x * (rho - z) - y, x * y - beta * z])
+
+    s = np.array(state, dtype=float)
+    points = [s.copy()]
+    for _ in range(steps):
+        k1 = f(s) * dt
+        k2 = f(s + k1 / 2) * dt
+        k3 = f(s + k2 / 2) * dt
+        k4 = f(s + k3) * dt
+        s = np.clip(s + (k1 + 2 * k2 + 2 * k3 + k4) / 6, -50, 50)
+        points.append(s.copy())
+    return np.array(points)
+
+
+def test_rk4_matches_reference_implementation():
+    reference = _reference_rk4_lorenz([1.0, 1.0, 1.0], 500)
+    out = integrate('lorenz', [1.0, 1.0, 1.0], 500)
+    assert out.shape == (1, 501, 3)
+    np.testing.assert_allclose(out[0], reference, rtol=1e-9, atol=1e-9)
+    batched = integrate('lorenz', np.ones((16, 3)), 500)
+    np.testing.assert_allclose(batched[7], reference, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('system', ['lorenz', 'chen', 'rossler'])
+@pytest.mark.parametrize('method', ['euler', 'rk4'])
+def test_vectorized_batch_rows_equal_individual_runs(system, method):
+    rng = np.random.default_rng(1)
+    initial = rng.uniform(-1, 1, (16, 3))
+    batch = integrate(system, initial, 200, method=method)
+    for i in range(0, 16, 5):
+        np.testing.assert_allclose(batch[i], integrate(system, initial[i], 200, method=method)[0])
+
+
+def test_per_trajectory_parameters_and_preallocated_output():
+    params = np.array([[10.0, 28.0, 8.0 / 3.0], [10.0, 0.5, 8.0 / 3.0]])
+    integrator = BatchIntegrator('lorenz', 2)
+    out = np.empty((2, 1001, 3))
+    result = integrator.integrate([1.0, 1.0, 1.0], 1000, params, out=out)
+    assert result is out
+    # rho < 1: the origin is stable, so the second trajectory decays
+    assert np.abs(out[1, -1]).max() < 1e-2
+    assert np.abs(out[0, -1]).max() > 1
+    with pytest.raises(ValueError):
+        integrator.integrate([1.0, 1.0, 1.0], 10, out=out)
+
+
+@pytest.mark.parametrize('system', ['lorenz', 'chen', 'rossler'])
+def test_bounds_match_the_js_attractor_class(system):
+    with open(os.path.join(JS_ATTRACTORS, f'{system.capitalize()}Attractor.js')) as f:
+        lo, hi = re.search(r'this\.bounds = \{ min: (-?[\d.]+), max: (-?[\d.]+) \}', f.read()).groups()
+    assert SYSTEMS[system]['bounds'] == (float(lo), float(hi))
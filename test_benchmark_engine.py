@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Benchmark gate tests - tolerance and noise-floor boundaries of compare()
+"""
+
+from benchmark_engine import MEMORY_NOISE_MB, TIMING_NOISE_SECONDS, compare
+
+
+def _run(**metrics):
+    return {'results': {'1000': metrics}}
+
+
+def test_tolerance_boundary():
+    baseline = _run(cycle=1.0)
+    assert compare(_run(cycle=1.24), baseline, 0.25) == []
+    assert compare(_run(cycle=1.25), baseline, 0.25) == []         # exactly at tolerance passes
+    regressions = compare(_run(cycle=1.26), baseline, 0.25)
+    assert len(regressions) == 1 and regressions[0].startswith('1000 symbols cycle: 1.2600 vs baseline 1.0000')
+    assert compare(_run(cycle=0.5), baseline, 0.25) == []          # faster is never a regression
+
+
+def test_deltas_below_the_noise_floor_are_ignored():
+    # Tiny stages: tripling is still under the absolute floor
+    baseline = _run(valuation=0.0005, peak_memory_mb=2.0)
+    below = _run(valuation=0.0005 + TIMING_NOISE_SECONDS * 0.9, peak_memory_mb=2.0 + MEMORY_NOISE_MB * 0.9)
+    assert compare(below, baseline, 0.25) == []
+
+    above = _run(valuation=0.0005 + TIMING_NOISE_SECONDS * 1.1, peak_memory_mb=2.0 + MEMORY_NOISE_MB * 1.1)
+    regressions = compare(above, baseline, 0.25)
+    assert [line.split(':')[0] for line in regressions] == ['1000 symbols valuation', '1000 symbols peak_memory_mb']
+
+
+def test_sizes_and_metrics_missing_from_the_baseline_are_skipped():
+    current = {'results': {'1000': {'cycle': 9.0, 'rebalance': 9.0}, '10000': {'cycle': 9.0}}}
+    baseline = {'results': {'1000': {'cycle': 9.0, 'rebalance': 0.0}}}
+    assert compare(current, baseline, 0.25) == []
+    assert compare(current, {}, 0.25) == []
@@ -0,0 +1,107 @@
+import sqlite3
+
+import pytest
+
+from change_aware_reads import ChangeAwareReader
+from compact_storage import compact_existing, write_attractor_state
+from db_migrations import migrate
+
+
+def _insert_trades(conn, n, ticker='AAPL'):
+    with conn:
+        conn.executemany('INSERT INTO trades (ticker, action, shares, price, amount) VALUES (?, ?, ?, ?, ?)',
+                         [(ticker, 'buy', 1.0, 10.0, 10.0)] * n)
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    writer = sqlite3.connect(path)
+    yield path, writer
+    writer.close()
+
+
+def test_unchanged_reruns_are_served_from_cache_and_appends_are_incremental(db):
+    path, writer = db
+    _insert_trades(writer, 5)
+    reader = ChangeAwareReader(path)
+
+    columns, rows = reader.rows('trades')
+    assert 'ticker' in columns and len(rows) == 5
+    reader.rows('trades')
+    assert reader.stats['unchanged'] == 1 and reader.stats['full_fetches'] == 1
+
+    _insert_trades(writer, 3, 'MSFT')
+    _, rows = reader.rows('trades')
+    assert len(rows) == 8 and rows[-1][columns.index('ticker')] == 'MSFT'
+    assert reader.stats['incremental_fetches'] == 1 and reader.stats['rows_fetched'] == 8
+
+    with writer:
+        writer.execute('DELETE FROM trades')
+    assert reader.rows('trades')[1] == []
+    assert reader.stats['full_fetches'] == 2
+    reader.close()
+
+
+def test_delete_plus_insert_forces_a_full_reload(db):
+    path, writer = db
+    _insert_trades(writer, 5)
+    reader = ChangeAwareReader(path)
+    reader.rows('trades')
+
+    # Net row count and max rowid both grow, but row 2 is gone
+    with writer:
+        writer.execute('DELETE FROM trades WHERE id = 2')
+    _insert_trades(writer, 2, 'MSFT')
+    columns, rows = reader.rows('trades')
+    assert [row[columns.index('id')] for row in rows] == [1, 3, 4, 5, 6, 7]
+    assert reader.stats['full_fetches'] == 2 and reader.stats['incremental_fetches'] == 0
+
+    # Deleting the newest row and appending reuses nothing stale either
+    with writer:
+        writer.execute('DELETE FROM trades WHERE id = 7')
+    _insert_trades(writer, 1, 'NVDA')
+    columns, rows = reader.rows('trades')
+    assert [row[columns.index('ticker')] for row in rows][-2:] == ['MSFT', 'NVDA']
+    assert len(rows) == 6
+    reader.close()
+
+
+def test_query_results_are_invalidated_by_any_commit(db):
+    path, writer = db
+    reader = ChangeAwareReader(path)
+    sql = 'SELECT COUNT(*) FROM trades'
+    assert reader.query(sql) == [(0,)]
+    assert reader.query(sql) == [(0,)]
+    _insert_trades(writer, 2)
+    assert reader.query(sql) == [(2,)]
+    assert (reader.stats['query_hits'], reader.stats['query_misses']) == (1, 2)
+    reader.close()
+
+
+def test_frames_extend_incrementally(db):
+    pytest.importorskip('pandas')
+    path, writer = db
+    _insert_trades(writer, 4)
+    reader = ChangeAwareReader(path)
+    first = reader.frame('trades')
+    assert reader.frame('trades') is first
+    _insert_trades(writer, 2)
+    assert len(reader.frame('trades')) == 6
+    reader.close()
+
+
+def test_compaction_rewriting_cached_rows_is_picked_up(db):
+    path, writer = db
+    with writer:
+        write_attractor_state(writer, 'lorenz', [1.0, 2.0, 3.0], market_conditions={'price': 1.0})
+    reader = ChangeAwareReader(path)
+    columns, rows = reader.rows('attractor_states')
+    assert rows[0][columns.index('state_vector')] == '[1.0, 2.0, 3.0]'
+
+    compact_existing(path)          # UPDATEs the row in place: no new rowid, same count
+    columns, rows = reader.rows('attractor_states')
+    assert rows[0][columns.index('state_vector')] is None
+    assert rows[0][columns.index('state_blob')] is not None
+    reader.close()
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import chaos_metrics
+from attractor_integrator import SYSTEMS, integrate
+from chaos_metrics import JACOBIANS, _numeric_jacobian, _pair_counts, correlation_dimension, lyapunov_spectrum
+from lazy_imports import _MissingModule
+from trajectory_cache import TrajectoryCache
+
+
+def test_lorenz_lyapunov_spectrum(tmp_path):
+    cache = TrajectoryCache(str(tmp_path))
+    spectrum = lyapunov_spectrum('lorenz', steps=10_000, cache=cache)
+    assert 0.75 < spectrum[0] < 1.05
+    assert abs(spectrum[1]) < 0.1
+    # Volume contraction is exact for Lorenz: sum = -(sigma + 1 + beta)
+    assert abs(spectrum.sum() + 10 + 1 + 8 / 3) < 0.01
+    assert lyapunov_spectrum('lorenz', steps=10_000, cache=cache) is spectrum
+
+
+def test_numeric_jacobian_matches_analytic():
+    rng = np.random.default_rng(0)
+    for system in ('lorenz', 'chen', 'rossler'):
+        p = np.array(SYSTEMS[system]['defaults'])
+        s = rng.uniform(-10, 10, 3)
+        np.testing.assert_allclose(_numeric_jacobian(system)(s, p), JACOBIANS[system](s, p), atol=1e-5)
+
+
+def test_lorenz_correlation_dimension():
+    trajectory = integrate('lorenz', [1.0, 1.0, 1.0], 100_000)[0, 1000:]
+    result = correlation_dimension(trajectory, cache=TrajectoryCache(None))
+    assert 1.9 < result['dimension'] < 2.2
+    assert result['fit_mask'].sum() >= 3
+
+
+def test_numeric_jacobian_accepts_a_batch_of_states():
+    rng = np.random.default_rng(1)
+    states = rng.uniform(-10, 10, (3, 5))
+    for system in ('lorenz', 'chen', 'rossler'):
+        p = np.array(SYSTEMS[system]['defaults'])
+        batch = JACOBIANS[system](states, p)
+        assert batch.shape == (5, 3, 3)
+        np.testing.assert_allclose(_numeric_jacobian(system)(states, p), batch, atol=1e-5)
+        np.testing.assert_allclose(batch[2], JACOBIANS[system](states[:, 2], p))
+
+
+def test_fallback_pair_counts_include_pairs_exactly_at_the_radius(monkeypatch):
+    monkeypatch.setattr(chaos_metrics, 'spatial', _MissingModule('scipy.spatial'))
+    points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [3.0, 0.0, 0.0]])
+    # Pair distances are 1, 2 and 3
+    np.testing.assert_array_equal(_pair_counts(points, np.array([0.5, 1.0, 2.0, 2.5, 3.0])), [0, 1, 2, 2, 3])
+
+
+def test_kdtree_pair_counts_match_the_pairwise_fallback(monkeypatch):
+    pytest.importorskip('scipy.spatial')
+    rng = np.random.default_rng(2)
+    # A coarse grid puts many pairs exactly on the radii
+    points = rng.integers(0, 4, (400, 3)).astype(np.float64)
+    radii = np.array([0.5, 1.0, np.sqrt(2), 2.0, 3.0, 10.0])
+    assert chaos_metrics.spatial
+    with_tree = _pair_counts(points, radii)
+    monkeypatch.setattr(chaos_metrics, 'spatial', _MissingModule('scipy.spatial'))
+    np.testing.assert_array_equal(with_tree, _pair_counts(points, radii))
@@ -0,0 +1,36 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from chart_downsampling import apply_point_budget, lttb_indices, reduce_path
+
+
+def test_lttb_respects_budget_and_keeps_endpoints_and_extremes():
+    rng = np.random.default_rng(3)
+    y = np.cumsum(rng.normal(0, 1, 50_000))
+    y[31_337] = y.max() + 100  # a one-point spike must survive
+    x = np.datetime64('2025-01-01T00:00') + np.arange(50_000).astype('timedelta64[m]')
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) <= 500
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 31_337 in idx and np.argmin(y) in idx
+    assert np.array_equal(lttb_indices(None, y[:100], 500), np.arange(100))
+
+
+def test_path_reducers_and_figure_budget():
+    t = np.linspace(0, 40 * np.pi, 30_000)
+    path = np.column_stack([np.cos(t), np.sin(t), t / 10])
+    for mode in ('stride', 'voxel'):
+        idx = reduce_path(path, 1000, mode)
+        assert 100 < len(idx) <= 1000
+        assert idx[0] == 0 and idx[-1] == len(path) - 1
+
+    trace3d = SimpleNamespace(x=path[:, 0], y=path[:, 1], z=path[:, 2],
+                              marker=SimpleNamespace(color=t, size=4), text=None)
+    series = SimpleNamespace(x=np.arange(10_000), y=np.sin(np.arange(10_000) / 50.0), marker=None)
+    fig = SimpleNamespace(data=[trace3d, series])
+    apply_point_budget(fig, 2000)
+    assert len(trace3d.x) == len(trace3d.z) == len(trace3d.marker.color) <= 1500
+    assert trace3d.marker.size == 4
+    assert len(series.x) == len(series.y) <= 500
@@ -0,0 +1,92 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import numpy as np
+
+from compact_storage import (attractor_history, compact_existing, pack_context, signal_history, unpack_context,
+                             write_attractor_state, write_strategy_signal)
+from db_migrations import MIGRATIONS, migrate
+
+CONTEXT = {'regime': 'high_volatility', 'cycle': 123456789, 'delta': -42, 'ratio': 0.125, 'active': True,
+           'note': None, 'prices': [101.5, 99.25, 100.0, 98.75], 'tickers': ['FPH.NZ', 'CBA.AX'],
+           'nested': {'ünïcode': [1, 2.5, False]}}
+
+
+def test_context_round_trip_is_smaller_than_json():
+    blob = pack_context(CONTEXT)
+    assert unpack_context(blob) == CONTEXT
+    assert len(blob) < len(json.dumps(CONTEXT))
+
+
+def test_migration_backfills_json_rows_and_readers_mix_both_forms(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    assert migrate(path) == MIGRATIONS[-1][0]
+    conn = sqlite3.connect(path)
+    # Roll back to version 3: legacy JSON rows written before the BLOB columns existed
+    conn.execute('DELETE FROM schema_migrations WHERE version >= 4')
+    conn.execute('INSERT INTO attractor_states (timestamp, attractor_type, state_vector, fitness_score, '
+                 "market_conditions) VALUES ('2025-11-01 10:00:00', 'lorenz', '[1.5, -2.0, 30.25]', 0.7, ?)",
+                 (json.dumps(CONTEXT),))
+    conn.execute("INSERT INTO attractor_states (timestamp, attractor_type, state_vector) "
+                 "VALUES ('2025-11-01 10:00:01', 'chen', 'not json')")
+    conn.execute("INSERT INTO strategy_signals (timestamp, strategy, signal_type, ticker, confidence, market_state) "
+                 "VALUES ('2025-11-01 10:00:00', 'ensemble', 'buy', 'FPH.NZ', 0.8, '{\"price\": 12.5}')")
+    conn.commit()
+    conn.close()
+    assert migrate(path) == MIGRATIONS[-1][0]
+
+    conn = sqlite3.connect(path)
+    write_attractor_state(conn, 'lorenz', [3.0, 4.0, 5.0], market_conditions={'price': 1.0},
+                          timestamp='2025-11-01 10:00:02')
+    write_strategy_signal(conn, 'ensemble', 'sell', 'CBA.AX', market_state={'price': 99.0},
+                          timestamp='2025-11-01 10:00:03')
+    conn.commit()
+
+    lorenz = attractor_history(conn, 'lorenz', with_conditions=True)
+    np.testing.assert_array_equal(lorenz['state'], [[1.5, -2.0, 30.25], [3.0, 4.0, 5.0]])
+    assert lorenz['state'].dtype == np.float64
+    np.testing.assert_array_equal(lorenz['fitness_score'], [0.7, np.nan])
+    assert lorenz['market_conditions'] == [CONTEXT, {'price': 1.0}]
+    assert lorenz['timestamp'][0] == np.datetime64('2025-11-01T10:00:00')
+    assert attractor_history(conn, limit=1)['attractor_type'].tolist() == ['lorenz']
+    assert np.isnan(attractor_history(conn, 'chen')['state']).all()
+
+    signals = signal_history(conn, with_context=True)
+    assert signals['signal_type'].tolist() == ['buy', 'sell']
+    assert signals['market_state'] == [{'price': 12.5}, {'price': 99.0}]
+    conn.close()
+
+    compact_existing(path)
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM attractor_states WHERE state_vector IS NOT NULL").fetchone()[0] == 1
+    np.testing.assert_array_equal(attractor_history(conn, 'lorenz')['state'][0], [1.5, -2.0, 30.25])
+    conn.close()
+
+
+def test_writers_keep_the_json_text_unless_asked_not_to(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    conn = sqlite3.connect(path)
+    write_attractor_state(conn, 'lorenz', [1.0, 2.0, 3.0], market_conditions={'price': 1.0})
+    write_attractor_state(conn, 'lorenz', [4.0, 5.0, 6.0], market_conditions={'price': 2.0}, keep_json=False)
+    write_strategy_signal(conn, 'ensemble', 'buy', 'AAPL', market_state={'price': 3.0})
+    conn.commit()
+    assert conn.execute('SELECT state_vector, market_conditions FROM attractor_states ORDER BY id').fetchall() == \
+        [('[1.0, 2.0, 3.0]', '{"price": 1.0}'), (None, None)]
+    assert conn.execute('SELECT market_state FROM strategy_signals').fetchone()[0] == '{"price": 3.0}'
+    assert len(attractor_history(conn, 'lorenz')['state']) == 2
+    conn.close()
+
+
+def test_migrating_an_up_to_date_database_does_not_load_numpy(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    code = ('import sys, db_migrations; '
+            f'db_migrations.migrate({path!r}); '
+            "print('numpy' in sys.modules)")
+    out = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == 'False'
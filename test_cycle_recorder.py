@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Cycle record/replay tests - a replayed cycle must match the recorded one bit-for-bit
+"""
+
+import random
+import shutil
+import time
+from datetime import timedelta
+
+import pytest
+
+from cycle_recorder import EngineInputs, ReplayDivergence, ReplayedFetchError
+
+
+def _cycle(inputs, live_prices):
+    """Toy cycle touching every kind of external input"""
+    value = 0.0
+    for ticker in ('FPH.NZ', 'AAPL', 'AZN.L'):
+        try:
+            price = inputs.quote(ticker, lambda t=ticker: live_prices[t]())
+        except RuntimeError:
+            price = 1.0
+        value += price * (1 + random.uniform(-0.02, 0.02))
+    value *= inputs.fx('NZD', lambda: 0.6 + random.random() / 100)
+    return value, inputs.now().isoformat(), inputs.rng.random()
+
+
+def _failing():
+    raise RuntimeError('quote provider timed out')
+
+
+def test_replay_reproduces_recorded_cycles(tmp_path):
+    path = str(tmp_path / 'cycles.cmhlog')
+    live = {'FPH.NZ': random.random, 'AAPL': lambda: 180.0, 'AZN.L': _failing}
+
+    recorded = []
+    with EngineInputs('record', path) as inputs:
+        for n in range(1, 4):
+            with inputs.cycle(n):
+                recorded.append(_cycle(inputs, live))
+
+    unreachable = {t: _failing for t in live}
+    replay = EngineInputs('replay', path)
+    assert replay.cycle_numbers == [1, 2, 3]
+    for n in (3, 1, 2):
+        with replay.cycle(n):
+            assert _cycle(replay, unreachable) == recorded[n - 1]
+
+
+def test_replay_detects_divergence(tmp_path):
+    path = str(tmp_path / 'cycles.cmhlog')
+    with EngineInputs('record', path) as inputs:
+        with inputs.cycle(1):
+            inputs.quote('AAPL', lambda: 180.0)
+
+    replay = EngineInputs('replay', path)
+    with pytest.raises(ReplayDivergence):
+        with replay.cycle(1):
+            replay.quote('MSFT', lambda: 0.0)
+
+
+def test_failed_fetch_is_replayed_as_failure(tmp_path):
+    path = str(tmp_path / 'cycles.cmhlog')
+    with EngineInputs('record', path) as inputs:
+        with inputs.cycle(1):
+            with pytest.raises(RuntimeError):
+                inputs.quote('AZN.L', _failing)
+
+    replay = EngineInputs('replay', path)
+    with replay.cycle(1):
+        with pytest.raises(ReplayedFetchError):
+            replay.quote('AZN.L', lambda: 1.0)
+
+
+def test_recording_that_was_never_closed_replays_its_complete_cycles(tmp_path):
+    path = str(tmp_path / 'cycles.cmhlog')
+    crashed = str(tmp_path / 'crashed.cmhlog')
+    live = {'FPH.NZ': lambda: 5.0, 'AAPL': lambda: 180.0, 'AZN.L': lambda: 20.0}
+
+    inputs = EngineInputs('record', path)
+    recorded = []
+    for n in (1, 2):
+        with inputs.cycle(n):
+            recorded.append(_cycle(inputs, live))
+    inputs.quote('AAPL', lambda: 181.0)         # cycle 3 is in progress when the process dies
+    shutil.copy(path, crashed)                  # what a killed process leaves on disk
+    inputs.close()
+
+    unreachable = {t: _failing for t in live}
+    replay = EngineInputs('replay', crashed)
+    assert replay.cycle_numbers == [1, 2]
+    with replay.cycle(2):
+        assert _cycle(replay, unreachable) == recorded[1]
+
+    # Cut mid-event as well: still everything up to the last complete cycle
+    with open(crashed, 'rb') as f:
+        data = f.read()
+    with open(crashed, 'wb') as f:
+        f.write(data[:-3])
+    assert EngineInputs('replay', crashed).cycle_numbers in ([1], [1, 2])
+
+    # Recording again into the crashed file keeps its cycles readable
+    with open(crashed, 'wb') as f:
+        f.write(data)
+    with EngineInputs('record', crashed) as inputs:
+        with inputs.cycle(3):
+            recorded.append(_cycle(inputs, live))
+    replay = EngineInputs('replay', crashed)
+    assert replay.cycle_numbers == [1, 2, 3]
+    with replay.cycle(3):
+        assert _cycle(replay, unreachable) == recorded[2]
+
+
+def test_now_is_utc_and_replays_identically_in_another_timezone(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cycles.cmhlog')
+    monkeypatch.setenv('TZ', 'Pacific/Auckland')
+    time.tzset()
+    with EngineInputs('record', path) as inputs:
+        with inputs.cycle(1):
+            stamp = inputs.now()
+    assert stamp.utcoffset() == timedelta(0)
+
+    monkeypatch.setenv('TZ', 'America/New_York')
+    time.tzset()
+    replay = EngineInputs('replay', path)
+    with replay.cycle(1):
+        assert replay.now().isoformat() == stamp.isoformat()
+    monkeypatch.delenv('TZ')
+    time.tzset()
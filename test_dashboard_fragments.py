@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Dashboard fragment tests - the data-shaping helpers, exercised without Streamlit
+"""
+
+import sqlite3
+
+import pytest
+
+from dashboard_fragments import (POSITION_COLUMNS, SIGNAL_SERIES, attractor_params, latest_snapshot,
+                                 load_signal_history, open_positions, snapshot_metrics)
+from db_migrations import migrate
+from signal_series import materialize
+
+
+def test_snapshot_metrics():
+    metrics = snapshot_metrics(('2025-11-06 10:00:00', 1_156_000.0, 56_000.5, 0.156), previous_value=1_150_000.0)
+    assert metrics == {'value': '$1,156,000.00', 'delta': '+6,000.00', 'cash': '$56,000.50', 'roi': '+15.60%',
+                       'caption': 'Snapshot 2025-11-06 10:00:00'}
+    assert snapshot_metrics(('t', 1.0, 0.0, None))['delta'] is None
+
+
+def test_attractor_params_fall_back_to_js_defaults():
+    assert attractor_params({}, 'lorenz') == (10.0, 28.0, 8.0 / 3.0)
+    assert attractor_params({'attractor_rossler_c': 9.0}, 'rossler') == (0.2, 0.2, 9.0)
+
+
+def test_signal_history_is_none_without_a_database(tmp_path):
+    assert load_signal_history(str(tmp_path / 'missing.db'), '1m', 24) is None
+
+
+def test_signal_history_reads_every_series(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    now = 1_700_000_040.0
+    result = {'timestamp': now - 30, 'ensembleValue': 0.4, 'confidence': 0.8,
+              'individualSignals': {name: {'signal': 0.1, 'confidence': 1.0} for name in SIGNAL_SERIES[1:]}}
+    conn = sqlite3.connect(path)
+    materialize(conn, [result])
+    conn.close()
+
+    history = load_signal_history(path, '1m', 1, now=now)
+    assert set(history) == set(SIGNAL_SERIES)
+    assert history['ensemble']['mean'].tolist() == [0.4]
+    assert load_signal_history(path, '1m', 1, now=now + 7200)['ensemble']['count'].tolist() == []
+
+
+def test_positions_are_empty_before_the_engine_creates_the_table(tmp_path):
+    pytest.importorskip('pandas')
+    path = str(tmp_path / 'empty.db')
+    sqlite3.connect(path).close()
+    positions = open_positions(path)
+    assert positions.empty and list(positions.columns) == POSITION_COLUMNS
+
+
+def test_latest_snapshot_is_none_before_the_engine_writes_one(tmp_path):
+    assert latest_snapshot(str(tmp_path / 'missing.db')) is None
+    path = str(tmp_path / 'empty.db')
+    sqlite3.connect(path).close()
+    assert latest_snapshot(path) is None
+
+    migrate(path)
+    assert latest_snapshot(path) is None
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("INSERT INTO performance_snapshots (timestamp, portfolio_value, cash_balance, total_capital, roi) "
+                     "VALUES ('2025-11-06 10:00:00', 1000.0, 50.0, 1000.0, 0.01)")
+    conn.close()
+    assert latest_snapshot(path)[:2] == ('2025-11-06 10:00:00', 1000.0)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Market pipeline tests - concurrency, the rebalance barrier and per-market error isolation
+"""
+
+import threading
+import time
+
+from market_pipelines import MarketPipelineRunner, group_by_market
+
+UNIVERSE = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ', 'CBA.AX', 'AZN.L']
+
+
+def _value(market, prices):
+    return sum(p for p in prices.values() if p is not None)
+
+
+def test_group_by_market():
+    assert group_by_market(UNIVERSE) == {'US': ['AAPL', 'MSFT'], 'NZ': ['FPH.NZ', 'AIA.NZ'],
+                                         'AX': ['CBA.AX'], 'L': ['AZN.L']}
+
+
+def test_markets_run_concurrently():
+    markets = group_by_market(UNIVERSE)
+    # Every market must be inside fetch at the same time to get past the barrier
+    together = threading.Barrier(len(markets), timeout=2)
+    spans = {}
+
+    def fetch(market, tickers):
+        start = time.perf_counter()
+        together.wait()
+        time.sleep(0.05)
+        spans[market] = (start, time.perf_counter())
+        return {t: 1.0 for t in tickers}
+
+    with MarketPipelineRunner(fetch, _value) as runner:
+        cycle = runner.run_cycle(markets)
+
+    assert cycle['report']['errors'] == {}
+    assert max(start for start, _ in spans.values()) < min(end for _, end in spans.values())
+    assert cycle['report']['pipelines'] < 0.05 * len(markets)
+
+
+def test_rebalance_runs_after_every_market_finishes():
+    finished, seen_by_rebalance = [], []
+
+    def fetch(market, tickers):
+        time.sleep({'NZ': 0.1}.get(market, 0.01))
+        return {t: 1.0 for t in tickers}
+
+    def value(market, prices):
+        finished.append(market)
+        return len(prices)
+
+    def rebalance(results):
+        seen_by_rebalance.extend(finished)
+        return sorted(results)
+
+    persisted = []
+    with MarketPipelineRunner(fetch, value, rebalance=rebalance,
+                              persist=lambda results, rebalanced: persisted.append(rebalanced)) as runner:
+        cycle = runner.run_cycle(group_by_market(UNIVERSE))
+
+    assert sorted(seen_by_rebalance) == sorted(cycle['results'])
+    assert cycle['rebalance'] == ['AX', 'L', 'NZ', 'US']
+    assert persisted == [cycle['rebalance']]
+
+
+def test_error_in_one_market_does_not_stop_the_others():
+    def fetch(market, tickers):
+        if market == 'AX':
+            raise ConnectionError('ASX feed down')
+        return {t: 2.0 for t in tickers}
+
+    with MarketPipelineRunner(fetch, _value, stop_check=lambda m, p: []) as runner:
+        cycle = runner.run_cycle(group_by_market(UNIVERSE))
+
+    assert cycle['report']['errors'] == {'AX': 'fetch: ASX feed down'}
+    assert cycle['results']['US']['valuation'] == 4.0
+    assert cycle['results']['NZ']['stops'] == []
+    assert cycle['results']['AX']['valuation'] is None
+
+
+def test_dominant_market_is_the_slowest():
+    def fetch(market, tickers):
+        time.sleep({'NZ': 0.15, 'L': 0.05}.get(market, 0.0))
+        return {t: 1.0 for t in tickers}
+
+    for concurrent in (True, False):
+        with MarketPipelineRunner(fetch, _value, concurrent=concurrent) as runner:
+            report = runner.run_cycle(group_by_market(UNIVERSE))['report']
+        assert report['dominant_market'] == 'NZ'
+        assert runner.last_report is report
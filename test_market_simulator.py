@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Market simulator tests - exchange sessions, local-day weekends and reproducible paths
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+from market_simulator import MarketSimulator
+from quote_client import QuoteClient
+
+
+def test_sessions_freeze_closed_markets_and_gap_on_open():
+    # 21:00 UTC Monday: US closes, NZX opens
+    sim = MarketSimulator(['AAPL', 'FPH.NZ'], dt=60, start=datetime(2025, 11, 3, 20, 58, tzinfo=timezone.utc))
+    sim.step()
+    sim.step()
+    nz_before = sim.quote('FPH.NZ')
+    sim.step()  # 21:00 - NZ reopens with an overnight gap, US is now shut
+    us_closed = sim.quote('AAPL')
+    assert sim.quote('FPH.NZ') != nz_before
+    sim.step()
+    assert sim.quote('AAPL') == us_closed
+    assert sim.currency('FPH.NZ') == 'NZD'
+    assert sim.fx('USD') == 1.0
+
+
+def test_weekend_follows_each_exchange_local_day():
+    def open_markets(start):
+        sim = MarketSimulator(['AAPL'], start=start)
+        mask = sim._session_mask()
+        return {code for code, is_open in zip(sim.exchange_codes, mask) if is_open}
+
+    # Sunday 21:30 UTC is Monday morning in Auckland; Friday 23:30 UTC is Saturday in Auckland and Sydney
+    assert open_markets(datetime(2025, 11, 2, 21, 30, tzinfo=timezone.utc)) == {'NZ'}
+    assert open_markets(datetime(2025, 11, 2, 23, 30, tzinfo=timezone.utc)) == {'NZ', 'AX'}
+    assert open_markets(datetime(2025, 11, 7, 23, 30, tzinfo=timezone.utc)) == set()
+    assert open_markets(datetime(2025, 11, 7, 20, 30, tzinfo=timezone.utc)) == {'US', 'TO'}
+
+
+def test_seeded_paths_are_reproducible_and_serve_quote_client():
+    symbols = ['AAPL', 'MSFT', 'CBA.AX', 'AZN.L']
+    a = MarketSimulator(symbols, seed=3, respect_sessions=False).generate(200)
+    b = MarketSimulator(symbols, seed=3, respect_sessions=False).generate(200)
+    assert np.array_equal(a, b)
+    assert np.all(a > 0)
+
+    sim = MarketSimulator(symbols, respect_sessions=False)
+    client = QuoteClient(sim.providers(), limits={code: (1e6, 1e6) for code in sim.providers()})
+    try:
+        assert client.get_quotes(symbols) == {s: sim.quote(s) for s in symbols}
+    finally:
+        client.close()
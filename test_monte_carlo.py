@@ -0,0 +1,33 @@
+import numpy as np
+
+from monte_carlo import attractor_drift, monte_carlo, simulate_paths, var_cvar
+
+
+def test_paths_match_gbm_moments_and_drift_shifts_them():
+    paths = simulate_paths(100.0, 20_000, 252, mu=0.08, sigma=0.2, rng=0)
+    assert paths.shape == (20_000, 253) and np.all(paths[:, 0] == 100.0)
+    log_terminal = np.log(paths[:, -1] / 100.0)
+    assert abs(log_terminal.mean() - (0.08 - 0.02)) < 0.01
+    assert abs(log_terminal.std() - 0.2) < 0.01
+
+    shifted = simulate_paths(100.0, 20_000, 252, rng=0, drift=np.full(252, 0.001))
+    np.testing.assert_allclose(shifted[:, -1], paths[:, -1] * np.exp(0.252), rtol=1e-9)
+
+    drift = attractor_drift(100, strength=0.001, n_paths=3, seed=1)
+    assert drift.shape == (3, 100) and np.abs(drift).max() <= 0.001
+
+
+def test_var_cvar_on_known_distribution():
+    returns = np.random.default_rng(0).normal(0, 0.1, 1_000_000)
+    risk = var_cvar(returns, 0.95)
+    assert abs(risk['var'] - 0.1645) < 0.002
+    assert abs(risk['cvar'] - 0.2063) < 0.002
+
+
+def test_sharded_results_do_not_depend_on_worker_count():
+    kwargs = dict(n_paths=2_500, n_steps=50, shard_size=1_000, seed=7)
+    serial = monte_carlo(1000.0, workers=1, **kwargs)
+    parallel = monte_carlo(1000.0, workers=2, **kwargs)
+    np.testing.assert_array_equal(serial['terminal'], parallel['terminal'])
+    assert serial['summary'] == parallel['summary']
+    assert serial['bands'][5][-1] < serial['bands'][50][-1] < serial['bands'][95][-1]
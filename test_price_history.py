@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Price history tests - ring wraparound, carried-forward quotes and indicators against NumPy references
+"""
+
+import numpy as np
+import pytest
+
+from price_history import PriceHistory
+
+
+def _series(n_symbols=3, cycles=40, seed=5):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(10, 100, n_symbols) * np.exp(np.cumsum(rng.normal(0, 0.02, (cycles, n_symbols)), axis=0))
+
+
+def test_views_survive_wraparound():
+    prices = _series(cycles=11)
+    history = PriceHistory(['A', 'B', 'C'], window=4)
+    for row in prices:
+        history.append(row)
+
+    assert history.count == 4 and history.return_count == 4
+    np.testing.assert_array_equal(history.prices(), prices[-4:].T)
+    np.testing.assert_allclose(history.returns(), np.diff(np.log(prices[-5:]), axis=0).T)
+    assert history.prices(2).base is not None     # zero-copy view into the ring
+
+
+def test_missing_quotes_carry_the_last_price_forward():
+    history = PriceHistory(['A', 'B'], window=8)
+    history.append_quotes({'A': 10.0, 'B': 20.0})
+    history.append_quotes({'A': 11.0})
+    history.append_quotes({'A': 12.0, 'B': 22.0, 'UNKNOWN': 1.0})
+
+    np.testing.assert_array_equal(history.prices(), [[10.0, 11.0, 12.0], [20.0, 20.0, 22.0]])
+    np.testing.assert_allclose(history.returns()[1], [0.0, np.log(22.0 / 20.0)])
+
+
+def test_volatility_needs_n_returns_not_n_prices():
+    history = PriceHistory(['A'], window=16)
+    for price in (10.0, 10.5, 10.2, 10.8, 11.0):
+        history.append(np.array([price]))
+
+    assert history.return_count == 4
+    with pytest.raises(ValueError):
+        history.volatility(5)
+    assert np.isfinite(history.volatility(4)).all()
+    assert 'volatility' not in history.indicators('A', vol=5)
+    assert np.isfinite(history.indicators('A', vol=4)['volatility'])
+
+
+def test_indicators_match_numpy_reference():
+    prices = _series(cycles=40)
+    history = PriceHistory(['A', 'B', 'C'], window=32)
+    for row in prices:
+        history.append(row)
+
+    recent = prices[-32:]
+    log_returns = np.diff(np.log(prices), axis=0)[-20:]
+    np.testing.assert_allclose(history.momentum(5), recent[-1] / recent[-6] - 1)
+    np.testing.assert_allclose(history.sma(10), recent[-10:].mean(axis=0))
+    np.testing.assert_allclose(history.trend(5, 20), recent[-5:].mean(axis=0) / recent[-20:].mean(axis=0) - 1)
+    np.testing.assert_allclose(history.volatility(20), log_returns.std(axis=0, ddof=1))
+
+    result = history.indicators('B', momentum=5, short=5, long=20, vol=20)
+    assert result['price'] == prices[-1, 1]
+    assert result['volatility'] == pytest.approx(log_returns[:, 1].std(ddof=1))
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Quote client tests - coalescing, stale-while-revalidate and circuit breaking
+"""
+
+import threading
+import time
+
+import pytest
+
+from quote_client import CircuitBreaker, CircuitOpenError, QuoteClient
+
+
+class FlakyProvider:
+    def __init__(self, price=10.0, delay=0.0):
+        self.price = price
+        self.delay = delay
+        self.failing = False
+        self.calls = 0
+
+    def __call__(self, symbol):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.failing:
+            raise ConnectionError('exchange down')
+        return self.price
+
+
+def test_concurrent_requests_share_one_call():
+    provider = FlakyProvider(delay=0.1)
+    client = QuoteClient({'US': provider}, limits={'US': (100, 10)})
+    threads = [threading.Thread(target=client.get_quote, args=('AAPL',)) for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    client.close()
+    assert provider.calls == 1
+    assert client.metrics()['US']['coalesced'] == 9
+
+
+def test_stale_price_served_while_revalidating():
+    provider = FlakyProvider(price=10.0)
+    client = QuoteClient({'US': provider}, limits={'US': (100, 10)}, max_age=0.05)
+    assert client.get_price('AAPL').price == 10.0
+
+    time.sleep(0.1)
+    provider.price = 11.0
+    quote = client.get_price('AAPL')
+    assert quote.stale and quote.price == 10.0 and quote.age >= 0.05
+
+    time.sleep(0.1)  # background refresh lands
+    assert client.last_known('AAPL')[0] == 11.0
+    client.close()
+
+
+def test_breaker_trips_and_recovers_through_half_open():
+    provider = FlakyProvider()
+    client = QuoteClient({'NZ': provider}, limits={'NZ': (100, 10)}, failure_threshold=2, reset_timeout=0.1)
+    provider.failing = True
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            client.get_quote('FPH.NZ')
+    assert client.breakers['NZ'].state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        client.get_quote('FPH.NZ')
+    assert provider.calls == 2
+
+    time.sleep(0.15)
+    provider.failing = False
+    assert client.get_quote('FPH.NZ') == 10.0
+    assert client.breakers['NZ'].state == CircuitBreaker.CLOSED
+    client.close()
+
+
+def test_tripped_provider_refreshes_cached_symbols_after_reset_timeout():
+    provider = FlakyProvider(price=10.0)
+    client = QuoteClient({'NZ': provider}, limits={'NZ': (100, 10)}, max_age=0.01,
+                         failure_threshold=1, reset_timeout=0.1)
+    assert client.get_price('FPH.NZ').price == 10.0
+
+    time.sleep(0.02)
+    provider.failing = True
+    assert client.get_price('FPH.NZ').stale       # the background refresh fails and trips the breaker
+    time.sleep(0.05)
+    assert client.breakers['NZ'].state == CircuitBreaker.OPEN
+    calls = provider.calls
+    assert client.get_price('FPH.NZ').price == 10.0
+    time.sleep(0.02)
+    assert provider.calls == calls                # still open: no refresh attempted
+
+    provider.failing, provider.price = False, 12.0
+    time.sleep(0.1)
+    assert client.get_price('FPH.NZ').price == 10.0   # served stale while the half-open probe runs
+    time.sleep(0.05)
+    assert client.last_known('FPH.NZ')[0] == 12.0
+    assert client.breakers['NZ'].state == CircuitBreaker.CLOSED
+    client.close()
+
+
+def test_timeout_counts_once_and_the_late_outcome_is_not_recorded_again():
+    provider = FlakyProvider(delay=0.2)
+    client = QuoteClient({'US': provider}, limits={'US': (100, 10)}, timeout=0.05, failure_threshold=2)
+    assert client.get_price('AAPL').price is None
+    assert client.breakers['US'].failures == 1
+    time.sleep(0.3)
+    # The call did finish: its price is kept, but its success does not reset the timeout failure
+    assert client.last_known('AAPL')[0] == 10.0
+    assert client.breakers['US'].failures == 1
+
+    provider.failing = True
+    assert client.get_price('MSFT').price is None
+    time.sleep(0.3)
+    assert client.breakers['US'].failures == 2          # the timeout, not also the late error
+    assert client.breakers['US'].state == CircuitBreaker.OPEN
+    client.close()
+
+
+def test_hung_provider_trips_its_breaker():
+    provider = FlakyProvider(delay=0.5)
+    client = QuoteClient({'US': provider}, limits={'US': (100, 10)}, timeout=0.05, failure_threshold=2,
+                         reset_timeout=10)
+    waiters = [threading.Thread(target=client.get_price, args=('AAPL',)) for _ in range(3)]
+    for t in waiters:
+        t.start()
+    for t in waiters:
+        t.join()
+    assert client.breakers['US'].failures == 1          # three callers, one provider call
+    client.get_price('MSFT')
+    assert client.breakers['US'].state == CircuitBreaker.OPEN
+
+    start = time.perf_counter()
+    assert client.get_price('NVDA').price is None       # short-circuited instead of waiting
+    assert time.perf_counter() - start < 0.05
+    client.close()
+
+
+def test_stale_reads_queue_one_revalidation_per_symbol():
+    provider = FlakyProvider(price=10.0)
+    client = QuoteClient({'US': provider}, limits={'US': (100, 10)}, max_age=0.01, timeout=0.05)
+    client.get_price('AAPL')
+    time.sleep(0.02)
+    provider.delay = 0.3
+    for _ in range(50):
+        assert client.get_price('AAPL').stale
+    time.sleep(0.4)
+    assert client.metrics()['US']['requests'] == 2 and provider.calls == 2
+    client.close()
+
+
+def test_slow_exchange_does_not_block_others():
+    slow, fast = FlakyProvider(delay=1.0), FlakyProvider(price=5.0)
+    client = QuoteClient({'US': fast, 'L': slow}, limits={'US': (100, 10), 'L': (100, 10)}, timeout=0.1)
+    start = time.perf_counter()
+    quotes = client.get_prices(['AAPL', 'AZN.L'])
+    assert time.perf_counter() - start < 0.5
+    assert quotes['AAPL'].price == 5.0
+    assert quotes['AZN.L'].price is None
+    client.close()
@@ -0,0 +1,113 @@
+import sqlite3
+
+import numpy as np
+
+import signal_series
+from attractor_engine import AttractorEngine
+from db_migrations import migrate
+from signal_series import SignalSeriesJob, materialize, read_series, series_payload
+from trajectory_cache import TrajectoryCache
+
+
+def _result(stamp, ensemble, lorenz, confidence=0.5):
+    return {'timestamp': stamp, 'ensembleValue': ensemble, 'confidence': confidence,
+            'individualSignals': {'lorenz': {'signal': lorenz, 'confidence': 1.0}}}
+
+
+def test_buckets_merge_across_batches_and_read_as_one_range(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    base = 1_700_000_040.0          # on a 1-minute boundary
+    with SignalSeriesJob(path, flush_interval=60) as job:
+        for i, value in enumerate([0.1, 0.5, -0.3]):
+            job.submit(_result(base + 10 * i, value, 2 * value))
+        assert job.flush(timeout=5)
+        # Later cycles land in the same 1m bucket and in a new one, written as a separate batch
+        job.submit(_result(base + 50, 0.9, 1.8))
+        job.submit(_result(base + 70, -1.0, -2.0, confidence=1.0))
+
+    conn = sqlite3.connect(path)
+    minute = read_series(conn, 'ensemble', '1m', base, base + 120)
+    np.testing.assert_allclose(minute['mean'], [0.3, -1.0])
+    np.testing.assert_array_equal(minute['min'], [-0.3, -1.0])
+    np.testing.assert_array_equal(minute['max'], [0.9, -1.0])
+    np.testing.assert_array_equal(minute['last'], [0.9, -1.0])
+    np.testing.assert_array_equal(minute['count'], [4, 1])
+    np.testing.assert_allclose(minute['confidence'], [0.5, 1.0])
+    assert minute['bucket'][1] == np.datetime64(int(base) + 60, 's')
+
+    daily = read_series(conn, 'lorenz', 86400)
+    assert daily['count'].tolist() == [5]
+    np.testing.assert_allclose(daily['mean'], [2 * (0.1 + 0.5 - 0.3 + 0.9 - 1.0) / 5])
+    assert len(read_series(conn, 'ensemble', '1m', base + 60)['mean']) == 1
+    conn.close()
+    assert series_payload(path, 'ensemble', '1m')['count'] == [4, 1]
+
+
+def test_engine_listener_records_every_signal(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    engine = AttractorEngine(warmup=100, cache=TrajectoryCache(None))
+    with SignalSeriesJob(path) as job:
+        engine.listeners.append(job.submit)
+        results = [engine.signal() for _ in range(5)]
+    conn = sqlite3.connect(path)
+    for name in ('ensemble', 'lorenz', 'chen', 'rossler'):
+        assert read_series(conn, name, '1d')['count'].sum() == 5
+    assert np.isclose(read_series(conn, 'ensemble', '1d')['last'][-1], results[-1]['ensembleValue'])
+    conn.close()
+
+
+def test_payload_reads_add_no_samples_only_engine_cycles_do(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    engine = AttractorEngine(warmup=100, cache=TrajectoryCache(None))
+    with SignalSeriesJob(path) as job:
+        engine.listeners.append(job.submit)
+        engine.signal()
+        for _ in range(10):             # API requests
+            engine.chaos_payload()
+        engine.signal()
+    conn = sqlite3.connect(path)
+    assert read_series(conn, 'ensemble', '1d')['count'].sum() == 2
+    conn.close()
+
+
+def test_failed_writes_are_retried_and_bad_cycles_do_not_stop_the_writer(tmp_path, monkeypatch):
+    path = str(tmp_path / 'market_harmonics.db')
+    base = 1_700_000_040.0
+    calls = []
+
+    def locked_once(conn, results, resolutions):
+        calls.append(len(results))
+        if len(calls) == 1:
+            raise sqlite3.OperationalError('database is locked')
+        return materialize(conn, results, resolutions)
+
+    monkeypatch.setattr(signal_series, 'materialize', locked_once)
+    with SignalSeriesJob(path, flush_interval=0.01) as job:
+        job.submit(_result(base, 0.1, 0.2))
+        assert not job.flush(timeout=5)                     # the error is reported...
+        assert isinstance(job.last_error, sqlite3.OperationalError)
+        assert job.flush(timeout=5)                         # ...and the same cycle lands on the retry
+        assert calls == [1, 1]
+
+        job.submit({'timestamp': base + 10})                # malformed: no signals
+        assert not job.flush(timeout=5)
+        assert job.stats['dropped'] == 1 and job._thread.is_alive()
+
+        job.submit(_result(base + 20, 0.3, 0.6))
+        assert job.flush(timeout=5)
+    assert job.stats['written'] == 2 and job.stats['errors'] == 2
+
+    conn = sqlite3.connect(path)
+    np.testing.assert_allclose(read_series(conn, 'ensemble', '1m')['mean'], [0.2])
+    conn.close()
+
+
+def test_payload_is_empty_before_the_database_or_table_exists(tmp_path):
+    empty = {'series': 'ensemble', 'resolution': '1m', 'bucket': [], 'mean': [], 'min': [], 'max': [], 'last': [],
+             'confidence': [], 'count': []}
+    assert series_payload(str(tmp_path / 'missing.db')) == empty
+    path = str(tmp_path / 'unmigrated.db')
+    sqlite3.connect(path).close()
+    assert series_payload(path) == empty
+    migrate(path)
+    assert series_payload(path) == empty
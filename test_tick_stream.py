@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tick stream tests - Polygon parsing, burst coalescing and idle-feed shutdown
+"""
+
+import time
+import socket
+import asyncio
+
+from tick_stream import ReplayServer, TickIngestor, parse_polygon_message
+
+
+def test_parse_trade_and_aggregate_messages():
+    ticks = parse_polygon_message('[{"ev": "T", "sym": "AAPL", "p": 190.5, "t": 1700000000000},'
+                                  ' {"ev": "AM", "sym": "MSFT", "c": 410.0, "e": 1700000060000},'
+                                  ' {"ev": "status", "message": "authenticated"}]')
+    assert ticks == [('AAPL', 190.5, 1700000000.0), ('MSFT', 410.0, 1700000060.0)]
+
+
+def test_paused_feed_is_coalesced_until_the_interval_deadline():
+    # 10 single-tick messages 10 ms apart: the queue is empty between every tick
+    messages = [{'ev': 'T', 'sym': 'AAPL', 'p': 100.0 + i, 't': 1_700_000_000_000 + 10 * i} for i in range(10)]
+
+    async def scenario():
+        server = await ReplayServer(messages, port=0, speed=1.0).start()
+        ingestor = TickIngestor(port=server.port, coalesce_interval=1.0)
+        await ingestor.run()
+        await server.close()
+        return ingestor
+
+    ingestor = asyncio.run(scenario())
+    assert ingestor.stats['ticks'] == 10
+    assert ingestor.stats['batches'] == 1
+    assert ingestor.book.get('AAPL') == 109.0
+
+
+def test_stop_interrupts_an_idle_feed():
+    # A listening socket that never sends: the ingestor sits in readline()
+    with socket.create_server(('127.0.0.1', 0)) as listener:
+        ingestor = TickIngestor(port=listener.getsockname()[1])
+        thread = ingestor.start_in_thread()
+        deadline = time.monotonic() + 5
+        while ingestor._task is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+
+        start = time.monotonic()
+        ingestor.stop()
+        assert not thread.is_alive()
+        assert time.monotonic() - start < 1.0
+
+
+def test_malformed_lines_are_counted_and_skipped():
+    lines = [b'{"ev": "T", "sym": "AAPL", "p": 100.0, "t": 1700000000000}\n',
+             b'{"ev": "T", "sym": "AAPL", "p": 10\n',              # partial line
+             b'["not", "events"]\n',
+             b'\xff\xfe\n',
+             b'{"ev": "T", "sym": "AAPL", "p": 101.0, "t": 1700000000010}\n']
+
+    async def feed(reader, writer):
+        for line in lines:
+            writer.write(line)
+        await writer.drain()
+        writer.close()
+
+    async def scenario():
+        server = await asyncio.start_server(feed, '127.0.0.1', 0)
+        ingestor = TickIngestor(port=server.sockets[0].getsockname()[1])
+        await ingestor.run()
+        server.close()
+        await server.wait_closed()
+        return ingestor
+
+    ingestor = asyncio.run(scenario())
+    assert ingestor.stats['messages'] == 5 and ingestor.stats['malformed'] == 3
+    assert ingestor.stats['ticks'] == 2
+    assert ingestor.book.get('AAPL') == 101.0
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Trade journal tests - bulk flush, torn-tail handling, crash recovery and failed flushes
+"""
+
+import sqlite3
+
+import pytest
+
+from trade_journal import (HEADER_STRUCT, JOURNAL_MAGIC, JOURNAL_VERSION, RECORD_SIZE,
+                           TradeJournal, _ensure_trades_table, pack_record)
+
+
+def _trade_count(db_path):
+    conn = sqlite3.connect(db_path)
+    count = conn.execute('SELECT COUNT(*) FROM trades').fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_journal_flushes_to_sqlite(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    _ensure_trades_table(db_path)
+
+    with TradeJournal(str(tmp_path / 'trades.bin'), db_path) as journal:
+        for i in range(250):
+            journal.append('FPH.NZ', 'buy', 5, 30.0 + i, strategy='ensemble', constitutional_score=0.9)
+        assert journal.flush(timeout=5)
+
+    conn = sqlite3.connect(db_path)
+    row = conn.execute('SELECT ticker, action, amount, strategy FROM trades ORDER BY id LIMIT 1').fetchone()
+    conn.close()
+    assert row == ('FPH.NZ', 'buy', 150.0, 'ensemble')
+    assert _trade_count(db_path) == 250
+
+
+def test_recovery_replays_unflushed_tail(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    journal_path = str(tmp_path / 'trades.bin')
+    _ensure_trades_table(db_path)
+
+    with TradeJournal(journal_path, db_path) as journal:
+        journal.append('AAPL', 'buy', 1, 100.0)
+
+    # Simulate a crash: three fills reached the journal, the last write was torn
+    with open(journal_path, 'wb') as f:
+        f.write(HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_VERSION, RECORD_SIZE, 0))
+        for seq in (2, 3, 4):
+            f.write(pack_record((seq, 0.0, 'MSFT', 'sell', 1.0, 1.0, 1.0, None, None, '')))
+        f.write(b'\x01' * (RECORD_SIZE // 2))
+
+    recovered = TradeJournal(journal_path, db_path)
+    assert recovered.stats['recovered'] == 3
+    seq = recovered.append('AAPL', 'sell', 1, 101.0)
+    recovered.close()
+
+    assert seq == 5
+    assert _trade_count(db_path) == 5
+
+
+
+def test_timestamps_are_utc_sqlite_format(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    _ensure_trades_table(db_path)
+
+    with TradeJournal(str(tmp_path / 'trades.bin'), db_path) as journal:
+        journal.append('AAPL', 'buy', 1, 100.0, timestamp=86400.5)
+
+    conn = sqlite3.connect(db_path)
+    stamp = conn.execute('SELECT timestamp FROM trades').fetchone()[0]
+    same_format = conn.execute("SELECT datetime(?) = ?", (stamp, stamp)).fetchone()[0]
+    conn.close()
+    assert stamp == '1970-01-02 00:00:00'
+    assert same_format
+
+
+def test_overlong_text_is_rejected_not_truncated(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    _ensure_trades_table(db_path)
+
+    with TradeJournal(str(tmp_path / 'trades.bin'), db_path) as journal:
+        with pytest.raises(ValueError, match='notes'):
+            journal.append('AAPL', 'buy', 1, 100.0, notes='x' * 45)
+        assert journal.append('AAPL', 'buy', 1, 100.0, notes='x' * 44) == 1
+
+    assert _trade_count(db_path) == 1
+
+
+def test_failed_flush_keeps_records_for_retry(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    journal_path = str(tmp_path / 'trades.bin')
+
+    # No trades table yet: every flush fails
+    journal = TradeJournal(journal_path, db_path, flush_interval=0.01)
+    for i in range(3):
+        journal.append('CBA.AX', 'buy', 1, 100.0 + i)
+    assert not journal.flush(timeout=5)
+    assert isinstance(journal.last_error, sqlite3.Error)
+    assert journal.pending == 3
+
+    # The flush thread survived and picks the same records up once SQLite recovers
+    _ensure_trades_table(db_path)
+    assert journal.flush(timeout=5)
+    assert journal.pending == 0
+    journal.close()
+    assert _trade_count(db_path) == 3
+
+
+def test_records_left_by_failed_flush_are_recovered(tmp_path):
+    db_path = str(tmp_path / 'trades.db')
+    journal_path = str(tmp_path / 'trades.bin')
+
+    journal = TradeJournal(journal_path, db_path, flush_interval=0.01)
+    journal.append('AZN.L', 'sell', 2, 50.0)
+    journal.close()
+
+    _ensure_trades_table(db_path)
+    recovered = TradeJournal(journal_path, db_path)
+    recovered.close()
+    assert recovered.stats['recovered'] == 1
+    assert _trade_count(db_path) == 1
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Trading CLI tests - status answers from SQLite without loading the engine or its dependencies
+"""
+
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+from db_migrations import migrate
+from trading_cli import read_status
+from trading_queries import format_roi
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+HEAVY = ('numpy', 'pandas', 'yfinance', 'requests', 'plotly', 'start_trading', 'attractor_engine',
+         'compact_storage', 'db_migrations')
+
+
+def _database(tmp_path) -> str:
+    path = str(tmp_path / 'market_harmonics.db')
+    migrate(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("INSERT INTO performance_snapshots (timestamp, portfolio_value, cash_balance, total_capital, roi) "
+                     "VALUES ('2025-11-06 10:00:00', 115600.0, 5600.0, 115600.0, 0.156)")
+        conn.execute("INSERT INTO trades (ticker, action, shares, price, amount) VALUES ('FPH.NZ', 'buy', 10, 30, 300)")
+    conn.close()
+    return path
+
+
+def test_roi_is_a_fraction_shown_as_percent():
+    assert format_roi(0.156) == '+15.60%'
+    assert format_roi(None) == '+0.00%'
+
+
+def test_read_status(tmp_path):
+    status = read_status(_database(tmp_path))
+    assert status['snapshot']['roi'] == 0.156
+    assert status['last_trade']['ticker'] == 'FPH.NZ'
+
+
+def test_status_imports_nothing_heavy_and_starts_fast(tmp_path):
+    path = _database(tmp_path)
+    probe = (f"import sys, trading_cli; trading_cli.main(['status', '--db', {path!r}, '--json']); "
+             f"print(sorted(m for m in {HEAVY!r} if m in sys.modules))")
+
+    timings = {}
+    for name, cmd in (('interpreter', [sys.executable, '-c', 'pass']), ('status', [sys.executable, '-c', probe])):
+        best = float('inf')
+        for _ in range(3):
+            start = time.perf_counter()
+            proc = subprocess.run(cmd, cwd=HERE, capture_output=True, text=True, check=True)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+
+    status_line, imported = proc.stdout.strip().splitlines()
+    assert json.loads(status_line)['positions'] == 0
+    assert imported == '[]'
+    assert timings['status'] - timings['interpreter'] < 0.1
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression tests - every hot query must be served by an index
+"""
+
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+
+from db_migrations import MIGRATIONS, migrate, run_script
+from trading_queries import (HOT_QUERIES, explain, full_scans, market_exposure,
+                             positions_by_market, recent_trades, snapshots_between)
+
+# Tables exactly as start_trading.py creates them (no secondary indexes)
+ENGINE_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS portfolio_positions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ticker TEXT NOT NULL,
+  shares REAL NOT NULL,
+  entry_price REAL NOT NULL,
+  entry_value REAL NOT NULL,
+  current_price REAL,
+  current_value REAL,
+  entry_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  UNIQUE(ticker)
+);
+CREATE TABLE IF NOT EXISTS trades (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  ticker TEXT NOT NULL,
+  action TEXT NOT NULL,
+  shares REAL NOT NULL,
+  price REAL NOT NULL,
+  amount REAL NOT NULL,
+  timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  strategy TEXT,
+  constitutional_score REAL,
+  notes TEXT
+);
+CREATE TABLE IF NOT EXISTS performance_snapshots (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+  portfolio_value REAL NOT NULL,
+  cash_balance REAL NOT NULL,
+  total_capital REAL NOT NULL,
+  roi REAL,
+  sharpe_ratio REAL,
+  max_drawdown REAL
+);
+'''
+
+TICKERS = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ', 'CBA.AX', 'AZN.L', 'SAP.DE', 'ASML.AS', '7203.T', 'ABX.TO']
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    conn = sqlite3.connect(path)
+    conn.executescript(ENGINE_SCHEMA)
+    start = datetime(2025, 11, 1)
+    conn.executemany(
+        'INSERT INTO trades (ticker, action, shares, price, amount, timestamp, strategy) VALUES (?, ?, ?, ?, ?, ?, ?)',
+        [(TICKERS[i % len(TICKERS)], 'buy', 1.0, 10.0, 10.0,
+          (start + timedelta(minutes=i)).isoformat(), 'ensemble') for i in range(5000)]
+    )
+    conn.executemany(
+        'INSERT INTO performance_snapshots (timestamp, portfolio_value, cash_balance, total_capital, roi) '
+        'VALUES (?, ?, ?, ?, ?)',
+        [((start + timedelta(minutes=5 * i)).isoformat(), 1e6, 1e5, 1e6, 0.01) for i in range(2000)]
+    )
+    conn.executemany(
+        'INSERT INTO portfolio_positions (ticker, shares, entry_price, entry_value, current_price, current_value) '
+        'VALUES (?, ?, ?, ?, ?, ?)',
+        [(t, 10, 5.0, 50.0, 6.0, 60.0) for t in TICKERS]
+    )
+    conn.commit()
+    conn.close()
+
+    assert migrate(path) == MIGRATIONS[-1][0]
+    conn = sqlite3.connect(path)
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_uses_index(db, name):
+    assert full_scans(db, name) == [], f'{name} regressed: {explain(db, name)}'
+
+
+def test_migrate_is_idempotent(db, tmp_path):
+    path = str(tmp_path / 'market_harmonics.db')
+    assert migrate(path) == MIGRATIONS[-1][0]
+    versions = [row[0] for row in db.execute('SELECT version FROM schema_migrations ORDER BY version')]
+    assert versions == [number for number, _, _ in MIGRATIONS]
+
+
+def test_failed_migration_leaves_no_partial_schema(tmp_path, monkeypatch):
+    def half_done(conn):
+        run_script(conn, 'CREATE TABLE half_done (id INTEGER); CREATE INDEX idx_half_done ON half_done(id);')
+        raise RuntimeError('migration failed part-way')
+
+    path = str(tmp_path / 'market_harmonics.db')
+    monkeypatch.setattr('db_migrations.MIGRATIONS', MIGRATIONS[:1] + [(2, 'fails', half_done)])
+    with pytest.raises(RuntimeError):
+        migrate(path)
+
+    conn = sqlite3.connect(path)
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master")}
+    versions = [row[0] for row in conn.execute('SELECT version FROM schema_migrations')]
+    conn.close()
+    assert 'half_done' not in tables and 'idx_half_done' not in tables
+    assert versions == [1]
+
+
+def test_query_results(db):
+    trades = recent_trades(db, 'FPH.NZ', limit=3)
+    assert len(trades) == 3
+    assert trades[0]['timestamp'] > trades[1]['timestamp']
+
+    assert len(snapshots_between(db, '2025-11-01T00:00:00', '2025-11-01T01:00:00')) == 12
+    assert sorted(row['ticker'] for row in positions_by_market(db, 'NZX')) == ['AIA.NZ', 'FPH.NZ']
+    assert market_exposure(db)['US'] == (2, 120.0)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from trajectory_cache import TrajectoryCache, cache_key, cached_trajectory
+
+
+def test_memory_then_disk_hits_and_key_sensitivity(tmp_path):
+    cache = TrajectoryCache(str(tmp_path))
+    first = cached_trajectory('lorenz', [1.0, 1.0, 1.0], 300, cache=cache)
+    assert cached_trajectory('lorenz', [1.0, 1.0, 1.0], 300, cache=cache) is first
+
+    cache.clear(disk=False)
+    from_disk = cached_trajectory('lorenz', [1.0, 1.0, 1.0], 300, cache=cache)
+    np.testing.assert_array_equal(from_disk, first)
+    with pytest.raises(ValueError):
+        from_disk[0, 0, 0] = 5.0
+
+    cached_trajectory('lorenz', [1.0, 1.0, 1.0], 300, params=[10.0, 28.5, 8.0 / 3.0], cache=cache)
+    stats = cache.summary()
+    assert (stats['memory_hits'], stats['disk_hits'], stats['misses']) == (1, 1, 2)
+    assert stats['disk_entries'] == 2
+    assert cache_key(a=1.0) != cache_key(a=1.0000001)
+
+
+def test_size_based_eviction(tmp_path):
+    block = {'x': np.random.default_rng(0).random(10000)}  # 80 kB, incompressible
+    cache = TrajectoryCache(str(tmp_path), memory_bytes=200_000, disk_bytes=200_000)
+    for i in range(4):
+        cache.put(f'k{i}', block)
+    stats = cache.summary()
+    assert stats['memory_entries'] == 2 and stats['memory_evictions'] == 2
+    assert stats['disk_entries'] == 2 and stats['disk_evictions'] == 2
+    assert cache.get('k3') is not None
+    cache.clear(disk=False)
+    assert cache.get('k0') is None
@@ -0,0 +1,34 @@
+import numpy as np
+
+from attractor_integrator import integrate
+from trajectory_ring import RingAttractor, TrajectoryRing
+
+
+def test_views_hold_the_last_window_across_wraps_and_share_memory():
+    points = np.random.default_rng(4).normal(size=(2, 37, 3))
+    ring = TrajectoryRing(window=10, n_trajectories=2)
+    ring.extend(points[:, :4])
+    for i in range(4, 9):
+        ring.append(points[:, i].T)
+    ring.extend(points[:, 9:16])
+    ring.extend(points[:, 16:])      # longer than the window
+
+    np.testing.assert_array_equal(ring.last(), points[:, -10:])
+    np.testing.assert_array_equal(ring.last(3), points[:, -3:])
+    np.testing.assert_array_equal(ring.latest, points[:, -1])
+    assert ring.total == 37 and len(ring) == 10
+    assert np.shares_memory(ring.last(5), ring._points)
+
+    # JS local-divergence statistic on the view
+    step = np.linalg.norm(np.diff(points[:, -6:], axis=1), axis=2)
+    np.testing.assert_allclose(ring.local_divergence(6), np.log(step).mean(axis=1))
+
+
+def test_ring_attractor_matches_one_shot_integration_with_bounded_memory():
+    live = RingAttractor('lorenz', (1.0, 1.0, 1.0), window=300, chunk=64)
+    for steps in (5, 200, 1, 500):
+        live.advance(steps)
+    full = integrate('lorenz', (1.0, 1.0, 1.0), 706)
+    assert live.steps == 706
+    np.testing.assert_array_equal(live.trajectory, full[:, -300:])
+    assert 1.0 < live.ring.box_dimension(300)[0] < 3.0
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Tick Stream Ingestion
+Consumes a Polygon-style trade/aggregate feed (the same `ev: T` / `ev: AM`
+messages MarketDataManager.js handles), coalesces bursts into the latest
+price per symbol and applies bounded-queue backpressure to the feed.
+A local replay server stands in for the live feed during testing.
+"""
+
+import json
+import time
+import random
+import asyncio
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+Tick = Tuple[str, float, float]  # symbol, price, timestamp (epoch seconds)
+PriceCallback = Callable[[Dict[str, Tuple[float, float]]], None]
+
+
+def parse_polygon_message(raw) -> List[Tick]:
+    """Extract (symbol, price, timestamp) ticks from a Polygon websocket payload"""
+    if isinstance(raw, (bytes, str)):
+        raw = json.loads(raw)
+    events = raw if isinstance(raw, list) else [raw]
+
+    ticks = []
+    for event in events:
+        ev = event.get('ev')
+        if ev == 'T':  # Trade message
+            price, ts = event.get('p'), event.get('t')
+        elif ev in ('AM', 'A'):  # Aggregate (per minute / per second)
+            price, ts = event.get('c'), event.get('e') or event.get('s')
+        else:
+            continue
+        if price is None or 'sym' not in event:
+            continue
+        ticks.append((event['sym'], float(price), (ts or time.time() * 1000) / 1000.0))
+    return ticks
+
+
+class LatestPriceBook:
+    """Thread-safe latest-price-per-symbol view for the engine's valuation path"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._prices: Dict[str, Tuple[float, float]] = {}
+
+    def update(self, prices: Dict[str, Tuple[float, float]]):
+        with self._lock:
+            self._prices.update(prices)
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Latest streamed price, or None if unseen (or older than max_age seconds)"""
+        with self._lock:
+            entry = self._prices.get(symbol)
+        if entry is None:
+            return None
+        price, ts = entry
+        if max_age is not None and time.time() - ts > max_age:
+            return None
+        return price
+
+    def snapshot(self) -> Dict[str, Tuple[float, float]]:
+        with self._lock:
+            return dict(self._prices)
+
+
+class StopTriggerWatch:
+    """Fires a callback the first time a streamed price crosses a position's stop"""
+
+    def __init__(self, on_trigger: Callable[[str, float, float], None]):
+        self.on_trigger = on_trigger
+        self._lock = threading.Lock()
+        self._stops: Dict[str, float] = {}
+
+    def set_stop(self, symbol: str, stop_price: float):
+        with self._lock:
+            self._stops[symbol] = stop_price
+
+    def clear_stop(self, symbol: str):
+        with self._lock:
+            self._stops.pop(symbol, None)
+
+    def __call__(self, prices: Dict[str, Tuple[float, float]]):
+        triggered = []
+        with self._lock:
+            for symbol, (price, _) in prices.items():
+                stop = self._stops.get(symbol)
+                if stop is not None and price <= stop:
+                    triggered.append((symbol, price, stop))
+                    del self._stops[symbol]
+        for symbol, price, stop in triggered:
+            self.on_trigger(symbol, price, stop)
+
+
+class TickIngestor:
+    """Streams ticks from a feed into coalesced latest-price batches"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, queue_size: int = 10000,
+                 coalesce_interval: float = 0.05):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.coalesce_interval = coalesce_interval
+        self.book = LatestPriceBook()
+        self.subscribers: List[PriceCallback] = [self.book.update]
+        self.stats = {
+            'messages': 0,
+            'malformed': 0,
+            'ticks': 0,
+            'batches': 0,
+            'symbols_dispatched': 0,
+            'backpressure_waits': 0
+        }
+        self._queue: Optional[asyncio.Queue] = None
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: PriceCallback):
+        """Register a callback receiving {symbol: (price, timestamp)} per coalesced batch"""
+        self.subscribers.append(callback)
+
+    async def run(self):
+        """Connect to the feed and ingest until the feed closes or stop() is called"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._task = asyncio.current_task()
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        coalescer = asyncio.create_task(self._coalesce())
+        try:
+            while not self._stop.is_set():
+                line = await reader.readline()
+                if not line:
+                    break
+                self.stats['messages'] += 1
+                try:
+                    ticks = parse_polygon_message(line)
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    # A malformed or partial line must not end the stream
+                    self.stats['malformed'] += 1
+                    continue
+                for tick in ticks:
+                    self.stats['ticks'] += 1
+                    if self._queue.full():
+                        self.stats['backpressure_waits'] += 1
+                    # Blocks when the queue is full; we stop reading and TCP pushes back on the feed
+                    await self._queue.put(tick)
+        except asyncio.CancelledError:
+            # stop() cancels us to interrupt a readline() on an idle feed; any other cancellation propagates
+            if not self._stop.is_set():
+                raise
+            if hasattr(self._task, 'uncancel'):
+                self._task.uncancel()
+        finally:
+            self._task = None
+            writer.close()
+            await self._queue.put(None)
+            await coalescer
+
+    async def _coalesce(self):
+        """Drain the queue in bursts, keeping only the latest price per symbol
+
+        A burst runs until coalesce_interval after its first tick, so a feed
+        that pauses briefly mid-burst still yields one batch.
+        """
+        done = False
+        while not done:
+            first = await self._queue.get()
+            latest: Dict[str, Tuple[float, float]] = {}
+            if first is None:
+                done = True
+            else:
+                latest[first[0]] = (first[1], first[2])
+            deadline = time.monotonic() + self.coalesce_interval
+            while not done:
+                try:
+                    tick = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        tick = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if tick is None:
+                    done = True
+                    break
+                latest[tick[0]] = (tick[1], tick[2])
+                if time.monotonic() >= deadline:
+                    break
+            if latest:
+                self._dispatch(latest)
+
+    def _dispatch(self, latest: Dict[str, Tuple[float, float]]):
+        self.stats['batches'] += 1
+        self.stats['symbols_dispatched'] += len(latest)
+        for callback in self.subscribers:
+            try:
+                callback(latest)
+            except Exception as e:
+                print(f"⚠️  Tick subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    def start_in_thread(self) -> threading.Thread:
+        """Run the ingestor on a background event loop for the synchronous engine"""
+        def _target():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.run())
+            except (ConnectionError, OSError) as e:
+                print(f"❌ Tick stream disconnected: {e}")
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_target, name='tick-ingestor', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def request_stop(self):
+        """Stop ingesting from inside the event loop, even while waiting on an idle feed"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def stop(self):
+        """Stop a start_in_thread() ingestor and wait for its thread"""
+        if self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self.request_stop)
+            except RuntimeError:
+                pass    # The loop already finished
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+class ReplayServer:
+    """Local stand-in for the Polygon feed, serving newline-delimited JSON messages"""
+
+    def __init__(self, messages: Iterable, host: str = '127.0.0.1', port: int = 8765,
+                 speed: float = 0.0):
+        self.messages = list(messages)
+        self.host = host
+        self.port = port
+        self.speed = speed  # 0 = as fast as the client will read
+        self._server = None
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> 'ReplayServer':
+        """Replay a recorded feed (one JSON message per line)"""
+        with open(path) as f:
+            return cls((json.loads(line) for line in f if line.strip()), **kwargs)
+
+    @classmethod
+    def synthetic(cls, symbols: List[str], n_messages: int = 1000, burst: int = 20,
+                  seed: int = 7, **kwargs) -> 'ReplayServer':
+        """Random-walk trade bursts for the given symbols"""
+        rng = random.Random(seed)
+        prices = {s: rng.uniform(10, 500) for s in symbols}
+        t_ms = int(time.time() * 1000)
+        messages = []
+        for _ in range(n_messages):
+            batch = []
+            for _ in range(burst):
+                sym = rng.choice(symbols)
+                prices[sym] *= 1 + rng.gauss(0, 0.001)
+                t_ms += 1
+                batch.append({'ev': 'T', 'sym': sym, 'p': round(prices[sym], 4), 's': rng.randint(1, 500), 't': t_ms})
+            messages.append(batch)
+        return cls(messages, **kwargs)
+
+    async def _handle(self, reader, writer):
+        previous_ts = None
+        for message in self.messages:
+            if self.speed > 0:
+                events = message if isinstance(message, list) else [message]
+                ts = events[-1].get('t') if events else None
+                if previous_ts is not None and ts is not None:
+                    await asyncio.sleep(max(0, (ts - previous_ts) / 1000.0 / self.speed))
+                previous_ts = ts
+            writer.write(json.dumps(message).encode() + b'\n')
+            await writer.drain()  # Honours client backpressure
+        writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def _demo():
+    symbols = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ', 'CBA.AX', 'AZN.L']
+    server = await ReplayServer.synthetic(symbols, n_messages=2000, port=0).start()
+    ingestor = TickIngestor(port=server.port, queue_size=256)
+
+    start = time.perf_counter()
+    await ingestor.run()
+    elapsed = time.perf_counter() - start
+    await server.close()
+
+    raw_ticks = ingestor.stats['ticks']
+    print(f"✅ Ingested {raw_ticks:,} ticks in {elapsed:.2f}s ({raw_ticks / elapsed:,.0f} ticks/sec)")
+    print(f"   Coalesced batches: {ingestor.stats['batches']:,} "
+          f"({ingestor.stats['symbols_dispatched']:,} symbol updates dispatched)")
+    print(f"   Backpressure waits: {ingestor.stats['backpressure_waits']:,}")
+    for sym, (price, _) in sorted(ingestor.book.snapshot().items()):
+        print(f"   {sym:8s} {price:10.4f}")
+
+
+if __name__ == '__main__':
+    print("📡 Tick stream replay demo")
+    asyncio.run(_demo())
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Append-Only Trade Journal
+Fixed-record binary journal that simulated fills are written to first.
+A background thread drains the journal into the SQLite trades table in bulk,
+and crash recovery replays any journal tail that never reached SQLite.
+"""
+
+import os
+import math
+import time
+import struct
+import sqlite3
+import threading
+import zlib
+from collections import deque
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+JOURNAL_MAGIC = b'CMHJRNL1'
+JOURNAL_VERSION = 1
+
+# magic, version, record size, reserved
+HEADER_STRUCT = struct.Struct('<8sHHI')
+
+# seq, timestamp, ticker, action, shares, price, amount,
+# constitutional_score, strategy, notes
+RECORD_BODY_STRUCT = struct.Struct('<Qd16s4sdddd12s44s')
+RECORD_SIZE = RECORD_BODY_STRUCT.size + 4  # + crc32
+
+CHECKPOINT_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS trade_journal_checkpoint (
+  id INTEGER PRIMARY KEY CHECK (id = 1),
+  last_seq INTEGER NOT NULL,
+  updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+'''
+
+INSERT_TRADE_SQL = '''
+INSERT INTO trades (ticker, action, shares, price, amount, timestamp, strategy, constitutional_score, notes)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+TradeRecord = Tuple[int, float, str, str, float, float, float, Optional[float], Optional[str], str]
+
+# Fixed-width text fields: name -> UTF-8 bytes
+TEXT_FIELDS = {'ticker': 16, 'action': 4, 'strategy': 12, 'notes': 44}
+
+
+def _pack_text(value: Optional[str], size: int, field: str = 'text') -> bytes:
+    """Encode text into a fixed-width field, refusing values that do not fit"""
+    raw = (value or '').encode('utf-8')
+    if len(raw) > size:
+        raise ValueError(f'{field} {value!r} is {len(raw)} bytes; the journal field holds {size}')
+    return raw
+
+
+def _unpack_text(raw: bytes) -> str:
+    return raw.rstrip(b'\x00').decode('utf-8', 'ignore')
+
+
+def pack_record(record: TradeRecord) -> bytes:
+    """Pack a trade into one fixed-size, CRC-protected journal record"""
+    seq, timestamp, ticker, action, shares, price, amount, score, strategy, notes = record
+    body = RECORD_BODY_STRUCT.pack(
+        seq,
+        timestamp,
+        _pack_text(ticker, 16, 'ticker'),
+        _pack_text(action, 4, 'action'),
+        shares,
+        price,
+        amount,
+        math.nan if score is None else score,
+        _pack_text(strategy, 12, 'strategy'),
+        _pack_text(notes, 44, 'notes')
+    )
+    return body + struct.pack('<I', zlib.crc32(body))
+
+
+def unpack_record(raw: bytes) -> Optional[TradeRecord]:
+    """Unpack a journal record, returning None if it is torn or corrupt"""
+    if len(raw) != RECORD_SIZE:
+        return None
+    body, (crc,) = raw[:-4], struct.unpack('<I', raw[-4:])
+    if zlib.crc32(body) != crc:
+        return None
+    seq, timestamp, ticker, action, shares, price, amount, score, strategy, notes = RECORD_BODY_STRUCT.unpack(body)
+    strategy_text = _unpack_text(strategy)
+    return (
+        seq,
+        timestamp,
+        _unpack_text(ticker),
+        _unpack_text(action),
+        shares,
+        price,
+        amount,
+        None if math.isnan(score) else score,
+        strategy_text or None,
+        _unpack_text(notes)
+    )
+
+
+def _sql_timestamp(timestamp: float) -> str:
+    """UTC 'YYYY-MM-DD HH:MM:SS', the format SQLite's CURRENT_TIMESTAMP uses"""
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _to_row(record: TradeRecord) -> tuple:
+    """Convert a journal record into a trades table row"""
+    seq, timestamp, ticker, action, shares, price, amount, score, strategy, notes = record
+    return (ticker, action, shares, price, amount, _sql_timestamp(timestamp), strategy, score, notes)
+
+
+class TradeJournal:
+    """Append-only binary trade journal with background SQLite flush"""
+
+    def __init__(self, journal_path: str = './trade_journal.bin', db_path: str = './market_harmonics.db',
+                 flush_interval: float = 0.25, batch_size: int = 5000, compact_bytes: int = 4 * 1024 * 1024):
+        self.journal_path = journal_path
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.compact_bytes = compact_bytes
+
+        self._lock = threading.Lock()
+        self._flushed = threading.Condition(threading.Lock())
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._pending: Deque[TradeRecord] = deque()
+        self._flushed_seq = 0
+        self._last_seq = 0
+        self.stats = {'appended': 0, 'flushed': 0, 'batches': 0, 'recovered': 0, 'errors': 0}
+        self.last_error: Optional[BaseException] = None
+
+        self._ensure_checkpoint_table()
+        self.recover()
+
+        self._file = open(self.journal_path, 'ab', buffering=0)
+        if self._file.tell() == 0:
+            self._file.write(HEADER_STRUCT.pack(JOURNAL_MAGIC, JOURNAL_VERSION, RECORD_SIZE, 0))
+
+        self._thread = threading.Thread(target=self._run, name='trade-journal-flush', daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    def append(self, ticker: str, action: str, shares: float, price: float, amount: Optional[float] = None,
+               strategy: Optional[str] = None, constitutional_score: Optional[float] = None,
+               notes: str = '', timestamp: Optional[float] = None) -> int:
+        """Journal a fill and return its sequence number
+
+        Raises ValueError if a text field does not fit its fixed-width slot
+        (see TEXT_FIELDS); nothing is journaled in that case.
+        """
+        if amount is None:
+            amount = shares * price
+        if timestamp is None:
+            timestamp = time.time()
+
+        with self._lock:
+            if self._stopping:
+                raise RuntimeError('Trade journal is closed')
+            seq = self._last_seq + 1
+            record = (seq, timestamp, ticker, action, float(shares), float(price),
+                      float(amount), constitutional_score, strategy, notes)
+            packed = pack_record(record)
+            # Unbuffered file: one write() per record, so a process crash keeps every returned fill
+            self._file.write(packed)
+            self._last_seq = seq
+            self._pending.append(record)
+            self.stats['appended'] += 1
+
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+        return seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything appended so far has reached SQLite
+
+        Returns False on timeout, or if a SQLite write failed meanwhile (see
+        last_error); failed records stay queued and journaled, and the
+        background thread keeps retrying them.
+        """
+        target = self._last_seq
+        errors = self.stats['errors']
+        self._wakeup.set()
+        with self._flushed:
+            self._flushed.wait_for(lambda: self._flushed_seq >= target or self.stats['errors'] > errors,
+                                   timeout=timeout)
+            return self._flushed_seq >= target
+
+    def close(self):
+        """Drain the journal into SQLite and stop the background thread"""
+        with self._lock:
+            if self._stopping:
+                return
+            self._stopping = True
+        self._wakeup.set()
+        self._thread.join()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    # ------------------------------------------------------------------
+    # Background flush
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        """Drain pending records into SQLite until closed"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                stopping = self._stopping
+                while self._pending:
+                    if not self._flush_batch(conn):
+                        break
+                self._maybe_compact()
+                if stopping:
+                    break
+        finally:
+            conn.close()
+
+    def _flush_batch(self, conn: sqlite3.Connection) -> bool:
+        """Write one batch of records and advance the checkpoint in the same transaction
+
+        Records leave the queue only once committed. On a SQLite error they
+        stay queued (and in the journal, which is not compacted while anything
+        is pending) for the next attempt or for recover() after a crash.
+        """
+        with self._lock:
+            batch: List[TradeRecord] = list(islice(self._pending, self.batch_size))
+
+        last_seq = batch[-1][0]
+        try:
+            with conn:
+                conn.executemany(INSERT_TRADE_SQL, [_to_row(r) for r in batch])
+                self._write_checkpoint(conn, last_seq)
+        except sqlite3.Error as e:
+            print(f"⚠️  Trade journal flush failed, {len(self._pending)} trades kept for retry: {e}")
+            with self._flushed:
+                self.last_error = e
+                self.stats['errors'] += 1
+                self._flushed.notify_all()
+            return False
+
+        with self._lock:
+            for _ in batch:
+                self._pending.popleft()
+        self.last_error = None
+        self.stats['flushed'] += len(batch)
+        self.stats['batches'] += 1
+        with self._flushed:
+            self._flushed_seq = last_seq
+            self._flushed.notify_all()
+        return True
+
+    def _maybe_compact(self):
+        """Truncate the journal back to its header once SQLite has caught up"""
+        with self._lock:
+            if self._pending or self._flushed_seq != self._last_seq:
+                return
+            if self._file.tell() < self.compact_bytes and not self._stopping:
+                return
+            self._file.truncate(HEADER_STRUCT.size)
+            self._file.seek(HEADER_STRUCT.size)
+
+    # ------------------------------------------------------------------
+    # Checkpoint + recovery
+    # ------------------------------------------------------------------
+
+    def _ensure_checkpoint_table(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executescript(CHECKPOINT_SCHEMA)
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _write_checkpoint(conn: sqlite3.Connection, last_seq: int):
+        conn.execute(
+            'INSERT OR REPLACE INTO trade_journal_checkpoint (id, last_seq, updated_at) VALUES (1, ?, ?)',
+            (last_seq, _sql_timestamp(time.time()))
+        )
+
+    @staticmethod
+    def _read_checkpoint(conn: sqlite3.Connection) -> int:
+        row = conn.execute('SELECT last_seq FROM trade_journal_checkpoint WHERE id = 1').fetchone()
+        return row[0] if row else 0
+
+    def iter_journal(self) -> Iterator[TradeRecord]:
+        """Yield intact records from the journal file, stopping at a torn tail"""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'rb') as f:
+            header = f.read(HEADER_STRUCT.size)
+            if len(header) < HEADER_STRUCT.size:
+                return
+            magic, version, record_size, _ = HEADER_STRUCT.unpack(header)
+            if magic != JOURNAL_MAGIC or record_size != RECORD_SIZE:
+                raise ValueError(f'{self.journal_path} is not a v{JOURNAL_VERSION} trade journal')
+            while True:
+                record = unpack_record(f.read(RECORD_SIZE))
+                if record is None:
+                    return
+                yield record
+
+    def recover(self) -> int:
+        """Replay journal records that never reached SQLite; returns the count replayed"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            checkpoint = self._read_checkpoint(conn)
+            replay: List[TradeRecord] = []
+            max_seq = checkpoint
+            for record in self.iter_journal():
+                max_seq = max(max_seq, record[0])
+                if record[0] > checkpoint:
+                    replay.append(record)
+
+            if replay:
+                with conn:
+                    conn.executemany(INSERT_TRADE_SQL, [_to_row(r) for r in replay])
+                    self._write_checkpoint(conn, max_seq)
+                print(f"🔁 Trade journal recovery: replayed {len(replay)} unflushed trades into SQLite")
+        finally:
+            conn.close()
+
+        # Everything is in SQLite now, so the journal (including any torn tail) can restart empty
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(0)
+
+        self._flushed_seq = self._last_seq = max_seq
+        self.stats['recovered'] = len(replay)
+        return len(replay)
+
+
+# ----------------------------------------------------------------------
+# Throughput benchmark
+# ----------------------------------------------------------------------
+
+def _ensure_trades_table(db_path: str):
+    conn = sqlite3.connect(db_path)
+    conn.executescript('''
+    CREATE TABLE IF NOT EXISTS trades (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      ticker TEXT NOT NULL,
+      action TEXT NOT NULL,
+      shares REAL NOT NULL,
+      price REAL NOT NULL,
+      amount REAL NOT NULL,
+      timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+      strategy TEXT,
+      constitutional_score REAL,
+      notes TEXT
+    );
+    ''')
+    conn.commit()
+    conn.close()
+
+
+def benchmark(n_trades: int = 5000, workdir: Optional[str] = None) -> Dict[str, float]:
+    """Compare trades/sec for synchronous SQLite inserts vs the journal path"""
+    import tempfile
+
+    tickers = ['AAPL', 'MSFT', 'FPH.NZ', 'AIA.NZ', 'CBA.AX', 'AZN.L', 'SAP.DE', 'ASML.AS']
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        direct_db = os.path.join(tmp, 'direct.db')
+        journal_db = os.path.join(tmp, 'journal.db')
+        _ensure_trades_table(direct_db)
+        _ensure_trades_table(journal_db)
+
+        # Synchronous path: one INSERT + COMMIT per fill
+        conn = sqlite3.connect(direct_db)
+        start = time.perf_counter()
+        for i in range(n_trades):
+            ticker = tickers[i % len(tickers)]
+            conn.execute(INSERT_TRADE_SQL, (ticker, 'buy', 10.0, 100.0 + i, 1000.0 + i,
+                                            _sql_timestamp(time.time()), 'ensemble', 0.85, 'benchmark'))
+            conn.commit()
+        direct_elapsed = time.perf_counter() - start
+        conn.close()
+
+        # Journal path: append returns as soon as the record is written
+        journal = TradeJournal(os.path.join(tmp, 'trades.bin'), journal_db)
+        start = time.perf_counter()
+        for i in range(n_trades):
+            journal.append(tickers[i % len(tickers)], 'buy', 10.0, 100.0 + i,
+                           strategy='ensemble', constitutional_score=0.85, notes='benchmark')
+        append_elapsed = time.perf_counter() - start
+        journal.flush()
+        drained_elapsed = time.perf_counter() - start
+        journal.close()
+
+    return {
+        'trades': n_trades,
+        'direct_trades_per_sec': n_trades / direct_elapsed,
+        'journal_append_trades_per_sec': n_trades / append_elapsed,
+        'journal_end_to_end_trades_per_sec': n_trades / drained_elapsed
+    }
+
+
+if __name__ == '__main__':
+    print("📒 Trade journal throughput benchmark")
+    results = benchmark()
+    print(f"   Trades:                    {results['trades']:,}")
+    print(f"   Direct SQLite:             {results['direct_trades_per_sec']:,.0f} trades/sec")
+    print(f"   Journal append:            {results['journal_append_trades_per_sec']:,.0f} trades/sec")
+    print(f"   Journal → SQLite drained:  {results['journal_end_to_end_trades_per_sec']:,.0f} trades/sec")
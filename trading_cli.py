@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Trading CLI
+Fast entry point for the trading engine. `status` answers straight from the
+SQLite database using only the standard library; the engine is imported only
+for commands that run it, and even then its network/data-frame/plotting
+dependencies are deferred (lazy_imports.defer) until first used.
+
+    python trading_cli.py status [--db ./market_harmonics.db] [--json]
+    python trading_cli.py run
+    python trading_cli.py bench-startup
+"""
+
+import os
+import sys
+import json
+import sqlite3
+
+from trading_queries import format_roi
+
+DEFAULT_DB_PATH = './market_harmonics.db'
+
+
+def read_status(db_path: str = DEFAULT_DB_PATH) -> dict:
+    """Portfolio summary from the database (read-only, no engine import)"""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f'Database not found: {db_path}')
+
+    conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        positions, invested = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(current_value), 0) FROM portfolio_positions WHERE shares > 0'
+        ).fetchone()
+        snapshot = conn.execute(
+            'SELECT timestamp, portfolio_value, cash_balance, roi FROM performance_snapshots '
+            'ORDER BY timestamp DESC LIMIT 1'
+        ).fetchone()
+        last_trade = conn.execute(
+            'SELECT timestamp, ticker, action, shares, price FROM trades ORDER BY id DESC LIMIT 1'
+        ).fetchone()
+    finally:
+        conn.close()
+
+    status = {
+        'positions': positions,
+        'invested_value': invested,
+        'snapshot': None,
+        'last_trade': None
+    }
+    if snapshot:
+        status['snapshot'] = dict(zip(('timestamp', 'portfolio_value', 'cash_balance', 'roi'), snapshot))
+    if last_trade:
+        status['last_trade'] = dict(zip(('timestamp', 'ticker', 'action', 'shares', 'price'), last_trade))
+    return status
+
+
+def print_status(status: dict):
+    print("🌀 Constitutional Market Harmonics - Status")
+    print(f"   Open positions:  {status['positions']}")
+    print(f"   Invested value:  ${status['invested_value']:,.2f}")
+    snapshot = status['snapshot']
+    if snapshot:
+        print(f"   Portfolio value: ${snapshot['portfolio_value']:,.2f} (cash ${snapshot['cash_balance']:,.2f})")
+        print(f"   ROI:             {format_roi(snapshot['roi'])}")
+        print(f"   Last snapshot:   {snapshot['timestamp']}")
+    trade = status['last_trade']
+    if trade:
+        print(f"   Last trade:      {trade['action'].upper()} {trade['shares']:g} {trade['ticker']} "
+              f"@ ${trade['price']:,.2f} ({trade['timestamp']})")
+
+
+def bench_startup(runs: int = 7, db_path: str = DEFAULT_DB_PATH) -> dict:
+    """Median wall-clock time of a cold `status` process vs importing the full engine"""
+    import statistics
+    import subprocess
+    import time
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    commands = {
+        'interpreter': [sys.executable, '-c', 'pass'],
+        'status': [sys.executable, os.path.join(here, 'trading_cli.py'), 'status', '--db', db_path, '--json'],
+        'import start_trading': [sys.executable, '-c', 'import start_trading'],
+        'import start_trading (deferred)': [sys.executable, '-c',
+                                            'import lazy_imports; lazy_imports.defer(); import start_trading'],
+    }
+
+    results = {}
+    for name, cmd in commands.items():
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            proc = subprocess.run(cmd, cwd=here, capture_output=True)
+            timings.append(time.perf_counter() - start)
+        results[name] = {'median_ms': statistics.median(timings) * 1000, 'ok': proc.returncode == 0}
+    return results
+
+
+def run_engine() -> int:
+    """Import and run start_trading.main, sync or async, with heavy dependencies deferred"""
+    import asyncio
+    import inspect
+    import lazy_imports
+
+    lazy_imports.defer()
+    import start_trading
+
+    result = start_trading.main()
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result if isinstance(result, int) else 0
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Constitutional Market Harmonics trading CLI')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    status_parser = sub.add_parser('status', help='Portfolio status straight from the database')
+    status_parser.add_argument('--db', default=DEFAULT_DB_PATH)
+    status_parser.add_argument('--json', action='store_true')
+
+    sub.add_parser('run', help='Start the trading engine (start_trading.py)')
+
+    bench_parser = sub.add_parser('bench-startup', help='Benchmark CLI cold-start time')
+    bench_parser.add_argument('--runs', type=int, default=7)
+    bench_parser.add_argument('--db', default=DEFAULT_DB_PATH)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'status':
+        try:
+            status = read_status(args.db)
+        except (FileNotFoundError, sqlite3.Error) as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        if args.json:
+            print(json.dumps(status))
+        else:
+            print_status(status)
+        return 0
+
+    if args.command == 'run':
+        return run_engine()
+
+    if args.command == 'bench-startup':
+        print(f"⏱️  Cold-start benchmark (median of {args.runs} runs)")
+        for name, result in bench_startup(args.runs, args.db).items():
+            flag = '✅' if result['ok'] else '❌'
+            print(f"   {flag} {name:32s} {result['median_ms']:8.1f} ms")
+        return 0
+
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
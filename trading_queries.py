@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Trading Queries
+Read queries used by the engine and dashboard, written to hit the indexes
+created in db_migrations.py. HOT_QUERIES lists the ones whose plans are
+checked by test_trading_queries.py so a regression to a full scan fails loudly.
+"""
+
+import sqlite3
+from typing import Dict, List, Optional, Tuple
+
+# Exchange names used by the engine -> ticker suffix market codes
+MARKET_CODES = {
+    'US': 'US',
+    'NZX': 'NZ',
+    'ASX': 'AX',
+    'LSE': 'L',
+    'XETRA': 'DE',
+    'EURONEXT': 'AS',
+    'TSE': 'T',
+    'HKEX': 'HK',
+    'TSX': 'TO',
+    'SSE': 'SS'
+}
+
+HOT_QUERIES: Dict[str, Tuple[str, tuple]] = {
+    'recent_trades_for_ticker': (
+        'SELECT timestamp, action, shares, price, amount FROM trades '
+        'WHERE ticker = ? ORDER BY timestamp DESC LIMIT ?',
+        ('AAPL', 20)
+    ),
+    'recent_trades': (
+        'SELECT id, ticker, action, shares, price, amount, timestamp, strategy FROM trades '
+        'ORDER BY timestamp DESC LIMIT ?',
+        (20,)
+    ),
+    'snapshots_between': (
+        'SELECT timestamp, portfolio_value, cash_balance, roi FROM performance_snapshots '
+        'WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp',
+        ('2025-11-01', '2025-11-08')
+    ),
+    'latest_snapshot': (
+        'SELECT timestamp, portfolio_value, cash_balance, roi FROM performance_snapshots '
+        'ORDER BY timestamp DESC LIMIT 1',
+        ()
+    ),
+    'positions_by_market': (
+        'SELECT ticker, shares, current_value FROM portfolio_positions '
+        'WHERE market = ? AND shares > 0 ORDER BY ticker',
+        ('NZ',)
+    ),
+    'market_exposure': (
+        'SELECT market, COUNT(*), SUM(current_value) FROM portfolio_positions '
+        'WHERE shares > 0 GROUP BY market',
+        ()
+    ),
+    'recent_positions': (
+        'SELECT * FROM portfolio_positions ORDER BY last_updated DESC LIMIT ?',
+        (10,)
+    ),
+    'latest_attractor_states': (
+        'SELECT * FROM attractor_states ORDER BY timestamp DESC LIMIT ?',
+        (9,)
+    ),
+}
+
+
+def _rows(conn: sqlite3.Connection, name: str, params: tuple) -> List[sqlite3.Row]:
+    previous = conn.row_factory
+    conn.row_factory = sqlite3.Row
+    try:
+        return conn.execute(HOT_QUERIES[name][0], params).fetchall()
+    finally:
+        conn.row_factory = previous
+
+
+def recent_trades(conn: sqlite3.Connection, ticker: Optional[str] = None, limit: int = 20) -> List[sqlite3.Row]:
+    """Most recent trades, optionally for a single ticker"""
+    if ticker is None:
+        return _rows(conn, 'recent_trades', (limit,))
+    return _rows(conn, 'recent_trades_for_ticker', (ticker, limit))
+
+
+def snapshots_between(conn: sqlite3.Connection, start: str, end: str) -> List[sqlite3.Row]:
+    """Performance snapshots with start <= timestamp < end (ISO strings)"""
+    return _rows(conn, 'snapshots_between', (start, end))
+
+
+def latest_snapshot(conn: sqlite3.Connection) -> Optional[sqlite3.Row]:
+    rows = _rows(conn, 'latest_snapshot', ())
+    return rows[0] if rows else None
+
+
+def format_roi(roi: Optional[float]) -> str:
+    """performance_snapshots.roi is a fraction (0.156 = 15.6%); shown as a signed percentage"""
+    return f"{(roi or 0.0) * 100:+.2f}%"
+
+
+def positions_by_market(conn: sqlite3.Connection, market: str) -> List[sqlite3.Row]:
+    """Open positions on one exchange ('NZX', 'ASX', 'LSE', 'US', ... or a suffix code)"""
+    code = MARKET_CODES.get(market.upper(), market.upper())
+    return _rows(conn, 'positions_by_market', (code,))
+
+
+def market_exposure(conn: sqlite3.Connection) -> Dict[str, Tuple[int, float]]:
+    """{market code: (open positions, current value)}"""
+    return {row[0]: (row[1], row[2] or 0.0) for row in _rows(conn, 'market_exposure', ())}
+
+
+def recent_positions(conn: sqlite3.Connection, limit: int = 10) -> List[sqlite3.Row]:
+    return _rows(conn, 'recent_positions', (limit,))
+
+
+def latest_attractor_states(conn: sqlite3.Connection, limit: int = 9) -> List[sqlite3.Row]:
+    return _rows(conn, 'latest_attractor_states', (limit,))
+
+
+def explain(conn: sqlite3.Connection, name: str) -> List[str]:
+    """EXPLAIN QUERY PLAN detail lines for one of the hot queries"""
+    sql, params = HOT_QUERIES[name]
+    return [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+
+
+def full_scans(conn: sqlite3.Connection, name: str) -> List[str]:
+    """Plan steps that read a whole table or sort without an index"""
+    bad = []
+    for detail in explain(conn, name):
+        if detail.startswith('SCAN ') and ' USING ' not in detail:
+            bad.append(detail)
+        elif 'TEMP B-TREE' in detail:
+            bad.append(detail)
+    return bad
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Trajectory Cache
+Two-level cache for attractor trajectories and signals so a Streamlit rerun
+with unchanged sigma/rho/beta, step count and initial state does not
+integrate again:
+  1. in-process LRU bounded by bytes
+  2. on-disk compressed .npz files bounded by bytes (least recently used evicted)
+Keys are a hash of every integration parameter. Hit/miss statistics feed a
+small debug panel.
+"""
+
+import os
+import io
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from attractor_integrator import integrate
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = './.trajectory_cache'
+
+Arrays = Dict[str, np.ndarray]
+
+
+def _canonical(value):
+    """JSON-stable form of parameters (arrays and numpy scalars become lists/floats)"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def cache_key(**params) -> str:
+    """Stable hash of all integration parameters"""
+    payload = json.dumps({'v': CACHE_VERSION, **_canonical(params)}, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _nbytes(arrays: Arrays) -> int:
+    return sum(a.nbytes for a in arrays.values())
+
+
+class TrajectoryCache:
+    """In-process LRU in front of an on-disk compressed array store"""
+
+    def __init__(self, cache_dir: Optional[str] = DEFAULT_CACHE_DIR, memory_bytes: int = 64 * 1024 * 1024,
+                 disk_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory: 'OrderedDict[str, Arrays]' = OrderedDict()
+        self._memory_used = 0
+        self._lock = threading.Lock()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'memory_evictions': 0,
+                      'disk_evictions': 0, 'compute_seconds': 0.0}
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Arrays]:
+        """Cached arrays (read-only) or None"""
+        with self._lock:
+            arrays = self._memory.get(key)
+            if arrays is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return arrays
+
+        arrays = self._load(key)
+        with self._lock:
+            if arrays is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['disk_hits'] += 1
+            self._remember(key, arrays)
+        return arrays
+
+    def put(self, key: str, arrays: Arrays) -> Arrays:
+        """Store arrays in both levels; returns the read-only cached copies"""
+        arrays = {name: np.array(a, copy=True) for name, a in arrays.items()}
+        for a in arrays.values():
+            a.setflags(write=False)
+        with self._lock:
+            self._remember(key, arrays)
+        self._store(key, arrays)
+        return arrays
+
+    def get_or_compute(self, params: dict, compute: Callable[[], Arrays]) -> Arrays:
+        """Arrays for params, computing and caching them on a miss"""
+        key = cache_key(**params)
+        arrays = self.get(key)
+        if arrays is None:
+            start = time.perf_counter()
+            arrays = compute()
+            with self._lock:
+                self.stats['compute_seconds'] += time.perf_counter() - start
+            arrays = self.put(key, arrays)
+        return arrays
+
+    # ------------------------------------------------------------------
+    # Memory level
+    # ------------------------------------------------------------------
+
+    def _remember(self, key: str, arrays: Arrays):
+        size = _nbytes(arrays)
+        if size > self.memory_bytes:
+            return  # Larger than the whole budget; leave it to the disk level
+        if key in self._memory:
+            self._memory_used -= _nbytes(self._memory.pop(key))
+        self._memory[key] = arrays
+        self._memory_used += size
+        while self._memory_used > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_used -= _nbytes(evicted)
+            self.stats['memory_evictions'] += 1
+
+    # ------------------------------------------------------------------
+    # Disk level
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f'{key}.npz')
+
+    def _load(self, key: str) -> Optional[Arrays]:
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️  Dropping unreadable trajectory cache entry {key}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        for a in arrays.values():
+            a.setflags(write=False)
+        try:
+            os.utime(path)  # mtime doubles as last-access time for eviction
+        except FileNotFoundError:
+            pass
+        return arrays
+
+    def _store(self, key: str, arrays: Arrays):
+        if not self.cache_dir:
+            return
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        tmp = f'{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp, self._path(key))
+        self._evict_disk()
+
+    def _disk_entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.npz'):
+                try:
+                    st = os.stat(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries())
+        used = sum(size for _, size, _ in entries)
+        for _, size, name in entries:
+            if used <= self.disk_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            used -= size
+            with self._lock:
+                self.stats['disk_evictions'] += 1
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def summary(self) -> dict:
+        """Hit/miss counters plus current usage of both levels"""
+        with self._lock:
+            result = dict(self.stats)
+            result['memory_entries'] = len(self._memory)
+            result['memory_mb'] = self._memory_used / (1024 * 1024)
+        lookups = result['memory_hits'] + result['disk_hits'] + result['misses']
+        result['hit_rate'] = (result['memory_hits'] + result['disk_hits']) / lookups if lookups else 0.0
+        entries = self._disk_entries() if self.cache_dir else []
+        result['disk_entries'] = len(entries)
+        result['disk_mb'] = sum(size for _, size, _ in entries) / (1024 * 1024)
+        return result
+
+    def clear(self, disk: bool = True):
+        with self._lock:
+            self._memory.clear()
+            self._memory_used = 0
+        if disk and self.cache_dir:
+            for _, _, name in self._disk_entries():
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+
+_default_cache: Optional[TrajectoryCache] = None
+
+
+def default_cache() -> TrajectoryCache:
+    """Process-wide cache shared by every Streamlit session"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TrajectoryCache()
+    return _default_cache
+
+
+def cached_trajectory(system: str, initial, steps: int, params=None, dt: float = 0.01, method: str = 'rk4',
+                      cache: Optional[TrajectoryCache] = None) -> np.ndarray:
+    """integrate() behind the trajectory cache; returns a read-only (n, steps + 1, 3) array"""
+    cache = cache or default_cache()
+    key_params = {'kind': 'trajectory', 'system': system, 'initial': np.asarray(initial, dtype=float),
+                  'steps': steps, 'params': None if params is None else np.asarray(params, dtype=float),
+                  'dt': dt, 'method': method}
+    arrays = cache.get_or_compute(
+        key_params, lambda: {'trajectory': integrate(system, initial, steps, params, dt, method)})
+    return arrays['trajectory']
+
+
+def render_debug_panel(cache: Optional[TrajectoryCache] = None, st=None):
+    """Streamlit expander with cache hit/miss statistics"""
+    if st is None:
+        import streamlit as st
+    summary = (cache or default_cache()).summary()
+    with st.expander("🗄️ Trajectory cache", expanded=False):
+        cols = st.columns(4)
+        cols[0].metric("Hit rate", f"{summary['hit_rate'] * 100:.0f}%")
+        cols[1].metric("Memory hits", summary['memory_hits'])
+        cols[2].metric("Disk hits", summary['disk_hits'])
+        cols[3].metric("Misses", summary['misses'])
+        st.caption(f"Memory: {summary['memory_entries']} entries, {summary['memory_mb']:.1f} MB "
+                   f"({summary['memory_evictions']} evicted) · Disk: {summary['disk_entries']} entries, "
+                   f"{summary['disk_mb']:.1f} MB ({summary['disk_evictions']} evicted) · "
+                   f"{summary['compute_seconds']:.2f}s spent computing misses")
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TrajectoryCache(tmp)
+        for label in ('cold', 'memory', 'disk'):
+            if label == 'disk':
+                cache.clear(disk=False)
+            start = time.perf_counter()
+            cached_trajectory('lorenz', [1.0, 1.0, 1.0], 20000, cache=cache)
+            print(f"🗄️  {label:>6s}: {(time.perf_counter() - start) * 1000:8.2f} ms")
+        print(f"   {cache.summary()}")
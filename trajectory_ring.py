@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Constitutional Market Harmonics - Ring-Buffer Trajectory Store
+Fixed-size store for long-running attractors, replacing the grow-then-slice
+pattern (BaseAttractor.js keeps 10,000 points and slices to 5,000; Python
+lists in the dashboard are copied into arrays for every statistic).
+
+A preallocated (trajectories x 2*window x 3) array is written twice per point
+(at i and i + window), like PriceHistory, so the last k points of each
+trajectory are always one contiguous zero-copy view. Nothing allocates per
+step, and the JS statistics (local divergence, sandbox box-counting
+dimension) plus component moments run directly on those views.
+"""
+
+import time
+from typing import Optional, Sequence
+
+import numpy as np
+
+from attractor_integrator import BatchIntegrator
+
+# BaseAttractor.js sandbox scales
+BOX_SCALES = (2, 4, 8, 16, 32)
+
+
+class TrajectoryRing:
+    """Last `window` points of n trajectories, oldest first, as zero-copy views"""
+
+    def __init__(self, window: int = 5000, n_trajectories: int = 1, dtype=np.float64):
+        self.window = window
+        self.n = n_trajectories
+        self._points = np.full((n_trajectories, 2 * window, 3), np.nan, dtype=dtype)
+        self._head = 0       # next write position in [0, window)
+        self.count = 0       # points held, capped at window
+        self.total = 0       # points ever appended
+
+        # Preallocated working memory for the statistics
+        self._diff = np.empty((n_trajectories, window, 3), dtype=dtype)
+        self._dist = np.empty((n_trajectories, window), dtype=dtype)
+
+    def __len__(self):
+        return self.count
+
+    # ------------------------------------------------------------------
+    # Appending
+    # ------------------------------------------------------------------
+
+    def append(self, state: np.ndarray):
+        """Append one point per trajectory from a component-major (3 x n) state (BatchIntegrator.state)"""
+        h, w = self._head, self.window
+        points = np.asarray(state).T
+        self._points[:, h] = points
+        self._points[:, h + w] = points
+        self._head = (h + 1) % w
+        self.count = min(self.count + 1, w)
+        self.total += 1
+
+    def extend(self, points: np.ndarray):
+        """Append a block of (n, k, 3) points; only the last `window` of them are kept"""
+        points = np.asarray(points)
+        k = points.shape[1]
+        if k == 0:
+            return
+        w = self.window
+        self.total += k
+        if k > w:
+            points = points[:, -w:]
+            self._head = (self._head + k - w) % w
+            k = w
+        h = self._head
+        first = min(k, w - h)
+        # Contiguous run up to the end of the ring, then the wrapped remainder, each written twice
+        for offset in (0, w):
+            self._points[:, h + offset:h + first + offset] = points[:, :first]
+            self._points[:, offset:k - first + offset] = points[:, first:]
+        self._head = (h + k) % w
+        self.count = min(self.count + k, w)
+
+    # ------------------------------------------------------------------
+    # Zero-copy views
+    # ------------------------------------------------------------------
+
+    def last(self, k: Optional[int] = None) -> np.ndarray:
+        """View of the last k points per trajectory, oldest first (n x k x 3)"""
+        k = self._check(k)
+        end = self._head + self.window
+        return self._points[:, end - k:end]
+
+    @property
+    def latest(self) -> np.ndarray:
+        """View of the newest point per trajectory (n x 3)"""
+        if not self.count:
+            raise ValueError('Trajectory ring is empty')
+        return self._points[:, self._head + self.window - 1]
+
+    def _check(self, k: Optional[int]) -> int:
+        if k is None:
+            return self.count
+        if k > self.count:
+            raise ValueError(f'Only {self.count} points in the ring (asked for {k})')
+        return k
+
+    # ------------------------------------------------------------------
+    # Statistics on the views
+    # ------------------------------------------------------------------
+
+    def local_divergence(self, k: int = 1000) -> np.ndarray:
+        """BaseAttractor.calculateLyapunovExponent: mean log step length over the last k points, per trajectory"""
+        view = self.last(k)
+        diff, dist = self._diff[:, :k - 1], self._dist[:, :k - 1]
+        np.subtract(view[:, 1:], view[:, :-1], out=diff)
+        np.square(diff, out=diff)
+        np.add.reduce(diff, axis=2, out=dist)
+        np.sqrt(dist, out=dist)
+        moved = dist > 0
+        with np.errstate(divide='ignore'):
+            np.log(dist, out=dist)
+        dist[~moved] = 0.0
+        counts = moved.sum(axis=1)
+        return np.where(counts > 0, dist.sum(axis=1) / np.maximum(counts, 1), 0.0)
+
+    def box_dimension(self, k: int = 2000, scales: Sequence[float] = BOX_SCALES) -> np.ndarray:
+        """BaseAttractor.calculateFractalDimension: box-counting slope over the last k points, per trajectory"""
+        view = self.last(k)
+        log_inverse = -np.log(np.asarray(scales, dtype=np.float64))
+        result = np.empty(self.n)
+        for i in range(self.n):
+            counts = [len(np.unique(np.floor(view[i] / scale).astype(np.int64), axis=0)) for scale in scales]
+            result[i] = np.polyfit(log_inverse, np.log(counts), 1)[0]
+        return result
+
+    def moments(self, k: Optional[int] = None) -> dict:
+        """Per-trajectory mean, std, min and max of each component over the last k points (n x 3 each)"""
+        view = self.last(k)
+        return {'mean': view.mean(axis=1), 'std': view.std(axis=1),
+                'min': view.min(axis=1), 'max': view.max(axis=1)}
+
+
+class RingAttractor:
+    """Live attractor that integrates segments straight into a TrajectoryRing
+
+    Same surface the dashboard uses on AttractorContinuation (advance, trajectory,
+    last_state, steps), but memory stays at `window` points however long it runs.
+    """
+
+    def __init__(self, system: str = 'lorenz', initial=(1.0, 1.0, 1.0), params=None, window: int = 20_000,
+                 dt: float = 0.01, method: str = 'rk4', chunk: int = 1000):
+        initial = np.asarray(initial, dtype=np.float64)
+        n = max(initial.shape[0] if initial.ndim == 2 else 1,
+                np.shape(params)[0] if np.ndim(params) == 2 else 1)
+        self.system = system
+        self.params = None if params is None else np.asarray(params, dtype=np.float64)
+        self.integrator = BatchIntegrator(system, n, dt, method)
+        self.ring = TrajectoryRing(window, n)
+        self.ring.extend(np.broadcast_to(initial, (n, 3))[:, None, :])
+        self._segment = np.empty((n, min(chunk, window) + 1, 3))
+
+    @property
+    def steps(self) -> int:
+        return self.ring.total - 1
+
+    @property
+    def trajectory(self) -> np.ndarray:
+        """View of the retained window, (n, <= window, 3)"""
+        return self.ring.last()
+
+    @property
+    def last_state(self) -> np.ndarray:
+        return self.ring.latest
+
+    def advance(self, steps: int):
+        """Integrate `steps` more points from the newest one, chunk by chunk through a reused segment buffer"""
+        chunk = self._segment.shape[1] - 1
+        while steps > 0:
+            k = min(steps, chunk)
+            segment = self._segment[:, :k + 1]
+            self.integrator.integrate(self.ring.latest.copy(), k, self.params, out=segment)
+            self.ring.extend(segment[:, 1:])
+            steps -= k
+
+
+def benchmark(steps: int = 200_000, window: int = 5000, stats_every: int = 100) -> dict:
+    """Append + statistics cost: Python list with JS-style trimming vs the ring"""
+    rng = np.random.default_rng(1)
+    points = rng.normal(0, 10, (steps, 3))
+
+    start = time.perf_counter()
+    trajectory = []
+    for i in range(steps):
+        trajectory.append(points[i].tolist())
+        if len(trajectory) > 2 * window:
+            trajectory = trajectory[-window:]
+        if i % stats_every == 0 and len(trajectory) >= 1000:
+            recent = np.array(trajectory[-1000:])
+            np.log(np.linalg.norm(np.diff(recent, axis=0), axis=1)).mean()
+    list_time = time.perf_counter() - start
+
+    ring = TrajectoryRing(window)
+    start = time.perf_counter()
+    for i in range(steps):
+        ring.append(points[i][:, None])
+        if i % stats_every == 0 and ring.count >= 1000:
+            ring.local_divergence(1000)
+    ring_time = time.perf_counter() - start
+    return {'steps': steps, 'list_us_per_step': list_time / steps * 1e6, 'ring_us_per_step': ring_time / steps * 1e6}
+
+
+if __name__ == '__main__':
+    r = benchmark()
+    print(f"🔁 {r['steps']:,} appends with local divergence every 100 steps: "
+          f"list {r['list_us_per_step']:.2f} µs/step, ring {r['ring_us_per_step']:.2f} µs/step")
+
+    live = RingAttractor('lorenz', window=20_000)
+    start = time.perf_counter()
+    live.advance(1_000_000)
+    print(f"🌀 1,000,000 live Lorenz steps in {time.perf_counter() - start:.2f}s, "
+          f"{live.ring._points.nbytes / 1e6:.1f} MB resident; "
+          f"divergence {live.ring.local_divergence()[0]:.3f}, box dimension {live.ring.box_dimension()[0]:.2f}")